@@ -154,10 +154,33 @@ EMAIL_HOST_USER = os.environ.get("EMAIL_HOST_USER", "your-email@example.com")
 EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_HOST_PASSWORD", "your-email-password")
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+# Email outbox (student360.outbox). EMAIL_OUTBOX_DISPATCH: "thread" makes one
+# send attempt in a background thread after the request (retries need the
+# worker), "worker" leaves it to
+# `manage.py send_queued_mail --loop`, "sync" sends inline
+EMAIL_OUTBOX_DISPATCH = os.environ.get("EMAIL_OUTBOX_DISPATCH", "thread")
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_RATE_LIMIT = float(os.environ.get("EMAIL_OUTBOX_RATE_LIMIT", 0))  # messages/sec, 0 = unlimited
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 30  # seconds, doubled after every failed attempt
+EMAIL_OUTBOX_MAX_RETRY_DELAY = 3600
+
 # College domain and frontend base
 COLLEGE_EMAIL_DOMAIN = os.environ.get("COLLEGE_EMAIL_DOMAIN", "college.edu")
 FRONTEND_BASE_URL = os.environ.get("FRONTEND_BASE_URL", "https://your-frontend-domain.com")
 
+# Marksheet OCR (easyocr readers are shared through student360.ocr.ReaderPool)
+OCR_READER_POOL_SIZE = int(os.environ.get("OCR_READER_POOL_SIZE", 1))
+OCR_LANGUAGES = ["en"]
+OCR_GPU = False
+# cap on the OCR processes one ocr-batch upload may start (each loads its own reader)
+OCR_BATCH_MAX_WORKERS = int(os.environ.get("OCR_BATCH_MAX_WORKERS", 4))
+
+# add_student OCR jobs: "local" process pool, or "redis" + `manage.py run_ocr_worker`
+OCR_JOB_BACKEND = os.environ.get("OCR_JOB_BACKEND", "local")
+OCR_JOB_WORKERS = int(os.environ.get("OCR_JOB_WORKERS", 2))
+OCR_JOB_REDIS_URL = os.environ.get("OCR_JOB_REDIS_URL", "redis://127.0.0.1:6379/2")
+
 # Redis cache (django-redis)
 CACHES = {
     "default": {
@@ -165,8 +188,18 @@ CACHES = {
         "LOCATION": "redis://127.0.0.1:6379/1",
         "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
         "KEY_PREFIX": "student360"
-    }
+    },
+    # Used by student360.caching while Redis is unreachable
+    "fallback": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "student360-fallback",
+    },
 }
+CACHE_REDIS_RETRY_SECONDS = 30
+REFERENCE_CACHE_TIMEOUT = 60 * 60
+PROFILE_CACHE_TIMEOUT = 15 * 60
+JOB_BOARD_CACHE_TIMEOUT = 10 * 60
+ELIGIBILITY_CACHE_TIMEOUT = 60 * 60
 
 # REST framework + SimpleJWT
 REST_FRAMEWORK = {
@@ -194,6 +227,9 @@ SIMPLE_JWT = {
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Generated placement exports (student360.exports.cached_export) - not under MEDIA_ROOT, which is public
+EXPORT_CACHE_DIR = BASE_DIR / "export_cache"
+
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
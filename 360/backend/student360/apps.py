@@ -1,6 +1,38 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save, pre_delete
 
 
 class Student360Config(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'student360'
+
+    def ready(self):
+        from . import caching
+        from .mentor_assignment import release_mentor_seat
+        from .models import CompanyData, Mentors_data, Student, Students_data, User
+
+        # Cached batch / branch lists follow Students_data writes
+        post_save.connect(caching.invalidate_reference_lists, sender=Students_data, dispatch_uid="student360_reference_save")
+        post_delete.connect(caching.invalidate_reference_lists, sender=Students_data, dispatch_uid="student360_reference_delete")
+
+        # Cached student profiles
+        post_save.connect(caching.student_changed, sender=Student, dispatch_uid="student360_profile_student_save")
+        post_delete.connect(caching.student_changed, sender=Student, dispatch_uid="student360_profile_student_delete")
+        post_save.connect(caching.user_changed, sender=User, dispatch_uid="student360_profile_user_save")
+        post_save.connect(caching.student_record_changed, sender=Students_data, dispatch_uid="student360_profile_record_save")
+        post_delete.connect(caching.student_record_changed, sender=Students_data, dispatch_uid="student360_profile_record_delete")
+        post_save.connect(caching.mentor_changed, sender=Mentors_data, dispatch_uid="student360_profile_mentor_save")
+        pre_delete.connect(caching.mentor_changed, sender=Mentors_data, dispatch_uid="student360_profile_mentor_delete")
+
+        # Mentors_data.current_student_count (assignment changes are handled in Students_data.save)
+        post_delete.connect(release_mentor_seat, sender=Students_data, dispatch_uid="student360_mentor_seat_delete")
+
+        # Export file versions (see exports.cached_export)
+        post_save.connect(caching.placed_students_changed, sender=Students_data, dispatch_uid="student360_version_placed_save")
+        post_delete.connect(caching.placed_students_changed, sender=Students_data, dispatch_uid="student360_version_placed_delete")
+        post_save.connect(caching.companies_changed, sender=CompanyData, dispatch_uid="student360_version_company_save")
+        post_delete.connect(caching.companies_changed, sender=CompanyData, dispatch_uid="student360_version_company_delete")
+        post_save.connect(caching.students_changed, sender=Students_data, dispatch_uid="student360_version_students_save")
+        post_delete.connect(caching.students_changed, sender=Students_data, dispatch_uid="student360_version_students_delete")
+        post_save.connect(caching.students_changed, sender=Student, dispatch_uid="student360_version_student_save")
+        post_delete.connect(caching.students_changed, sender=Student, dispatch_uid="student360_version_student_delete")
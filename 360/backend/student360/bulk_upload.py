@@ -0,0 +1,327 @@
+# student360/bulk_upload.py
+# Spreadsheet ingestion for the admin bulk upload endpoints.
+#
+# Sheets are streamed: .xlsx through openpyxl's read-only row iterator and
+# .csv through the csv module, handed out as DataFrames of at most
+# `chunk_size` rows so memory stays bounded for university-wide rosters.
+# Legacy .xls is read with pandas; other file types are rejected.
+import csv
+import io
+import os
+from datetime import date, datetime
+
+import pandas as pd
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils.dateparse import parse_date, parse_datetime
+from openpyxl import load_workbook
+
+from .caching import bump_data_version, invalidate_reference_lists
+from .models import Mentors_data, OutboxEmail, Students_data, User
+from .placement_stats import refresh_placement_stats
+from .outbox import queue_email
+from .utils import generate_password_set_link, mentor_email_message
+
+BULK_CREATE_BATCH_SIZE = 500
+DEFAULT_CHUNK_SIZE = 1000
+
+# Accept multiple naming styles
+STUDENT_COLUMN_MAP = {
+    "name": ["name", "full_name", "student_name"],
+    "usn": ["usn", "rollnumber", "roll_no"],
+    "dob": ["dob", "date_of_birth"],
+    "marks10": ["marks10", "tenth_marks"],
+    "maxMarks10": ["maxmarks10", "tenth_max"],
+    "percentage10": ["percentage10", "tenth_percentage"],
+    "marks12": ["marks12", "twelth_marks"],
+    "maxMarks12": ["maxmarks12", "twelth_max"],
+    "percentage12": ["percentage12", "twelth_percentage"],
+    "branch": ["branch", "department"],
+}
+
+
+MENTOR_COLUMN_MAP = {
+    "name": ["name", "full_name", "student_name"],
+    "email": ["email", "EmailID"],
+    "phone": ["phone", "phone_no", "mobile_no"],
+    "department": ["department"],
+}
+
+
+def normalize_columns(columns):
+    return [str(c).strip().lower().replace(" ", "_") for c in columns]
+
+
+def _chunk_rows(columns, rows, chunk_size):
+    width = len(columns)
+    batch = []
+    for row in rows:
+        row = [None if v == "" else v for v in row[:width]]
+        if all(v is None for v in row):
+            continue
+        batch.append(row + [None] * (width - len(row)))
+        if len(batch) >= chunk_size:
+            yield pd.DataFrame(batch, columns=columns)
+            batch = []
+    if batch:
+        yield pd.DataFrame(batch, columns=columns)
+
+
+def _xlsx_chunks(file, chunk_size):
+    wb = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        columns = normalize_columns(next(rows, ()))
+        yield columns
+        yield from _chunk_rows(columns, (list(r) for r in rows), chunk_size)
+    finally:
+        wb.close()
+
+
+def _csv_chunks(file, chunk_size):
+    rows = csv.reader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    columns = normalize_columns(next(rows, []))
+    yield columns
+    yield from _chunk_rows(columns, rows, chunk_size)
+
+
+def _xls_chunks(file, chunk_size):
+    # openpyxl cannot read the old binary format; pandas does (with xlrd)
+    df = pd.read_excel(file, dtype=object)
+    columns = normalize_columns(df.columns)
+    yield columns
+    rows = df.astype(object).where(df.notna(), None).values.tolist()
+    yield from _chunk_rows(columns, rows, chunk_size)
+
+
+SHEET_READERS = {
+    ".xlsx": _xlsx_chunks,
+    ".xlsm": _xlsx_chunks,
+    ".xls": _xls_chunks,
+    ".csv": _csv_chunks,
+}
+
+
+def chunk_size_param(value):
+    """?chunk_size= as a positive int (DEFAULT_CHUNK_SIZE when absent); ValueError otherwise."""
+    if value in (None, ""):
+        return DEFAULT_CHUNK_SIZE
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        size = 0
+    if size <= 0:
+        raise ValueError("chunk_size must be a positive integer")
+    return size
+
+
+def open_sheet(file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Returns (normalized column names, iterator of DataFrame chunks) for an
+    uploaded .xlsx or .csv file without reading the whole sheet up front
+    (legacy .xls is read whole, it is capped at 65536 rows anyway).
+    Raises ValueError for any other file type.
+    """
+    name = (getattr(file, "name", "") or "").lower()
+    ext = os.path.splitext(name)[1]
+    if ext not in SHEET_READERS:
+        raise ValueError(f"Unsupported file type '{ext or name}', upload .xlsx, .xls or .csv")
+    chunks = SHEET_READERS[ext](file, chunk_size)
+    columns = next(chunks)
+    return columns, chunks
+
+
+def map_columns(columns, column_map):
+    """Pick the first accepted spelling of each logical column present in the sheet."""
+    final_cols = {}
+    for key, options in column_map.items():
+        for opt in options:
+            if opt.lower() in columns:
+                final_cols[key] = opt.lower()
+                break
+    return final_cols
+
+
+def parse_dob(value):
+    """
+    Date cells as they are; text only as ISO dates (what DateField accepts),
+    since 01/05/2004 could be either day or month first. Anything else is None.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        value = value.strip()
+        try:
+            parsed = parse_date(value) or parse_datetime(value)
+        except ValueError:
+            return None
+        return parsed.date() if isinstance(parsed, datetime) else parsed
+    return None
+
+
+def prepare_student_rows(df, final_cols, year):
+    """
+    Vectorized column mapping / type coercion. Returns a frame with one row per
+    valid (name, dob), plus the number of rows dropped as invalid or repeated.
+    """
+    out = pd.DataFrame({
+        "name": df[final_cols["name"]].astype("string").str.strip(),
+        "dob": df[final_cols["dob"]].map(parse_dob).astype(object),
+    })
+
+    if "branch" in final_cols:
+        out["branch"] = df[final_cols["branch"]].astype("string").str.strip().fillna("Unknown")
+    else:
+        out["branch"] = "Unknown"
+
+    for col in ["percentage10", "percentage12"]:
+        if col in final_cols:
+            out[col] = pd.to_numeric(df[final_cols[col]], errors="coerce")
+        else:
+            out[col] = float("nan")
+
+    out["batch_year"] = year
+
+    valid = out["name"].notna() & (out["name"] != "") & out["dob"].notna()
+    out = out[valid].drop_duplicates(subset=["name", "dob"])
+    return out, len(df) - len(out)
+
+
+def existing_student_keys(names, dobs):
+    return set(
+        Students_data.objects.filter(name__in=names, dob__in=dobs).values_list("name", "dob")
+    )
+
+
+def save_student_rows(rows):
+    """
+    Insert the prepared rows that are not in the DB yet. One query fetches the
+    existing (name, dob) keys, new rows go in with chunked bulk_create.
+    Returns (saved, skipped).
+    """
+    if rows.empty:
+        return 0, 0
+
+    existing = existing_student_keys(rows["name"].unique().tolist(), rows["dob"].unique().tolist())
+    keys = pd.Series(list(zip(rows["name"], rows["dob"])), index=rows.index)
+    new_rows = rows[~keys.isin(existing)]
+
+    # NaN -> None so nullable columns are stored as NULL
+    records = new_rows.astype(object).where(new_rows.notna(), None).to_dict("records")
+    objs = [Students_data(**r) for r in records]
+    Students_data.objects.bulk_create(objs, batch_size=BULK_CREATE_BATCH_SIZE, ignore_conflicts=True)
+    if objs:
+        # bulk_create skips post_save
+        invalidate_reference_lists()
+        bump_data_version("students")
+
+    return len(objs), len(rows) - len(objs)
+
+
+def ingest_students(file, year, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    Stream a student roster into Students_data, one transaction per chunk.
+    `progress(report)` is called after every chunk.
+    """
+    columns, chunks = open_sheet(file, chunk_size)
+    final_cols = map_columns(columns, STUDENT_COLUMN_MAP)
+
+    # Mandatory fields
+    for req in ["name", "dob"]:
+        if req not in final_cols:
+            raise ValueError(f"Missing required column: {req}")
+
+    report = {"rows_processed": 0, "records_saved": 0, "records_skipped": 0, "chunks": 0}
+    branches = set()
+    for chunk in chunks:
+        with transaction.atomic():
+            rows, invalid = prepare_student_rows(chunk, final_cols, year)
+            saved, skipped = save_student_rows(rows)
+        if saved:
+            branches.update(rows["branch"].unique())
+
+        report["chunks"] += 1
+        report["rows_processed"] += len(chunk)
+        report["records_saved"] += saved
+        report["records_skipped"] += skipped + invalid
+        if progress:
+            progress(report)
+
+    # New students change the placement rate of their groups
+    refresh_placement_stats((year, branch) for branch in branches)
+    return report
+
+
+def _cell(row, col, default=None):
+    value = row.get(col) if col else None
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return default
+    return value
+
+
+def save_mentor_rows(chunk, final_cols, batch_id=None):
+    """
+    Create the mentors of one chunk in bulk: new Mentors_data rows, their
+    mentor User accounts and a queued set-password email each.
+    Returns (saved, skipped).
+    """
+    mentors = {}
+    skipped = 0
+    for row in chunk.to_dict("records"):
+        email = str(_cell(row, final_cols["email"], "")).strip()
+        if not email or email in mentors:
+            skipped += 1
+            continue
+        mentors[email] = row
+
+    existing = set(Mentors_data.objects.filter(email__in=list(mentors)).values_list("email", flat=True))
+    skipped += len(existing)
+    new = {email: row for email, row in mentors.items() if email not in existing}
+    if not new:
+        return 0, skipped
+
+    Mentors_data.objects.bulk_create([
+        Mentors_data(
+            email=email,
+            name=_cell(row, final_cols.get("name"), ""),
+            phone=_cell(row, final_cols.get("phone"), ""),
+            department=_cell(row, final_cols.get("department")),
+        )
+        for email, row in new.items()
+    ], batch_size=BULK_CREATE_BATCH_SIZE, ignore_conflicts=True)
+
+    # Mentor logins - no usable password until they follow the emailed link
+    have_user = set(User.objects.filter(email__in=list(new)).values_list("email", flat=True))
+    need_user = [email for email in new if email not in have_user]
+    taken = set(User.objects.filter(
+        username__in=[e.split("@")[0] for e in need_user]
+    ).values_list("username", flat=True))
+
+    users = []
+    for email in need_user:
+        name = str(_cell(new[email], final_cols.get("name"), "Mentor"))
+        name_parts = name.strip().split(" ")
+        username = email.split("@")[0]
+        if username in taken:
+            username = email
+        taken.add(username)
+        users.append(User(
+            username=username,
+            email=email,
+            first_name=name_parts[0],
+            last_name=" ".join(name_parts[1:]),
+            password=make_password(None),
+            role="mentor",
+        ))
+    User.objects.bulk_create(users, batch_size=BULK_CREATE_BATCH_SIZE, ignore_conflicts=True)
+
+    emails = []
+    for email, row in new.items():
+        name = _cell(row, final_cols.get("name"), "Mentor")
+        subject, body = mentor_email_message(name, generate_password_set_link(email))
+        emails.append(queue_email(subject, body, [email], batch_id=batch_id, save=False))
+    OutboxEmail.objects.bulk_create(emails, batch_size=BULK_CREATE_BATCH_SIZE)
+
+    return len(new), skipped
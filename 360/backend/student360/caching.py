@@ -0,0 +1,263 @@
+# student360/caching.py
+# Cache helpers on top of settings.CACHES.
+#
+# "default" is django-redis. If Redis cannot be reached the call is served by
+# the local-memory "fallback" cache instead and Redis is retried after
+# CACHE_REDIS_RETRY_SECONDS, so an outage costs one failed connect per
+# process per window rather than one per request. Deletes and data version
+# bumps made during the outage are replayed on Redis when it is back.
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+FALLBACK_ALIAS = "fallback"
+
+BATCHES_KEY = "reference:batches"
+BRANCHES_KEY = "reference:branches"
+
+_redis_down_until = 0.0
+
+# Invalidations and version bumps that only reached the fallback; replayed on
+# Redis as soon as it answers again, so it does not serve pre-outage data
+_missed_lock = threading.Lock()
+_missed_deletes = set()
+_missed_versions = set()
+
+
+def _redis_down():
+    return time.monotonic() < _redis_down_until
+
+
+def _replay_missed(redis):
+    with _missed_lock:
+        keys, names = list(_missed_deletes), list(_missed_versions)
+    if keys:
+        redis.delete_many(keys)
+    for name in names:
+        redis.set(_version_key(name), uuid.uuid4().hex[:12], None)
+    with _missed_lock:
+        _missed_deletes.difference_update(keys)
+        _missed_versions.difference_update(names)
+
+
+def _call(method, *args, **kwargs):
+    global _redis_down_until
+    if not _redis_down():
+        try:
+            redis = caches["default"]
+            if _missed_deletes or _missed_versions:
+                _replay_missed(redis)
+            return getattr(redis, method)(*args, **kwargs)
+        except Exception as e:
+            print("Cache error, using local memory:", e)
+            _redis_down_until = time.monotonic() + getattr(settings, "CACHE_REDIS_RETRY_SECONDS", 30)
+    return getattr(caches[FALLBACK_ALIAS], method)(*args, **kwargs)
+
+
+def cache_get(key, default=None):
+    return _call("get", key, default)
+
+
+def cache_set(key, value, timeout=None):
+    _call("set", key, value, timeout)
+
+
+def cache_delete_many(keys):
+    _call("delete_many", keys)
+    if _redis_down():
+        with _missed_lock:
+            _missed_deletes.update(keys)
+    # Whatever the fallback picked up during an outage must not outlive a write either
+    caches[FALLBACK_ALIAS].delete_many(keys)
+
+
+def get_or_compute(key, compute, timeout=None):
+    value = cache_get(key)
+    if value is None:
+        value = compute()
+        cache_set(key, value, timeout)
+    return value
+
+
+# ---------------- Reference lists (batches / branches) ----------------
+
+def _reference_timeout():
+    return getattr(settings, "REFERENCE_CACHE_TIMEOUT", 60 * 60)
+
+
+def batch_years():
+    from .models import Students_data
+
+    def compute():
+        batches = Students_data.objects.values_list('batch_year', flat=True).distinct().order_by('batch_year')
+        # filter out None/Empty if any
+        return [b for b in batches if b]
+    return get_or_compute(BATCHES_KEY, compute, _reference_timeout())
+
+
+def branches():
+    from .models import Students_data
+
+    def compute():
+        values = Students_data.objects.values_list('branch', flat=True).distinct().order_by('branch')
+        return [b for b in values if b]
+    return get_or_compute(BRANCHES_KEY, compute, _reference_timeout())
+
+
+def invalidate_reference_lists(**kwargs):
+    """Drop the cached batch / branch lists once the current transaction commits."""
+    transaction.on_commit(lambda: cache_delete_many([BATCHES_KEY, BRANCHES_KEY]))
+
+
+# ---------------- Student profiles ----------------
+# One projection per student (Student + User + Students_data + mentor name),
+# shared by the get_student* endpoints. Hits / misses are counted in the cache
+# so every worker reports into the same numbers.
+
+PROFILE_KEY = "profile:student:{}"
+PROFILE_STATS_KEYS = {"hits": "stats:profile:hits", "misses": "stats:profile:misses"}
+
+
+def _count(name):
+    key = PROFILE_STATS_KEYS[name]
+    _call("add", key, 0, None)
+    try:
+        _call("incr", key)
+    except ValueError:
+        # evicted between add and incr
+        cache_set(key, 1)
+
+
+def build_student_profile(student_id):
+    from .models import Student, Students_data
+
+    student = Student.objects.select_related("user").filter(id=student_id).first()
+    if student is None:
+        return None
+    record = (Students_data.objects.select_related("assigned_mentor")
+              .filter(student_id=student_id).order_by("id").first())
+    mentor = record.assigned_mentor if record else None
+
+    return {
+        "id": student.id,
+        "user_id": student.user_id,
+        "email": student.user.email,
+        "first_name": student.user.first_name,
+        "last_name": student.user.last_name,
+        "phone": student.phone,
+        "branch": student.branch,
+        "semester": student.semester,
+        "cgpa": student.cgpa,
+        "assigned_mentor_name": f"{mentor.name} ".strip() if mentor else None,
+        # Placement data from Students_data model
+        "product": record.product if record else [],
+        "service": record.service if record else [],
+        "dream": record.dream if record else [],
+        "offer_count": record.offer_count if record else 0,
+        # what company criteria are checked against (eligibility.matches); None without a roster row
+        "eligibility": {
+            "batch_year": record.batch_year,
+            "branch": record.branch,
+            "cgpa": student.cgpa,
+            "percentage10": record.percentage10,
+            "percentage12": record.percentage12,
+        } if record else None,
+    }
+
+
+def student_profile(student_id):
+    """Cached profile dict for a student id, or None if there is no such student."""
+    key = PROFILE_KEY.format(student_id)
+    profile = cache_get(key)
+    if profile is not None:
+        _count("hits")
+        return profile
+
+    _count("misses")
+    profile = build_student_profile(student_id)
+    if profile is not None:
+        cache_set(key, profile, getattr(settings, "PROFILE_CACHE_TIMEOUT", 15 * 60))
+    return profile
+
+
+def invalidate_student_profiles(student_ids):
+    keys = [PROFILE_KEY.format(i) for i in student_ids if i]
+    if keys:
+        transaction.on_commit(lambda: cache_delete_many(keys))
+
+
+def profile_cache_stats():
+    hits = cache_get(PROFILE_STATS_KEYS["hits"], 0)
+    misses = cache_get(PROFILE_STATS_KEYS["misses"], 0)
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": round(hits / total, 3) if total else None}
+
+
+# Signal receivers (connected in apps.py)
+
+def student_changed(sender, instance, **kwargs):
+    invalidate_student_profiles([instance.id])
+
+
+def user_changed(sender, instance, **kwargs):
+    from .models import Student
+    invalidate_student_profiles(Student.objects.filter(user_id=instance.id).values_list("id", flat=True))
+
+
+def student_record_changed(sender, instance, **kwargs):
+    invalidate_student_profiles([instance.student_id])
+
+
+def mentor_changed(sender, instance, **kwargs):
+    # Renames and deletions (assigned_mentor is SET_NULL) show up in every mentee's profile
+    from .models import Students_data
+    invalidate_student_profiles(list(
+        Students_data.objects.filter(assigned_mentor=instance, student__isnull=False)
+        .values_list("student_id", flat=True)
+    ))
+
+
+# ---------------- Data versions ----------------
+# An opaque stamp per dataset ("placed_students", "companies", "students") that
+# changes on every write to it. Cached export files, ETags and eligible lists
+# are keyed by it. "students" covers the roster and the marks (Student.cgpa).
+
+def _version_key(name):
+    return f"data_version:{name}"
+
+
+def data_version(name):
+    key = _version_key(name)
+    version = cache_get(key)
+    if version is None:
+        # first use or evicted: start a new version (add() so racing workers agree)
+        _call("add", key, uuid.uuid4().hex[:12], None)
+        version = cache_get(key)
+    return version
+
+
+def bump_data_version(*names):
+    """Give the datasets a new version once the current transaction commits."""
+    def bump():
+        for name in names:
+            cache_set(_version_key(name), uuid.uuid4().hex[:12], None)
+        if _redis_down():
+            with _missed_lock:
+                _missed_versions.update(names)
+    transaction.on_commit(bump)
+
+
+def placed_students_changed(**kwargs):
+    bump_data_version("placed_students")
+
+
+def companies_changed(**kwargs):
+    bump_data_version("companies")
+
+
+def students_changed(**kwargs):
+    bump_data_version("students")
@@ -0,0 +1,99 @@
+# student360/eligibility.py
+# Which students can apply to a company drive.
+#
+# A company's criteria (CompanyData.eligible_batches / eligible_branches /
+# min_cgpa / min_10th / min_12th) become one filter on Students_data joined to
+# Student.cgpa, so the eligible list of a drive is a single query. An empty
+# batch / branch list or minimum means no restriction; a student without the
+# mark a minimum asks for is not eligible.
+#
+# eligible_students() caches that list per company, keyed by the "companies"
+# and "students" data versions (caching.data_version). The job board goes the
+# other way: matches() checks one student's cached profile against the
+# criteria of every drive in memory.
+from django.conf import settings
+from django.db.models import F, Q
+
+from . import caching
+from .models import Students_data
+
+ELIGIBLE_COLUMNS = ["Name", "Batch", "Branch", "CGPA", "10th %", "12th %"]
+
+
+def _number(value):
+    return float(value) if value is not None else None
+
+
+def company_criteria(company):
+    """Plain (cacheable) criteria of a CompanyData row."""
+    return {
+        "batches": [str(b) for b in company.eligible_batches or []],
+        "branches": list(company.eligible_branches or []),
+        "min_cgpa": _number(company.min_cgpa),
+        "min_10th": _number(company.min_10th),
+        "min_12th": _number(company.min_12th),
+    }
+
+
+def eligibility_filter(criteria):
+    """Q on Students_data for the students meeting `criteria`."""
+    q = Q()
+    if criteria["batches"]:
+        q &= Q(batch_year__in=criteria["batches"])
+    if criteria["branches"]:
+        q &= Q(branch__in=criteria["branches"])
+    if criteria["min_cgpa"] is not None:
+        q &= Q(student__cgpa__gte=criteria["min_cgpa"])
+    if criteria["min_10th"] is not None:
+        q &= Q(percentage10__gte=criteria["min_10th"])
+    if criteria["min_12th"] is not None:
+        q &= Q(percentage12__gte=criteria["min_12th"])
+    return q
+
+
+def matches(criteria, profile):
+    """
+    Same rules as eligibility_filter for one student, `profile` being the
+    "eligibility" part of caching.student_profile.
+    """
+    if criteria["batches"] and str(profile["batch_year"]) not in criteria["batches"]:
+        return False
+    if criteria["branches"] and profile["branch"] not in criteria["branches"]:
+        return False
+    for minimum, mark in [("min_cgpa", "cgpa"), ("min_10th", "percentage10"), ("min_12th", "percentage12")]:
+        if criteria[minimum] is not None and (profile[mark] is None or float(profile[mark]) < criteria[minimum]):
+            return False
+    return True
+
+
+def eligible_company_ids(criteria_by_company, profile):
+    return {company_id for company_id, criteria in criteria_by_company.items() if matches(criteria, profile)}
+
+
+def eligible_queryset(criteria):
+    return (Students_data.objects.filter(eligibility_filter(criteria))
+            .annotate(cgpa=F("student__cgpa"))
+            .order_by("batch_year", "branch", "name", "id")
+            .values("id", "student_id", "name", "batch_year", "branch", "cgpa", "percentage10", "percentage12"))
+
+
+def eligible_students(company):
+    """Eligible Students_data rows of a company (dicts), cached per company and data versions."""
+    key = (f"eligibility:{company.id}:{caching.data_version('companies')}"
+           f":{caching.data_version('students')}")
+    return caching.get_or_compute(
+        key,
+        lambda: list(eligible_queryset(company_criteria(company))),
+        getattr(settings, "ELIGIBILITY_CACHE_TIMEOUT", 60 * 60),
+    )
+
+
+def export_row(row):
+    return {
+        "Name": row["name"],
+        "Batch": row["batch_year"],
+        "Branch": row["branch"],
+        "CGPA": row["cgpa"],
+        "10th %": row["percentage10"],
+        "12th %": row["percentage12"],
+    }
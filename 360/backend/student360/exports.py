@@ -0,0 +1,143 @@
+# student360/exports.py
+# Streaming spreadsheet exports.
+#
+# Rows come from a generator (typically queryset.iterator(chunk_size=...)) and
+# are written one at a time, so memory stays flat however many rows there are:
+#   csv  - every row is sent as soon as it is produced (low time-to-first-byte)
+#   xlsx - openpyxl write-only workbook spooled to a temp file, then streamed
+#          in blocks (an .xlsx is a zip, it can only be sent once complete)
+#
+# Views pick the format with ?export_format=csv|xlsx (DRF reserves ?format=).
+#
+# cached_export() keeps the generated file on disk (EXPORT_CACHE_DIR) keyed by
+# the dataset's data version (caching.data_version), so repeated downloads are
+# a file send, or a 304 when the client's ETag is still current.
+import csv
+import glob
+import os
+import tempfile
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import http_date, parse_etags, quote_etag
+from openpyxl import Workbook
+
+from .caching import data_version
+
+EXPORT_CHUNK_SIZE = 2000
+STREAM_BLOCK_SIZE = 64 * 1024
+
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def export_format(request, default="xlsx"):
+    fmt = (request.GET.get("export_format") or default).lower()
+    return fmt if fmt in CONTENT_TYPES else default
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def csv_chunks(columns, rows):
+    writer = csv.writer(_Echo())
+    # BOM so Excel opens UTF-8 names correctly
+    yield "\ufeff" + writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def xlsx_chunks(columns, rows, title="Sheet1"):
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=title)
+    ws.append(columns)
+    for row in rows:
+        ws.append(row)
+
+    with tempfile.TemporaryFile() as tmp:
+        wb.save(tmp)
+        tmp.seek(0)
+        while True:
+            block = tmp.read(STREAM_BLOCK_SIZE)
+            if not block:
+                return
+            yield block
+
+
+def stream_export(filename, columns, rows, fmt="xlsx"):
+    """
+    StreamingHttpResponse with `rows` (an iterable of dicts keyed by column
+    name, or of sequences in column order) as a csv / xlsx attachment.
+    """
+    response = StreamingHttpResponse(_export_chunks(columns, rows, fmt), content_type=CONTENT_TYPES[fmt])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    return response
+
+
+def _export_chunks(columns, rows, fmt):
+    values = ([row[c] for c in columns] if isinstance(row, dict) else list(row) for row in rows)
+    return csv_chunks(columns, values) if fmt == "csv" else xlsx_chunks(columns, values)
+
+
+def _cache_dir():
+    path = getattr(settings, "EXPORT_CACHE_DIR", os.path.join(settings.BASE_DIR, "export_cache"))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _write_export(path, columns, rows, fmt):
+    # write next to the target and rename, so readers never see half a file
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in _export_chunks(columns, rows, fmt):
+                f.write(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _remove_old_versions(path, filename, fmt):
+    for old in glob.glob(os.path.join(_cache_dir(), f"{filename}-*.{fmt}")):
+        if old != path:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+def cached_export(request, filename, dataset, columns, rows, fmt="xlsx"):
+    """
+    Serve `filename`.`fmt` from the export cache, generating it from `rows()`
+    (called only on a miss) when the dataset's version has moved on.
+    Responses carry ETag / Last-Modified; a matching If-None-Match gets a 304.
+    `dataset` is a data version name, or a tuple of names the file depends on.
+    """
+    datasets = dataset if isinstance(dataset, (tuple, list)) else (dataset,)
+    version = "-".join(data_version(name) for name in datasets)
+    etag = quote_etag(f"{filename}-{version}-{fmt}")
+    if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+
+    path = os.path.join(_cache_dir(), f"{filename}-{version}.{fmt}")
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        # not generated yet, or removed by a request that built a newer version
+        _write_export(path, columns, rows(), fmt)
+        f = open(path, "rb")
+        _remove_old_versions(path, filename, fmt)
+
+    response = FileResponse(f, as_attachment=True, filename=f"{filename}.{fmt}", content_type=CONTENT_TYPES[fmt])
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(os.fstat(f.fileno()).st_mtime)
+    return response
@@ -0,0 +1,84 @@
+# student360/filters.py
+from django.db.models import Exists, OuterRef
+from django.db.models.functions import Lower, Trim
+
+from .models import DocumentSearchToken, StudentDocument, Students_data, metadata_search_words
+
+
+# Columns pulled for the placement filter page (one joined row per student)
+FILTERED_STUDENT_FIELDS = (
+    "student_id",
+    "student__user__first_name",
+    "student__user__last_name",
+    "student__phone",
+    "student__cgpa",
+    "branch",
+    "percentage10",
+    "percentage12",
+)
+
+
+def filter_students(branches=None, min_cgpa=0, max_cgpa=10, keyword=None):
+    """
+    Resolve branch, CGPA range and document keyword filters in a single query
+    over Students_data joined with Student and User.
+    """
+    qs = (
+        Students_data.objects
+        .filter(student__isnull=False, student__cgpa__isnull=False)
+        .filter(student__cgpa__gte=min_cgpa, student__cgpa__lte=max_cgpa)
+    )
+
+    branches_lower = [b.strip().lower() for b in (branches or []) if b.strip()]
+    if branches_lower and "all" not in branches_lower:
+        qs = qs.annotate(branch_norm=Lower(Trim("branch"))).filter(branch_norm__in=branches_lower)
+
+    if keyword:
+        qs = qs.filter(Exists(documents_matching(keyword)))
+
+    return qs.order_by("student_id")
+
+
+def documents_matching(keyword):
+    """
+    Documents of the outer student whose metadata contains every word of the
+    keyword, anywhere in a key or value word (index lookup on the word
+    suffixes in DocumentSearchToken).
+    """
+    docs = StudentDocument.objects.filter(student_id=OuterRef("student_id"))
+    words = metadata_search_words(keyword)
+    if not words:
+        # Keyword has nothing we index (e.g. only punctuation) - fall back to a scan
+        return docs.filter(metadata__icontains=keyword)
+
+    for word in words:
+        docs = docs.filter(Exists(DocumentSearchToken.objects.filter(
+            document_id=OuterRef("pk"),
+            token__startswith=word,
+        )))
+    return docs
+
+
+FILTERED_EXPORT_COLUMNS = ["id", "name", "percentage10", "percentage12", "phone", "branch", "cgpa"]
+
+
+def iter_filtered_student_rows(qs, chunk_size=None):
+    """Flatten a filter_students() queryset into response rows, lazily (for exports)."""
+    values = qs.values(*FILTERED_STUDENT_FIELDS)
+    if chunk_size:
+        values = values.iterator(chunk_size=chunk_size)
+    for r in values:
+        yield {
+            "id": r["student_id"],
+            "name": f"{r['student__user__first_name']} {r['student__user__last_name']}",
+            "percentage10": r["percentage10"],
+            "percentage12": r["percentage12"],
+            "phone": r["student__phone"],
+            "branch": r["branch"],
+            "cgpa": r["student__cgpa"],
+        }
+
+
+def filtered_student_rows(qs):
+    """Flatten a filter_students() queryset into the response rows."""
+    return list(iter_filtered_student_rows(qs))
@@ -0,0 +1,102 @@
+# student360/job_board.py
+# Company list behind get_all_companies.
+#
+# The rows are the same for every viewer, so they are built with one query
+# (deadline status computed in SQL) and cached per companies data version
+# (caching.data_version). The cache entry also expires when the next
+# registration deadline passes, so deadline_crossed never goes stale.
+# The company criteria are cached alongside, so a student's board is narrowed
+# to the drives they are eligible for (eligibility.matches) in memory. Per
+# viewer only the applied flags are overlaid, from one query for the
+# student's applied company ids.
+from django.conf import settings
+from django.db.models import BooleanField, Case, Value, When
+from django.utils import timezone
+
+from . import caching
+from .eligibility import company_criteria, eligible_company_ids
+from .models import CompanyApplication, CompanyData
+
+
+def job_board_queryset(now=None):
+    now = now or timezone.now()
+    return CompanyData.objects.annotate(
+        deadline_crossed=Case(
+            When(registration_deadline__lt=now, then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        )
+    ).order_by('-created_at', 'id')
+
+
+def company_row(company):
+    """Viewer-independent part of a job board entry (jd_file is the relative URL)."""
+    return {
+        "id": company.id,
+        "company_name": company.company_name,
+        "eligible_batches": ", ".join(map(str, company.eligible_batches)),
+        "eligible_branches": ", ".join(company.eligible_branches),
+        "min_cgpa": company.min_cgpa,
+        "min_10th": company.min_10th,
+        "min_12th": company.min_12th,
+        "jd_file": company.jd_file.url if company.jd_file else None,
+        "jd_text": company.jd_text,
+        "additional_info": company.additional_info,
+        "deadline": company.registration_deadline.strftime('%Y-%m-%d %H:%M') if company.registration_deadline else None,
+        "created_at": company.created_at.strftime('%Y-%m-%d %H:%M'),
+        "applied": False,
+        "deadline_crossed": company.deadline_crossed,
+    }
+
+
+def cached_job_board():
+    """{"rows": [company_row, ...], "criteria": {company id: criteria}} for every company."""
+    key = f"job_board:{caching.data_version('companies')}"
+    board = caching.cache_get(key)
+    if board is not None:
+        return board
+
+    now = timezone.now()
+    companies = list(job_board_queryset(now))
+    board = {
+        "rows": [company_row(c) for c in companies],
+        "criteria": {c.id: company_criteria(c) for c in companies},
+    }
+
+    timeout = getattr(settings, "JOB_BOARD_CACHE_TIMEOUT", 10 * 60)
+    upcoming = [c.registration_deadline for c in companies
+                if c.registration_deadline and c.registration_deadline >= now]
+    if upcoming:
+        timeout = max(1, min(timeout, int((min(upcoming) - now).total_seconds()) + 1))
+    caching.cache_set(key, board, timeout)
+    return board
+
+
+def eligible_drives(student, board):
+    """
+    Ids of the companies `student` is eligible for, or None when the board is
+    not narrowed (not a student, or no roster row to check the criteria against).
+    """
+    if not student:
+        return None
+    profile = caching.student_profile(student.id)
+    if not profile or not profile.get("eligibility"):
+        return None
+    return eligible_company_ids(board["criteria"], profile["eligibility"])
+
+
+def overlay_viewer(request, rows, student=None):
+    """Absolute jd_file URLs and the viewer's applied flags on top of shared rows."""
+    applied = set()
+    if student:
+        applied = set(CompanyApplication.objects.filter(student=student, applied=True)
+                      .values_list("company_id", flat=True))
+
+    origin = request.build_absolute_uri("/").rstrip("/")
+    result = []
+    for row in rows:
+        jd_file = row["jd_file"]
+        if jd_file and jd_file.startswith("/"):
+            jd_file = origin + jd_file
+        result.append({**row, "jd_file": jd_file, "applied": row["id"] in applied})
+    return result
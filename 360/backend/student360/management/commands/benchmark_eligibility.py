@@ -0,0 +1,94 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from student360 import caching
+from student360.eligibility import company_criteria, eligible_queryset, eligible_students, matches
+from student360.models import CompanyData, Student, Students_data, User
+
+
+class Command(BaseCommand):
+    help = ("Time eligible-list computation on synthetic companies and students "
+            "(created inside a transaction that is rolled back)")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--companies", type=int, default=100)
+        parser.add_argument("--students", type=int, default=10000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def synthetic_data(self, options):
+        rng = random.Random(options["seed"])
+        years = ["2025", "2026", "2027"]
+        branches = ["CSE", "ISE", "ECE", "EEE", "MECH", "CIVIL"]
+
+        User.objects.bulk_create([
+            User(username=f"bench-eligibility-{i}", email=f"bench-eligibility-{i}@example.com", role="student")
+            for i in range(options["students"])
+        ], batch_size=1000)
+        users = User.objects.filter(username__startswith="bench-eligibility-").order_by("id")
+        Student.objects.bulk_create([
+            Student(user=u, cgpa=round(rng.uniform(5, 10), 2) if rng.random() > 0.05 else None) for u in users
+        ], batch_size=1000)
+        students = Student.objects.filter(user__username__startswith="bench-eligibility-").order_by("id")
+        Students_data.objects.bulk_create([
+            Students_data(
+                student=s,
+                name=f"Bench Student {s.id}",
+                dob="2004-01-01",
+                branch=rng.choice(branches),
+                batch_year=rng.choice(years),
+                percentage10=round(rng.uniform(50, 100), 1),
+                percentage12=round(rng.uniform(50, 100), 1) if rng.random() > 0.05 else None,
+            )
+            for s in students
+        ], batch_size=1000)
+
+        CompanyData.objects.bulk_create([
+            CompanyData(
+                company_name=f"Bench Company {i}",
+                eligible_batches=rng.sample([int(y) for y in years], rng.randint(0, 2)),
+                eligible_branches=rng.sample(branches, rng.randint(0, 4)),
+                min_cgpa=rng.choice([None, 6, 7, 7.5, 8]),
+                min_10th=rng.choice([None, 60, 70]),
+                min_12th=rng.choice([None, 60, 70]),
+            )
+            for i in range(options["companies"])
+        ], batch_size=1000)
+        return list(CompanyData.objects.filter(company_name__startswith="Bench Company ").order_by("id"))
+
+    def timed(self, label, fn):
+        start = time.perf_counter()
+        result = fn()
+        self.stdout.write(f"{label:<34}{time.perf_counter() - start:>9.3f}")
+        return result
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{options['companies']} companies x {options['students']} students")
+        with transaction.atomic():
+            companies = self.synthetic_data(options)
+            self.stdout.write(f"{'step':<34}{'seconds':>9}")
+
+            # the old way: every student's marks into Python, checked per company
+            def in_python():
+                profiles = list(eligible_queryset(company_criteria(CompanyData())))
+                criteria = [company_criteria(c) for c in companies]
+                return [sum(1 for p in profiles if matches(c, p)) for c in criteria]
+
+            def one_query_each():
+                return [eligible_queryset(company_criteria(c)).count() for c in companies]
+
+            python_counts = self.timed("python filter (all rows loaded)", in_python)
+            sql_counts = self.timed("one SQL query per company", one_query_each)
+            self.timed("eligible_students, cold cache", lambda: [eligible_students(c) for c in companies])
+            self.timed("eligible_students, warm cache", lambda: [eligible_students(c) for c in companies])
+
+            if python_counts != sql_counts:
+                self.stderr.write("SQL and in-memory eligibility disagree")
+            self.stdout.write(f"eligible per company: min {min(sql_counts)}, max {max(sql_counts)}, "
+                              f"mean {sum(sql_counts) / len(sql_counts):.0f}")
+            transaction.set_rollback(True)
+
+        # the cached lists above belong to rolled-back rows
+        caching.bump_data_version("companies", "students")
@@ -0,0 +1,61 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from student360.mentor_assignment import STRATEGIES, plan_assignments
+from student360.models import Mentors_data
+
+
+class Command(BaseCommand):
+    help = "Time every mentor assignment strategy on a synthetic batch (nothing is written to the DB)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=20000)
+        parser.add_argument("--mentors", type=int, default=500)
+        parser.add_argument("--departments", type=int, default=8)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def synthetic_data(self, options):
+        rng = random.Random(options["seed"])
+        departments = [f"DEPT{i}" for i in range(options["departments"])]
+
+        mentors_by_dept = {}
+        loads = {}
+        for i in range(1, options["mentors"] + 1):
+            # a mix of capped and unlimited mentors, some already carrying students
+            max_students = rng.choice([0, 20, 40, 60])
+            mentor = Mentors_data(id=i, name=f"Mentor {i}", department=rng.choice(departments), max_students=max_students)
+            mentors_by_dept.setdefault(mentor.department, []).append(mentor)
+            loads[i] = rng.randint(0, max_students // 2) if max_students else rng.randint(0, 10)
+
+        students_by_branch = {}
+        # skewed branch sizes, plus one branch without mentors, so overflow happens
+        weights = [len(departments) - i for i in range(len(departments))] + [1]
+        for i in range(1, options["students"] + 1):
+            branch = rng.choices(departments + ["NOMENTORS"], weights=weights)[0]
+            students_by_branch.setdefault(branch, []).append({"id": i, "branch": branch, "student_id": None})
+
+        return students_by_branch, mentors_by_dept, loads
+
+    def handle(self, *args, **options):
+        data = self.synthetic_data(options)
+        self.stdout.write(
+            f"{options['students']} students x {options['mentors']} mentors "
+            f"in {options['departments']} departments"
+        )
+        self.stdout.write(f"{'strategy':<14}{'seconds':>9}{'assigned':>10}{'cross-dept':>12}"
+                          f"{'load min':>10}{'load max':>10}{'load stdev':>12}")
+
+        for name in STRATEGIES:
+            start = time.perf_counter()
+            assignments, loads = plan_assignments(name, data)
+            seconds = time.perf_counter() - start
+
+            mentor_loads = [loads.get(m.id, 0) for mentors in data[1].values() for m in mentors]
+            cross = sum(1 for row, mentor in assignments if row["branch"] != mentor.department)
+            self.stdout.write(
+                f"{name:<14}{seconds:>9.3f}{len(assignments):>10}{cross:>12}"
+                f"{min(mentor_loads):>10}{max(mentor_loads):>10}{statistics.pstdev(mentor_loads):>12.2f}"
+            )
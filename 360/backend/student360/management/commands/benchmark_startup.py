@@ -0,0 +1,89 @@
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Runs in a fresh interpreter: boots Django (importing easyocr first when
+# eager, as the old module-level import did), serves one request through the
+# URLconf and reports the request latency, its status, whether easyocr got
+# imported and how long that import took.
+FIRST_REQUEST_SCRIPT = """
+import os, sys, time
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", {settings_module!r})
+ocr_import = -1.0
+if {eager!r}:
+    start = time.perf_counter()
+    try:
+        import easyocr
+        ocr_import = time.perf_counter() - start
+    except ImportError:
+        pass
+import django
+django.setup()
+from django.test import Client
+start = time.perf_counter()
+status = Client(HTTP_HOST={host!r}).get("/api/student360/student/companies/").status_code
+print(time.perf_counter() - start, status, "easyocr" in sys.modules, ocr_import)
+"""
+
+
+class Command(BaseCommand):
+    help = "Measure cold start-up (manage.py check) and first-request latency, with lazy and eager easyocr"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5)
+
+    def run(self, args):
+        return subprocess.run(
+            [sys.executable, *args], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        )
+
+    def host(self):
+        # DEBUG with empty ALLOWED_HOSTS still accepts localhost
+        hosts = [h.lstrip(".") for h in settings.ALLOWED_HOSTS if h != "*"]
+        return hosts[0] if hosts else "localhost"
+
+    def first_request(self, eager):
+        script = FIRST_REQUEST_SCRIPT.format(settings_module=settings.SETTINGS_MODULE, eager=eager, host=self.host())
+        start = time.perf_counter()
+        seconds, status, loaded, ocr_import = self.run(["-c", script]).stdout.split()[-4:]
+        total = time.perf_counter() - start
+        # unauthenticated -> 401 once the view ran; 400 / 500 means we measured an error page
+        if int(status) in (400, 500):
+            raise CommandError(f"First request returned {status}, check ALLOWED_HOSTS / settings")
+        return total, loaded == "True", float(ocr_import)
+
+    def handle(self, *args, **options):
+        check_times = []
+        lazy_times = []
+        eager_times = []
+        import_times = []
+        ocr_loaded = False
+
+        for _ in range(options["runs"]):
+            start = time.perf_counter()
+            self.run(["manage.py", "check"])
+            check_times.append(time.perf_counter() - start)
+
+            total, loaded, _ = self.first_request(eager=False)
+            lazy_times.append(total)
+            ocr_loaded = ocr_loaded or loaded
+
+            total, _, ocr_import = self.first_request(eager=True)
+            eager_times.append(total)
+            if ocr_import >= 0:
+                import_times.append(ocr_import)
+
+        self.stdout.write(f"manage.py check (cold):                  median {statistics.median(check_times):.3f}s")
+        self.stdout.write(f"boot + first request (lazy easyocr):     median {statistics.median(lazy_times):.3f}s")
+        self.stdout.write(f"boot + first request (eager easyocr):    median {statistics.median(eager_times):.3f}s")
+        if import_times:
+            self.stdout.write(f"import easyocr:                          median {statistics.median(import_times):.3f}s")
+        else:
+            self.stdout.write("import easyocr:                          not installed")
+        self.stdout.write(f"easyocr imported at start-up (lazy):     {'yes' if ocr_loaded else 'no'}")
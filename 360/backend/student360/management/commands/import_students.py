@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from student360.bulk_upload import DEFAULT_CHUNK_SIZE, ingest_students
+
+
+class Command(BaseCommand):
+    help = "Stream a student roster (.xlsx or .csv) into Students_data in fixed-size chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--year", required=True, help="Batch year for the new rows")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        def progress(report):
+            self.stdout.write(
+                f"chunk {report['chunks']}: {report['rows_processed']} rows, "
+                f"{report['records_saved']} saved, {report['records_skipped']} skipped"
+            )
+
+        try:
+            with open(options["path"], "rb") as f:
+                report = ingest_students(f, options["year"], options["chunk_size"], progress=progress)
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {report['records_saved']} saved, {report['records_skipped']} skipped"
+        ))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from student360.ocr_batch import import_marksheet_batch
+
+
+class Command(BaseCommand):
+    help = "OCR a ZIP of marksheets (with manifest.csv) and bulk insert the students"
+
+    def add_arguments(self, parser):
+        parser.add_argument("zip_path")
+        parser.add_argument("--year", required=True, help="Batch year for the Students_data rows")
+        parser.add_argument("--workers", type=int, default=None, help="OCR processes (default: CPU count)")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["zip_path"], "rb") as f:
+                report = import_marksheet_batch(f, options["year"], workers=options["workers"])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        for item in report["files"]:
+            self.stdout.write(f"{item['file']}: {item['obtained']}/{item['total']} in {item['seconds']}s")
+        for err in report["errors"]:
+            self.stdout.write(self.style.WARNING(f"row {err['row']}: {err['error']}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['records_saved']} saved, {report['records_skipped']} skipped; "
+            f"{len(report['files'])} files on {report['workers']} workers, "
+            f"{report['files_per_second']} files/s"
+        ))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from student360.mentor_assignment import reconcile_mentor_counts
+
+
+class Command(BaseCommand):
+    help = "Recount assigned students and repair any Mentors_data.current_student_count that drifted"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report the drift")
+
+    def handle(self, *args, **options):
+        drifted = reconcile_mentor_counts(fix=not options["dry_run"])
+        for mentor, stored, actual in drifted:
+            self.stdout.write(f"{mentor.id} {mentor.name}: stored {stored}, actual {actual}")
+
+        verb = "Found" if options["dry_run"] else "Fixed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(drifted)} mentor counts out of sync"))
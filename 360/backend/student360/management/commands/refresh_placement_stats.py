@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from student360.placement_stats import refresh_placement_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the PlacementStat table from Students_data and Offer"
+
+    def handle(self, *args, **options):
+        groups = refresh_placement_stats()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {groups} batch / branch groups"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from student360.models import StudentDocument
+
+
+class Command(BaseCommand):
+    help = "Rebuild the metadata search tokens for existing student documents"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        docs = StudentDocument.objects.only("id", "metadata").order_by("id")
+        total = 0
+        for doc in docs.iterator(chunk_size=options["chunk_size"]):
+            doc.reindex_search_tokens()
+            total += 1
+        self.stdout.write(self.style.SUCCESS(f"Reindexed {total} documents"))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from student360.ocr import get_reader_pool
+from student360.ocr_jobs import REDIS_QUEUE_KEY, get_redis, run_ocr_job
+
+
+class Command(BaseCommand):
+    help = "Process add_student OCR jobs queued in Redis (OCR_JOB_BACKEND = 'redis')"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--timeout", type=int, default=5, help="Seconds to block waiting for a job")
+        parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+
+    def handle(self, *args, **options):
+        conn = get_redis()
+        get_reader_pool().warm_up()
+        self.stdout.write("OCR worker ready")
+
+        while True:
+            item = conn.blpop(REDIS_QUEUE_KEY, timeout=options["timeout"])
+            if item is None:
+                if options["once"]:
+                    break
+                continue
+
+            job = run_ocr_job(item[1].decode())
+            self.stdout.write(f"{job.id}: {job.status}")
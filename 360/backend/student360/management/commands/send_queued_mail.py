@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from student360.outbox import send_due
+
+
+class Command(BaseCommand):
+    help = "Deliver queued OutboxEmail rows in batches over a pooled connection"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None, help="Emails claimed per round")
+        parser.add_argument("--loop", action="store_true", help="Keep running and poll for new mail")
+        parser.add_argument("--interval", type=float, default=5, help="Seconds to sleep when the queue is idle")
+
+    def handle(self, *args, **options):
+        while True:
+            attempted, sent = send_due(batch_size=options["batch_size"])
+            if attempted:
+                self.stdout.write(f"{sent}/{attempted} emails sent")
+            if not options["loop"]:
+                break
+            if not attempted:
+                time.sleep(options["interval"])
@@ -0,0 +1,287 @@
+# student360/mentor_assignment.py
+# Mentor auto-assignment as plan + apply.
+#
+# load_planning_data() reads the mentors (with their current_student_count
+# counters) and the unassigned students. A strategy turns that into a plan in memory and
+# apply_plan() writes it back with one conditional UPDATE per mentor, so a full
+# incoming batch costs a handful of queries regardless of its size.
+#
+# Strategies (STRATEGIES, picked per request):
+#   "even"         - ceil(students / mentors) per mentor, in mentor id order (the original behaviour)
+#   "round_robin"  - deal students out one at a time across mentors with room left
+#   "least_loaded" - every student goes to the department mentor with the fewest students (heap)
+#   "weighted"     - every student goes to the mentor with the lowest fill ratio load / max_students
+#   "balanced"     - least_loaded within the department, then students nobody in their
+#                    department can take overflow to the least-loaded mentors elsewhere
+#
+# max_students == 0 means unlimited everywhere.
+import heapq
+from collections import Counter
+from math import ceil
+
+from django.db import models, transaction
+
+from .caching import invalidate_student_profiles
+from .models import Mentors_data, Students_data, shift_mentor_load
+
+BULK_UPDATE_BATCH_SIZE = 1000
+DEFAULT_STRATEGY = "even"
+
+
+def load_planning_data(include_unmatched=False):
+    """
+    Returns (students_by_branch, mentors_by_dept, loads): unassigned student rows
+    ({id, branch, student_id}) grouped by branch, mentors grouped by department
+    and the current load of every mentor. Students of branches without mentors
+    are only loaded with include_unmatched.
+    """
+    mentors_by_dept = {}
+    for mentor in Mentors_data.objects.exclude(department__isnull=True).order_by("id"):
+        mentors_by_dept.setdefault(mentor.department, []).append(mentor)
+    if not mentors_by_dept:
+        return {}, {}, {}
+
+    students_by_branch = {}
+    unassigned = Students_data.objects.filter(assigned_mentor__isnull=True)
+    if not include_unmatched:
+        unassigned = unassigned.filter(branch__in=list(mentors_by_dept))
+    unassigned = unassigned.order_by("id").values("id", "branch", "student_id")
+    for row in unassigned:
+        students_by_branch.setdefault(row["branch"], []).append(row)
+
+    loads = {m.id: m.current_student_count for mentors in mentors_by_dept.values() for m in mentors}
+    return students_by_branch, mentors_by_dept, loads
+
+
+def room_left(mentor, loads):
+    """Students the mentor can still take, None if unlimited."""
+    if mentor.max_students and mentor.max_students > 0:
+        return max(0, mentor.max_students - loads.get(mentor.id, 0))
+    return None
+
+
+# ---------------- Per-department strategies ----------------
+# fn(students, mentors, loads) -> [(student row, mentor)], updating `loads`.
+
+def assign_even(students, mentors, loads):
+    # target number per mentor (ceil so all students assigned)
+    per_mentor = ceil(len(students) / len(mentors))
+    assignments = []
+    student_index = 0
+    for mentor in mentors:
+        room = room_left(mentor, loads)
+        # unlimited mentors still only get per_mentor
+        assign_count = min(per_mentor, per_mentor if room is None else room)
+        if assign_count <= 0:
+            continue
+
+        chunk = students[student_index: student_index + assign_count]
+        assignments.extend((row, mentor) for row in chunk)
+        loads[mentor.id] = loads.get(mentor.id, 0) + len(chunk)
+        student_index += len(chunk)
+        if student_index >= len(students):
+            break
+    return assignments
+
+
+def assign_round_robin(students, mentors, loads):
+    assignments = []
+    remaining = iter(students)
+    open_mentors = [m for m in mentors if room_left(m, loads) != 0]
+    while open_mentors:
+        full = set()
+        for mentor in open_mentors:
+            row = next(remaining, None)
+            if row is None:
+                return assignments
+            assignments.append((row, mentor))
+            loads[mentor.id] = loads.get(mentor.id, 0) + 1
+            if room_left(mentor, loads) == 0:
+                full.add(mentor.id)
+        open_mentors = [m for m in open_mentors if m.id not in full]
+    return assignments
+
+
+def _assign_by_heap(students, mentors, loads, key):
+    """Give each student to the mentor with the smallest key(mentor, load)."""
+    heap = [(key(m, loads.get(m.id, 0)), m.id, m) for m in mentors if room_left(m, loads) != 0]
+    heapq.heapify(heap)
+
+    assignments = []
+    for row in students:
+        if not heap:
+            break
+        _, _, mentor = heapq.heappop(heap)
+        assignments.append((row, mentor))
+        loads[mentor.id] = loads.get(mentor.id, 0) + 1
+        if room_left(mentor, loads) != 0:
+            heapq.heappush(heap, (key(mentor, loads[mentor.id]), mentor.id, mentor))
+    return assignments
+
+
+def assign_least_loaded(students, mentors, loads):
+    return _assign_by_heap(students, mentors, loads, lambda m, load: load)
+
+
+def assign_weighted(students, mentors, loads):
+    # Unlimited mentors count as large as the biggest capped mentor in the department
+    default_capacity = max((m.max_students for m in mentors if m.max_students and m.max_students > 0), default=1)
+
+    def fill_ratio(mentor, load):
+        capacity = mentor.max_students if mentor.max_students and mentor.max_students > 0 else default_capacity
+        return (load + 1) / capacity
+
+    return _assign_by_heap(students, mentors, loads, fill_ratio)
+
+
+def by_department(assign):
+    """Run a per-department strategy for every department that has mentors."""
+    def plan(students_by_branch, mentors_by_dept, loads):
+        assignments = []
+        for dept, mentors in mentors_by_dept.items():
+            students = students_by_branch.get(dept)
+            if students:
+                assignments.extend(assign(students, mentors, loads))
+        return assignments
+    return plan
+
+
+def plan_balanced(students_by_branch, mentors_by_dept, loads):
+    """
+    least_loaded inside each department first. The students left over (their
+    department is full or has no mentors) then go to the least-loaded mentors
+    with room anywhere. Every cross-department placement costs the same, so
+    this greedy pass is already a minimum-cost balancing of the overflow.
+    """
+    assignments = []
+    overflow = []
+    for branch, students in students_by_branch.items():
+        mentors = mentors_by_dept.get(branch)
+        placed = assign_least_loaded(students, mentors, loads) if mentors else []
+        assignments.extend(placed)
+        overflow.extend(students[len(placed):])
+
+    if overflow:
+        everyone = [m for mentors in mentors_by_dept.values() for m in mentors]
+        overflow.sort(key=lambda row: row["id"])
+        assignments.extend(assign_least_loaded(overflow, everyone, loads))
+    return assignments
+
+
+STRATEGIES = {
+    "even": by_department(assign_even),
+    "round_robin": by_department(assign_round_robin),
+    "least_loaded": by_department(assign_least_loaded),
+    "weighted": by_department(assign_weighted),
+    "balanced": plan_balanced,
+}
+
+
+def plan_assignments(strategy=DEFAULT_STRATEGY, data=None):
+    """
+    Returns (assignments, loads): [(student row, mentor)] and {mentor id: load
+    after the plan}. `data` is load_planning_data() output (loaded if omitted).
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    students_by_branch, mentors_by_dept, loads = data or load_planning_data(strategy == "balanced")
+    loads = dict(loads)
+    return STRATEGIES[strategy](students_by_branch, mentors_by_dept, loads), loads
+
+
+def describe_plan(assignments, loads, data, strategy):
+    """JSON-friendly summary of a plan (the dry-run response)."""
+    students_by_branch, mentors_by_dept, before = data
+    candidates = sum(len(students) for students in students_by_branch.values())
+    mentors = []
+    for dept_mentors in mentors_by_dept.values():
+        for m in dept_mentors:
+            mentors.append({
+                "id": m.id,
+                "name": m.name,
+                "department": m.department,
+                "max_students": m.max_students,
+                "current": before.get(m.id, 0),
+                "proposed": loads.get(m.id, 0),
+            })
+    return {
+        "strategy": strategy,
+        "assigned": len(assignments),
+        "unassigned": candidates - len(assignments),
+        "mentors": mentors,
+        "assignments": [
+            {"student": row["id"], "mentor": mentor.id, "cross_department": row["branch"] != mentor.department}
+            for row, mentor in assignments
+        ],
+    }
+
+
+def apply_plan(assignments, loads):
+    """
+    Write a plan; returns the number of students actually assigned.
+
+    The plan may be stale by now (read without locks; another request or a
+    manual assignment may have got there first), so only students that are
+    still unassigned are updated and the counters move by the rows updated.
+    """
+    if not assignments:
+        return 0
+
+    by_mentor = {}
+    for row, mentor in assignments:
+        by_mentor.setdefault(mentor.id, []).append(row["id"])
+
+    with transaction.atomic():
+        # one UPDATE per mentor (and chunk), conditional on the student still being free
+        added = Counter()
+        for mentor_id, ids in by_mentor.items():
+            for i in range(0, len(ids), BULK_UPDATE_BATCH_SIZE):
+                added[mentor_id] += Students_data.objects.filter(
+                    id__in=ids[i:i + BULK_UPDATE_BATCH_SIZE], assigned_mentor__isnull=True
+                ).update(assigned_mentor_id=mentor_id)
+
+        # Counters move by the number of new students (F expressions, so
+        # concurrent assignments are not lost); one UPDATE per distinct increment
+        by_increment = {}
+        for mentor_id, n in added.items():
+            if n:
+                by_increment.setdefault(n, []).append(mentor_id)
+        for n, mentor_ids in by_increment.items():
+            Mentors_data.objects.filter(id__in=mentor_ids).update(
+                current_student_count=models.F("current_student_count") + n
+            )
+
+        # update() skips post_save
+        invalidate_student_profiles([row["student_id"] for row, _ in assignments])
+
+    return sum(added.values())
+
+
+def release_mentor_seat(sender, instance, **kwargs):
+    """post_delete receiver: a deleted Students_data row frees its mentor's seat."""
+    shift_mentor_load(instance.assigned_mentor_id, -1)
+
+
+def reconcile_mentor_counts(fix=True):
+    """
+    Compare every current_student_count with a fresh count of Students_data.
+    Returns [(mentor, stored, actual)] for the mentors that drifted, fixing them with `fix`.
+    """
+    actual = dict(
+        Students_data.objects.filter(assigned_mentor__isnull=False)
+        .values_list("assigned_mentor")
+        .annotate(count=models.Count("id"))
+    )
+    drifted = []
+    for mentor in Mentors_data.objects.order_by("id").only("id", "name", "current_student_count"):
+        count = actual.get(mentor.id, 0)
+        if mentor.current_student_count != count:
+            drifted.append((mentor, mentor.current_student_count, count))
+
+    if fix and drifted:
+        for mentor, _, count in drifted:
+            mentor.current_student_count = count
+        Mentors_data.objects.bulk_update(
+            [mentor for mentor, _, _ in drifted], ["current_student_count"], batch_size=BULK_UPDATE_BATCH_SIZE
+        )
+    return drifted
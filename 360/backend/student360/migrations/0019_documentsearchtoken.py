@@ -0,0 +1,25 @@
+# Generated by Django 4.2.20 on 2026-10-18 08:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student360', '0018_remove_companyapplication_ignored'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=100)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='student360.studentdocument')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['token', 'document'], name='student360__token_f58ca0_idx')],
+            },
+        ),
+    ]
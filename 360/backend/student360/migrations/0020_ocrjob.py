@@ -0,0 +1,35 @@
+# Generated by Django 4.2.20 on 2026-10-18 08:42
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student360', '0019_documentsearchtoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OcrJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255)),
+                ('dob', models.DateField()),
+                ('batch_year', models.CharField(max_length=20)),
+                ('marks10_file', models.FileField(blank=True, null=True, upload_to='ocr_jobs/10th/')),
+                ('marks12_file', models.FileField(blank=True, null=True, upload_to='ocr_jobs/12th/')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20)),
+                ('total_files', models.IntegerField(default=0)),
+                ('processed_files', models.IntegerField(default=0)),
+                ('results', models.JSONField(blank=True, default=dict)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.20 on 2026-10-18 08:47
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student360', '0021_outboxemail'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='outboxemail',
+            name='student360__status_4465e3_idx',
+        ),
+        migrations.AddField(
+            model_name='outboxemail',
+            name='next_attempt_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='outboxemail',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='student360__status_5553d8_idx'),
+        ),
+    ]
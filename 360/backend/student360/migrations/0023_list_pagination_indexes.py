@@ -0,0 +1,29 @@
+# Generated by Django 4.2.20 on 2026-10-18 08:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student360', '0022_outboxemail_next_attempt_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='companydata',
+            index=models.Index(fields=['created_at', 'id'], name='student360__created_039eca_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mentors_data',
+            index=models.Index(fields=['name', 'id'], name='student360__name_6bd518_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentdocument',
+            index=models.Index(fields=['student', 'uploaded_at'], name='student360__student_e2f86c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='students_data',
+            index=models.Index(fields=['name', 'id'], name='student360__name_05a0c3_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.20 on 2026-10-18 08:56
+
+from django.db import migrations
+from django.db.models import Count
+
+
+def recount_mentor_loads(apps, schema_editor):
+    # current_student_count becomes authoritative from here on - start it from the real counts
+    Mentors_data = apps.get_model('student360', 'Mentors_data')
+    Students_data = apps.get_model('student360', 'Students_data')
+
+    counts = dict(
+        Students_data.objects.filter(assigned_mentor__isnull=False)
+        .values_list('assigned_mentor').annotate(count=Count('id'))
+    )
+    mentors = list(Mentors_data.objects.only('id', 'current_student_count'))
+    for mentor in mentors:
+        mentor.current_student_count = counts.get(mentor.id, 0)
+    Mentors_data.objects.bulk_update(mentors, ['current_student_count'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student360', '0023_list_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(recount_mentor_loads, migrations.RunPython.noop),
+    ]
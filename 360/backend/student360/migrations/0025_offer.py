@@ -0,0 +1,28 @@
+# Generated by Django 4.2.20 on 2026-10-18 08:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student360', '0024_recount_mentor_loads'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Offer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('company', models.CharField(max_length=255)),
+                ('category', models.CharField(choices=[('product', 'Product'), ('service', 'Service'), ('dream', 'Dream')], max_length=20)),
+                ('ctc', models.FloatField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='offers', to='student360.students_data')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['student', 'category'], name='student360__student_079ebb_idx'), models.Index(fields=['company', 'ctc'], name='student360__company_cd4c73_idx'), models.Index(fields=['category', 'ctc'], name='student360__categor_7c1df6_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.20 on 2026-10-18 09:30
+
+from django.db import migrations
+
+CATEGORIES = ["product", "service", "dream"]
+
+
+def backfill_offers(apps, schema_editor):
+    Students_data = apps.get_model('student360', 'Students_data')
+    Offer = apps.get_model('student360', 'Offer')
+
+    records = Students_data.objects.only('id', 'product', 'service', 'dream', 'offer_count').order_by('id')
+    offers = []
+    recounted = []
+    for record in records.iterator(chunk_size=1000):
+        count = 0
+        for category in CATEGORIES:
+            for o in getattr(record, category) or []:
+                offers.append(Offer(student_id=record.id, company=o.get('company') or '',
+                                    category=category, ctc=float(o.get('ctc') or 0)))
+                count += 1
+        if record.offer_count != count:
+            record.offer_count = count
+            recounted.append(record)
+
+        if len(offers) >= 1000:
+            Offer.objects.bulk_create(offers)
+            offers = []
+
+    Offer.objects.bulk_create(offers)
+    Students_data.objects.bulk_update(recounted, ['offer_count'], batch_size=1000)
+
+
+def clear_offers(apps, schema_editor):
+    apps.get_model('student360', 'Offer').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student360', '0025_offer'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_offers, clear_offers),
+    ]
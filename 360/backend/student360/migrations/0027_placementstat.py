@@ -0,0 +1,33 @@
+# Generated by Django 4.2.20 on 2026-10-18 08:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student360', '0026_backfill_offers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlacementStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('batch_year', models.CharField(max_length=20)),
+                ('branch', models.CharField(max_length=200)),
+                ('students', models.IntegerField(default=0)),
+                ('placed', models.IntegerField(default=0)),
+                ('placement_rate', models.FloatField(default=0)),
+                ('median_ctc', models.FloatField(blank=True, null=True)),
+                ('max_ctc', models.FloatField(blank=True, null=True)),
+                ('product_offers', models.IntegerField(default=0)),
+                ('service_offers', models.IntegerField(default=0)),
+                ('dream_offers', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('batch_year', 'branch')},
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.20 on 2026-10-18 12:10
+
+import re
+
+from django.db import migrations
+
+
+# frozen copies of models.metadata_search_words / metadata_search_tokens
+def search_words(value):
+    if isinstance(value, dict):
+        value = [*value.keys(), *value.values()]
+    if isinstance(value, (list, tuple)):
+        words = set()
+        for item in value:
+            words |= search_words(item)
+        return words
+    if value is None:
+        return set()
+    return set(re.findall(r"[a-z0-9+#]+", str(value).lower()))
+
+
+def metadata_search_tokens(value):
+    return {word[i:][:100] for word in search_words(value) for i in range(len(word))}
+
+
+def reindex(apps, schema_editor):
+    StudentDocument = apps.get_model('student360', 'StudentDocument')
+    DocumentSearchToken = apps.get_model('student360', 'DocumentSearchToken')
+
+    DocumentSearchToken.objects.all().delete()
+    tokens = []
+    for doc in StudentDocument.objects.only('id', 'metadata').order_by('id').iterator(chunk_size=500):
+        tokens.extend(DocumentSearchToken(document_id=doc.id, token=t) for t in metadata_search_tokens(doc.metadata))
+        if len(tokens) >= 5000:
+            DocumentSearchToken.objects.bulk_create(tokens)
+            tokens = []
+    DocumentSearchToken.objects.bulk_create(tokens)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student360', '0027_placementstat'),
+    ]
+
+    operations = [
+        migrations.RunPython(reindex, migrations.RunPython.noop),
+    ]
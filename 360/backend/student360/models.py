@@ -1,7 +1,8 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 import os
+import re
 
 
 # ------------------ Custom User Model ------------------
@@ -64,6 +65,29 @@ def student_document_path(instance, filename):
     return f"students_docs/{instance.student.id}/{filename}"
 
 
+def metadata_search_words(value):
+    """Lowercased words found in the keys and values of a document's metadata JSON (or a keyword)."""
+    if isinstance(value, dict):
+        value = [*value.keys(), *value.values()]
+    if isinstance(value, (list, tuple)):
+        words = set()
+        for item in value:
+            words |= metadata_search_words(item)
+        return words
+    if value is None:
+        return set()
+    return set(re.findall(r"[a-z0-9+#]+", str(value).lower()))
+
+
+def metadata_search_tokens(value):
+    """
+    What DocumentSearchToken stores for a metadata JSON: every suffix of every
+    word, so a prefix lookup on the tokens finds keywords inside words too
+    ("script" in "javascript").
+    """
+    return {word[i:][:100] for word in metadata_search_words(value) for i in range(len(word))}
+
+
 class StudentDocument(models.Model):
     student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="documents")
 
@@ -94,17 +118,45 @@ class StudentDocument(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=["student", "document_type"]),
+            models.Index(fields=["student", "uploaded_at"]),
         ]
 
     def __str__(self):
         return f"{self.student.user.email} - {self.document_type}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "metadata" in update_fields:
+            self.reindex_search_tokens()
+
+    def reindex_search_tokens(self):
+        # Keep the search token table in step with metadata
+        self.search_tokens.all().delete()
+        DocumentSearchToken.objects.bulk_create([
+            DocumentSearchToken(document=self, token=token)
+            for token in metadata_search_tokens(self.metadata)
+        ])
+
     def delete(self, *args, **kwargs):
         if self.document and os.path.isfile(self.document.path):
             os.remove(self.document.path)
         super().delete(*args, **kwargs)
 
 
+class DocumentSearchToken(models.Model):
+    document = models.ForeignKey(StudentDocument, on_delete=models.CASCADE, related_name="search_tokens")
+    token = models.CharField(max_length=100)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["token", "document"]),
+        ]
+
+    def __str__(self):
+        return f"{self.document_id} - {self.token}"
+
+
 # ADMIN
 from django.db import models
 import hashlib
@@ -136,6 +188,38 @@ class AdmissionStudent(models.Model):
             self.marks12_file.seek(0)
         super().save(*args, **kwargs)
 
+import uuid
+
+class OcrJob(models.Model):
+    """Marksheet OCR for an add_student upload, run by a background worker."""
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=255)
+    dob = models.DateField()
+    batch_year = models.CharField(max_length=20)
+
+    marks10_file = models.FileField(upload_to='ocr_jobs/10th/', null=True, blank=True)
+    marks12_file = models.FileField(upload_to='ocr_jobs/12th/', null=True, blank=True)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending", db_index=True)
+    total_files = models.IntegerField(default=0)
+    processed_files = models.IntegerField(default=0)
+    results = models.JSONField(default=dict, blank=True)  # {"marks10": {"obtained", "total"}, ...}
+    error = models.TextField(null=True, blank=True)
+
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} - {self.status}"
+
 from django.db import models
 
 class Students_data(models.Model):
@@ -176,11 +260,96 @@ class Students_data(models.Model):
         unique_together = ('name', 'dob')  # Composite key
         indexes = [
             models.Index(fields=['batch_year']),
+            models.Index(fields=['name', 'id']),
         ]
 
     def __str__(self):
         return f"{self.name} - {self.batch_year}"
 
+    # Mentors_data.current_student_count follows assigned_mentor changes made through save()
+    _loaded_mentor_id = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_mentor_id = instance.__dict__.get("assigned_mentor_id", models.DEFERRED)
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        previous = None if self._state.adding else self._loaded_mentor_id
+        track = previous is not models.DEFERRED and (
+            update_fields is None or {"assigned_mentor", "assigned_mentor_id"} & set(update_fields)
+        )
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if track and previous != self.assigned_mentor_id:
+                shift_mentor_load(previous, -1)
+                shift_mentor_load(self.assigned_mentor_id, 1)
+        self._loaded_mentor_id = self.assigned_mentor_id
+
+
+def shift_mentor_load(mentor_id, delta):
+    """Atomically add `delta` to a mentor's current_student_count."""
+    if mentor_id and delta:
+        Mentors_data.objects.filter(id=mentor_id).update(
+            current_student_count=models.F("current_student_count") + delta
+        )
+
+
+class Offer(models.Model):
+    """
+    One current placement offer of a student, mirroring the product / service /
+    dream JSON lists on Students_data (kept in step by student360.offers).
+    """
+    CATEGORY_CHOICES = [
+        ("product", "Product"),
+        ("service", "Service"),
+        ("dream", "Dream"),
+    ]
+
+    student = models.ForeignKey(Students_data, on_delete=models.CASCADE, related_name="offers")
+    company = models.CharField(max_length=255)
+    category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
+    ctc = models.FloatField()  # LPA
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["student", "category"]),
+            models.Index(fields=["company", "ctc"]),
+            models.Index(fields=["category", "ctc"]),
+        ]
+
+    def __str__(self):
+        return f"{self.student.name} - {self.company} ({self.category})"
+
+
+class PlacementStat(models.Model):
+    """
+    Precomputed placement numbers per (batch_year, branch), refreshed by
+    student360.placement_stats whenever offers or rosters change.
+    """
+    batch_year = models.CharField(max_length=20)
+    branch = models.CharField(max_length=200)
+
+    students = models.IntegerField(default=0)
+    placed = models.IntegerField(default=0)
+    placement_rate = models.FloatField(default=0)  # percent
+    median_ctc = models.FloatField(null=True, blank=True)  # of each placed student's best offer
+    max_ctc = models.FloatField(null=True, blank=True)
+    product_offers = models.IntegerField(default=0)
+    service_offers = models.IntegerField(default=0)
+    dream_offers = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("batch_year", "branch")
+
+    def __str__(self):
+        return f"{self.batch_year} {self.branch}: {self.placed}/{self.students}"
+
 from django.db import models
 from django.utils import timezone
 from datetime import timedelta
@@ -199,6 +368,7 @@ class Mentors_data(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=['department']),
+            models.Index(fields=['name', 'id']),
         ]
 
     
@@ -206,6 +376,36 @@ class Mentors_data(models.Model):
     def __str__(self):
         return f"{self.name} - {self.department or 'No Dept'}"
 
+class OutboxEmail(models.Model):
+    """Outgoing mail, queued by the request and delivered by student360.outbox."""
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("sent", "Sent"),
+        ("failed", "Failed"),
+    ]
+
+    batch_id = models.CharField(max_length=64, null=True, blank=True, db_index=True)  # e.g. one mentor upload
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255, null=True, blank=True)  # None -> DEFAULT_FROM_EMAIL
+    to = models.JSONField(default=list)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="queued")
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(null=True, blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)  # backoff / dispatcher lease
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{', '.join(self.to)} - {self.subject} ({self.status})"
+
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
@@ -228,6 +428,11 @@ class CompanyData(models.Model):
     registration_deadline = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+        ]
+
     def __str__(self):
         return self.company_name
 
@@ -0,0 +1,140 @@
+# student360/ocr.py
+# OCR service used for marksheet extraction.
+# easyocr pulls in torch, so it is only imported the first time OCR is needed
+# instead of on every worker / manage.py start-up.
+import os
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+_easyocr = None
+
+
+def get_easyocr():
+    global _easyocr
+    if _easyocr is None:
+        import easyocr
+        _easyocr = easyocr
+    return _easyocr
+
+
+class ReaderPool:
+    """
+    Fixed-size pool of easyocr.Reader objects shared by all OCR callers.
+    Readers are created on first use (loading model weights once) and then
+    handed out to one thread at a time.
+    """
+
+    def __init__(self, size=1, languages=("en",), gpu=False):
+        self.size = max(1, size)
+        self.languages = list(languages)
+        self.gpu = gpu
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _new_reader(self):
+        return get_easyocr().Reader(self.languages, gpu=self.gpu)
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+
+        if not can_create:
+            # Pool is full - wait for another caller to hand a reader back
+            return self._idle.get()
+
+        try:
+            return self._new_reader()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def release(self, reader):
+        self._idle.put(reader)
+
+    @contextmanager
+    def reader(self):
+        reader = self.acquire()
+        try:
+            yield reader
+        finally:
+            self.release(reader)
+
+    def warm_up(self):
+        """Load every reader up front (e.g. when a worker process starts)."""
+        readers = [self.acquire() for _ in range(self.size)]
+        for reader in readers:
+            self.release(reader)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_reader_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ReaderPool(
+                    size=getattr(settings, "OCR_READER_POOL_SIZE", 1),
+                    languages=getattr(settings, "OCR_LANGUAGES", ["en"]),
+                    gpu=getattr(settings, "OCR_GPU", False),
+                )
+    return _pool
+
+
+def read_text(image_path):
+    """Return the list of text fragments easyocr finds in the image."""
+    with get_reader_pool().reader() as reader:
+        return reader.readtext(image_path, detail=0)
+
+
+def parse_marks(text):
+    """Pick "obtained / total" marks out of OCR text, e.g. "452 / 500"."""
+    m = re.search(r"(\d{2,3})\s*/\s*(\d{2,3})", text)
+    if m:
+        return int(m.group(1)), int(m.group(2))
+    return None, None
+
+
+def extract_marks(image_path):
+    """
+    Run OCR on a marksheet image; returns (obtained, total), (None, None) when
+    no marks could be read. OCR errors are raised for the caller to record.
+    """
+    text = " ".join(read_text(image_path)).lower()
+    return parse_marks(text)
+
+
+def timed_extract(image_path):
+    """extract_marks() plus the seconds it took, for throughput reports (errors count as no marks)."""
+    start = time.perf_counter()
+    try:
+        obtained, total = extract_marks(image_path)
+    except Exception as e:
+        print("OCR Error:", e)
+        obtained, total = None, None
+    return obtained, total, time.perf_counter() - start
+
+
+def init_worker_process(settings_module, warm_up=False):
+    """Process-pool initializer: set up Django (and optionally load the readers)."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+    django.setup()
+    if warm_up:
+        get_reader_pool().warm_up()
@@ -0,0 +1,195 @@
+# student360/ocr_batch.py
+# Bulk marksheet OCR for a whole admission folder.
+#
+# The upload is a ZIP holding the marksheet images plus a manifest.csv:
+#
+#     name,dob,branch,marks10_file,marks12_file
+#     Asha Rao,2004-05-01,CSE,asha_10.jpg,asha_12.jpg
+#
+# Images are OCR'd in parallel (one process per core, at most
+# OCR_BATCH_MAX_WORKERS, each with its own warmed reader pool) and the results
+# are written with bulk_create.
+import csv
+import hashlib
+import io
+import multiprocessing
+import os
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from django.conf import settings
+from django.db import transaction
+
+from . import ocr
+from .caching import bump_data_version, invalidate_reference_lists
+from .models import AdmissionStudent, Students_data
+from .placement_stats import refresh_placement_stats, stat_keys
+
+MANIFEST_NAME = "manifest.csv"
+FILE_COLUMNS = ("marks10_file", "marks12_file")
+
+
+def read_manifest(archive):
+    names = {os.path.basename(n).lower(): n for n in archive.namelist()}
+    if MANIFEST_NAME not in names:
+        raise ValueError(f"ZIP must contain {MANIFEST_NAME}")
+
+    with archive.open(names[MANIFEST_NAME]) as f:
+        reader = csv.DictReader(io.TextIOWrapper(f, encoding="utf-8-sig"))
+        # cells beyond the header land under the None key (as a list) - ignored
+        rows = [{k.strip().lower(): (v or "").strip() for k, v in row.items() if k is not None} for row in reader]
+
+    for req in ["name", "dob"]:
+        if rows and req not in rows[0]:
+            raise ValueError(f"Missing required manifest column: {req}")
+    return rows
+
+
+def extract_images(archive, rows, target_dir):
+    """Copy the images named in the manifest out of the ZIP; returns {name: local path}."""
+    members = {n.lower(): n for n in archive.namelist()}
+    by_basename = {os.path.basename(n).lower(): n for n in archive.namelist()}
+
+    paths = {}
+    for row in rows:
+        for col in FILE_COLUMNS:
+            name = row.get(col)
+            if not name or name in paths:
+                continue
+            member = members.get(name.lower()) or by_basename.get(os.path.basename(name).lower())
+            if not member:
+                continue
+            # Never trust paths inside the archive - write flat, numbered files
+            local = os.path.join(target_dir, f"{len(paths)}_{os.path.basename(member)}")
+            with archive.open(member) as src, open(local, "wb") as dst:
+                dst.write(src.read())
+            paths[name] = local
+    return paths
+
+
+def run_ocr(paths, workers):
+    """OCR every image; returns {local path: (obtained, total, seconds)}."""
+    paths = list(paths)
+    if workers <= 1 or len(paths) <= 1:
+        return {p: ocr.timed_extract(p) for p in paths}
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=ocr.init_worker_process,
+        initargs=(settings.SETTINGS_MODULE, True),
+    ) as pool:
+        return dict(zip(paths, pool.map(ocr.timed_extract, paths)))
+
+
+def percentage(obtained, total):
+    if obtained is None or not total:
+        return None
+    return round(obtained * 100 / total, 2)
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def batch_workers(requested=None):
+    """OCR processes for a batch: the request's number, capped by the cores and OCR_BATCH_MAX_WORKERS."""
+    limit = min(os.cpu_count() or 1, getattr(settings, "OCR_BATCH_MAX_WORKERS", 4))
+    return max(1, min(requested or limit, limit))
+
+
+def import_marksheet_batch(upload, batch_year, workers=None):
+    """
+    OCR every marksheet in the uploaded ZIP and bulk insert the students into
+    AdmissionStudent and Students_data. Returns a report with per-file timings.
+    """
+    workers = batch_workers(workers)
+    started = time.perf_counter()
+
+    with tempfile.TemporaryDirectory() as tmp, zipfile.ZipFile(upload) as archive:
+        rows = read_manifest(archive)
+        paths = extract_images(archive, rows, tmp)
+
+        ocr_started = time.perf_counter()
+        results = run_ocr(paths.values(), workers)
+        ocr_seconds = time.perf_counter() - ocr_started
+
+        admissions = []
+        records = []
+        errors = []
+        for i, row in enumerate(rows, start=2):  # row 1 is the header
+            try:
+                dob = date.fromisoformat(row["dob"])
+            except ValueError:
+                errors.append({"row": i, "error": f"Invalid dob: {row['dob']}"})
+                continue
+            if not row["name"]:
+                errors.append({"row": i, "error": "Name missing"})
+                continue
+
+            marks = {}
+            hashes = {}
+            for col in FILE_COLUMNS:
+                local = paths.get(row.get(col))
+                if local:
+                    obtained, total, _ = results[local]
+                    marks[col] = percentage(obtained, total)
+                    hashes[col] = file_hash(local)
+
+            admissions.append(AdmissionStudent(
+                name=row["name"],
+                dob=dob,
+                marks10=marks.get("marks10_file"),
+                marks12=marks.get("marks12_file"),
+                file10_hash=hashes.get("marks10_file"),
+                file12_hash=hashes.get("marks12_file"),
+            ))
+            records.append(Students_data(
+                name=row["name"],
+                dob=dob,
+                branch=row.get("branch") or "Unknown",
+                batch_year=batch_year,
+                percentage10=marks.get("marks10_file"),
+                percentage12=marks.get("marks12_file"),
+            ))
+
+        # (name, dob) is unique - existing students are skipped, not overwritten
+        existing = set(Students_data.objects.filter(
+            name__in=[r.name for r in records], dob__in=[r.dob for r in records]
+        ).values_list("name", "dob"))
+        # manifest rows repeating a (name, dob) are skipped too, first one wins
+        new_records = []
+        for r in records:
+            if (r.name, r.dob) not in existing:
+                existing.add((r.name, r.dob))
+                new_records.append(r)
+
+        with transaction.atomic():
+            AdmissionStudent.objects.bulk_create(admissions, batch_size=500, ignore_conflicts=True)
+            Students_data.objects.bulk_create(new_records, batch_size=500, ignore_conflicts=True)
+            # bulk_create skips post_save
+            invalidate_reference_lists()
+            bump_data_version("students")
+            refresh_placement_stats(stat_keys(new_records))
+
+    files = [
+        {"file": name, "obtained": results[local][0], "total": results[local][1],
+         "seconds": round(results[local][2], 3)}
+        for name, local in paths.items()
+    ]
+    return {
+        "batch_year": batch_year,
+        "rows": len(rows),
+        "records_saved": len(new_records),
+        "records_skipped": len(records) - len(new_records),
+        "errors": errors,
+        "files": files,
+        "workers": workers,
+        "ocr_seconds": round(ocr_seconds, 3),
+        "files_per_second": round(len(files) / ocr_seconds, 2) if ocr_seconds else None,
+        "total_seconds": round(time.perf_counter() - started, 3),
+    }
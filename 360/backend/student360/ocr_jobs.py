@@ -0,0 +1,87 @@
+# student360/ocr_jobs.py
+# Background OCR for add_student uploads.
+#
+# OCR_JOB_BACKEND selects how queued jobs are run:
+#   "local" - a process pool inside the web server (no broker needed)
+#   "redis" - job ids are pushed to a Redis list drained by `manage.py run_ocr_worker`
+#   "sync"  - run inline (tests / debugging)
+#
+# Models are imported inside the functions: worker processes are spawned and
+# import this module before Django has been set up.
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db import transaction
+
+from . import ocr
+
+REDIS_QUEUE_KEY = "student360:ocr_jobs"
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(
+                    max_workers=getattr(settings, "OCR_JOB_WORKERS", 2),
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=ocr.init_worker_process,
+                    initargs=(settings.SETTINGS_MODULE,),
+                )
+    return _executor
+
+
+def get_redis():
+    import redis
+    return redis.Redis.from_url(settings.OCR_JOB_REDIS_URL)
+
+
+def enqueue_ocr_job(job_id):
+    backend = getattr(settings, "OCR_JOB_BACKEND", "local")
+    if backend == "redis":
+        get_redis().rpush(REDIS_QUEUE_KEY, job_id)
+    elif backend == "sync":
+        run_ocr_job(job_id)
+    else:
+        get_executor().submit(run_ocr_job, job_id)
+
+
+def submit_ocr_job(job):
+    # Only hand the job to a worker once its row and files are committed
+    transaction.on_commit(lambda: enqueue_ocr_job(str(job.id)))
+
+
+def run_ocr_job(job_id):
+    """Extract marks from every marksheet stored on the job, recording progress."""
+    from .models import OcrJob
+
+    job = OcrJob.objects.get(id=job_id)
+    files = [
+        (key, f) for key, f in (("marks10", job.marks10_file), ("marks12", job.marks12_file)) if f
+    ]
+
+    job.status = "running"
+    job.total_files = len(files)
+    job.processed_files = 0
+    job.save(update_fields=["status", "total_files", "processed_files", "updated_at"])
+
+    try:
+        for key, f in files:
+            obtained, total = ocr.extract_marks(f.path)
+            job.results[key] = {"obtained": obtained, "total": total}
+            job.processed_files += 1
+            job.save(update_fields=["results", "processed_files", "updated_at"])
+        job.status = "done"
+    except Exception as e:
+        print("OCR job error:", e)
+        job.status = "failed"
+        job.error = str(e)
+
+    job.save(update_fields=["status", "error", "updated_at"])
+    return job
@@ -0,0 +1,203 @@
+# student360/offers.py
+# Batch offer engine for placement_bulk_upload and manual_assign.
+#
+# Students are resolved with one query per lookup kind, their Students_data
+# rows are loaded (and the missing ones created) in bulk, the
+# product / service / dream rules run in memory and everything is written
+# back with one bulk_update.
+#
+# The JSON lists stay the source the rules work on; the Offer table mirrors
+# them (sync_offer_rows) so placement analytics are plain SQL aggregates.
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.db.models.functions import Lower
+
+from .caching import bump_data_version, invalidate_reference_lists, invalidate_student_profiles
+from .models import Offer, Student, Students_data
+from .placement_stats import refresh_placement_stats, stat_keys
+
+BULK_BATCH_SIZE = 500
+OFFER_FIELDS = ["product", "service", "dream", "offer_count"]
+
+
+def resolve_students_by_id(ids, field="id"):
+    """{value: Student} for Students whose `field` (id / user_id) is in ids."""
+    students = Student.objects.select_related("user").filter(**{f"{field}__in": set(ids)}).order_by("id")
+    resolved = {}
+    for student in students:
+        resolved.setdefault(getattr(student, field), student)
+    return resolved
+
+
+def resolve_students_by_name(names):
+    """{(first, last) lowercased: Student} for (first, last) pairs, first match by id wins."""
+    names = set(names)
+    if not names:
+        return {}
+    students = (Student.objects.select_related("user")
+                .annotate(first=Lower("user__first_name"), last=Lower("user__last_name"))
+                .filter(first__in={f for f, _ in names}, last__in={l for _, l in names})
+                .order_by("id"))
+    resolved = {}
+    for student in students:
+        key = (student.first, student.last)
+        if key in names:
+            resolved.setdefault(key, student)
+    return resolved
+
+
+def apply_offer(record, company_name, ctc, company_type):
+    """The placement rules for one offer, applied to `record` in memory."""
+    offer = {"company": company_name, "ctc": float(ctc)}
+
+    if company_type == "service":
+        record.service = record.service + [offer]
+        # product exists -> keep only the highest service; otherwise services stack
+        if record.product:
+            record.service = [max(record.service, key=lambda x: x["ctc"])]
+    elif company_type == "product":
+        # Always override product with latest one
+        record.product = [offer]
+    elif company_type == "dream":
+        record.dream = [offer]
+    else:
+        return False
+
+    record.offer_count = len(record.product) + len(record.service) + len(record.dream)
+    return True
+
+
+def records_for(students, batch_year):
+    """
+    {student id: Students_data} for the given students, creating the missing
+    rows (same defaults as the old per-row get_or_create).
+    """
+    students = {s.id: s for s in students}
+    records = {}
+    for record in Students_data.objects.filter(student_id__in=list(students)).order_by("id"):
+        records.setdefault(record.student_id, record)
+
+    missing = [s for sid, s in students.items() if sid not in records]
+    if missing:
+        Students_data.objects.bulk_create([
+            Students_data(
+                student=s,
+                name=f"{s.user.first_name} {s.user.last_name}".strip(),
+                dob=s.dob,
+                branch=s.branch,
+                batch_year=batch_year,
+            )
+            for s in missing
+        ], batch_size=BULK_BATCH_SIZE)
+        # MySQL does not return ids from bulk_create
+        for record in Students_data.objects.filter(student_id__in=[s.id for s in missing]).order_by("id"):
+            records.setdefault(record.student_id, record)
+        invalidate_reference_lists()
+        bump_data_version("students")
+
+    return records
+
+
+def apply_offers(entries, batch_year):
+    """
+    entries: [(Student, company_name, ctc, company_type)] in upload order.
+    Applies every offer in memory and saves the touched Students_data rows in
+    one bulk_update. Returns {student id: Students_data}.
+    """
+    if not entries:
+        return {}
+
+    with transaction.atomic():
+        records = records_for([student for student, *_ in entries], batch_year)
+
+        changed = {}
+        for student, company_name, ctc, company_type in entries:
+            record = records[student.id]
+            if apply_offer(record, company_name, ctc, company_type):
+                changed[record.id] = record
+
+        Students_data.objects.bulk_update(list(changed.values()), OFFER_FIELDS, batch_size=BULK_BATCH_SIZE)
+        sync_offer_rows(changed.values())
+        refresh_placement_stats(stat_keys(records.values()))
+        # bulk_update skips post_save
+        invalidate_student_profiles([r.student_id for r in changed.values()])
+        bump_data_version("placed_students")
+
+    return records
+
+
+# ---------------- Offer table ----------------
+
+def _offer_key(category, offer):
+    return category, offer.get("company") or "", float(offer.get("ctc") or 0)
+
+
+def sync_offer_rows(records):
+    """
+    Make the Offer rows of `records` match their product / service / dream
+    lists. Unchanged offers keep their row (and created_at).
+    """
+    records = {r.id: r for r in records}
+    if not records:
+        return
+
+    existing = {}
+    for offer in Offer.objects.filter(student_id__in=list(records)).order_by("id"):
+        existing.setdefault((offer.student_id, offer.category, offer.company, offer.ctc), []).append(offer.id)
+
+    new = []
+    for record in records.values():
+        for category in ["product", "service", "dream"]:
+            for o in getattr(record, category) or []:
+                key = (record.id, *_offer_key(category, o))
+                if existing.get(key):
+                    existing[key].pop(0)
+                else:
+                    new.append(Offer(student_id=record.id, company=key[2], category=category, ctc=key[3]))
+
+    stale = [offer_id for ids in existing.values() for offer_id in ids]
+    if stale:
+        Offer.objects.filter(id__in=stale).delete()
+    Offer.objects.bulk_create(new, batch_size=BULK_BATCH_SIZE)
+
+
+def offers_changed(records):
+    """After saving offer changes on single records: Offer rows + placement stats."""
+    sync_offer_rows(records)
+    refresh_placement_stats(stat_keys(records))
+
+
+# ---------------- Analytics ----------------
+
+def offers_for(batch_year=None):
+    offers = Offer.objects.all()
+    if batch_year:
+        offers = offers.filter(student__batch_year=batch_year)
+    return offers
+
+
+def highest_ctc(batch_year=None):
+    return offers_for(batch_year).aggregate(highest=Max("ctc"))["highest"]
+
+
+def offers_per_company(batch_year=None):
+    """[{company, offers, highest_ctc}], most offers first."""
+    return list(
+        offers_for(batch_year).values("company")
+        .annotate(offers=Count("id"), highest_ctc=Max("ctc"))
+        .order_by("-offers", "company")
+    )
+
+
+def placement_rate_by_branch(batch_year=None):
+    """[{branch, students, placed, rate}] where placed = students with at least one offer."""
+    students = Students_data.objects.all()
+    if batch_year:
+        students = students.filter(batch_year=batch_year)
+    rows = (students.values("branch")
+            .annotate(students=Count("id"), placed=Count("id", filter=Q(offer_count__gt=0)))
+            .order_by("branch"))
+    return [
+        {**row, "rate": round(row["placed"] * 100 / row["students"], 2) if row["students"] else 0}
+        for row in rows
+    ]
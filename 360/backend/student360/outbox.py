@@ -0,0 +1,189 @@
+# student360/outbox.py
+# Outgoing mail goes through the OutboxEmail table instead of opening an SMTP
+# connection inside the request.
+#
+# Delivery drains due rows in batches over one pooled connection
+# (get_connection + send_messages), paced by EMAIL_OUTBOX_RATE_LIMIT.
+# A failed message is rescheduled with exponential backoff and marked failed
+# after EMAIL_OUTBOX_MAX_ATTEMPTS.
+#
+# EMAIL_OUTBOX_DISPATCH decides who sends the mail a request queued:
+#   "thread" - one send attempt in a background thread of the web process
+#              (default); retries are left to `manage.py send_queued_mail --loop`
+#   "worker" - nobody; `manage.py send_queued_mail --loop` does it
+#   "sync"   - inline, retrying until sent or failed (tests / debugging)
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection as db_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+# A claimed row is not picked up by another dispatcher for this long
+CLAIM_LEASE = timedelta(minutes=5)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def queue_email(subject, body, to, from_email=None, batch_id=None, save=True):
+    email = OutboxEmail(subject=subject, body=body, to=list(to), from_email=from_email, batch_id=batch_id)
+    if save:
+        email.save()
+    return email
+
+
+def send_email(subject, body, to, from_email=None, batch_id=None):
+    """Queue one email and hand it to the dispatcher once the transaction commits."""
+    email = queue_email(subject, body, to, from_email=from_email, batch_id=batch_id)
+    transaction.on_commit(lambda: dispatch(batch_id, ids=[email.id]))
+    return email
+
+
+def backoff_delay(attempts):
+    base = _setting("EMAIL_OUTBOX_RETRY_DELAY", 30)
+    cap = _setting("EMAIL_OUTBOX_MAX_RETRY_DELAY", 3600)
+    return min(cap, base * 2 ** (attempts - 1))
+
+
+def claim_due(limit, batch_id=None, ids=None):
+    """Lease up to `limit` due emails to this dispatcher."""
+    now = timezone.now()
+    with transaction.atomic():
+        qs = OutboxEmail.objects.select_for_update(skip_locked=True).filter(
+            status="queued", next_attempt_at__lte=now
+        )
+        if batch_id:
+            qs = qs.filter(batch_id=batch_id)
+        if ids is not None:
+            qs = qs.filter(id__in=ids)
+        emails = list(qs.order_by("next_attempt_at", "id")[:limit])
+        OutboxEmail.objects.filter(id__in=[e.id for e in emails]).update(next_attempt_at=now + CLAIM_LEASE)
+    return emails
+
+
+def _message(email, conn):
+    return EmailMessage(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email or settings.DEFAULT_FROM_EMAIL,
+        to=email.to,
+        connection=conn,
+    )
+
+
+def _deliver(conn, email):
+    email.attempts += 1
+    try:
+        conn.send_messages([_message(email, conn)])
+        email.status = "sent"
+        email.sent_at = timezone.now()
+        email.last_error = None
+        ok = True
+    except Exception as e:
+        email.last_error = str(e)
+        if email.attempts >= _setting("EMAIL_OUTBOX_MAX_ATTEMPTS", 5):
+            email.status = "failed"
+        else:
+            email.next_attempt_at = timezone.now() + timedelta(seconds=backoff_delay(email.attempts))
+        ok = False
+    email.save(update_fields=["status", "attempts", "last_error", "sent_at", "next_attempt_at"])
+    return ok
+
+
+def send_batch(emails):
+    """Send claimed emails over one connection, reconnecting after a failure."""
+    rate = _setting("EMAIL_OUTBOX_RATE_LIMIT", 0)  # messages per second, 0 = unlimited
+    interval = 1.0 / rate if rate else 0
+    sent = 0
+
+    conn = get_connection(fail_silently=False)
+    try:
+        conn.open()
+    except Exception as e:
+        # Leave it to the per-message attempts to record the error
+        print("Outbox connection error:", e)
+
+    last = 0.0
+    try:
+        for email in emails:
+            wait = last + interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            last = time.monotonic()
+
+            if _deliver(conn, email):
+                sent += 1
+            else:
+                # The server may have dropped us - start the next one on a fresh connection
+                try:
+                    conn.close()
+                    conn.open()
+                except Exception as e:
+                    print("Outbox connection error:", e)
+    finally:
+        conn.close()
+    return sent
+
+
+def send_due(batch_id=None, batch_size=None, ids=None):
+    """Drain everything that is due right now. Returns (attempted, sent)."""
+    batch_size = batch_size or _setting("EMAIL_OUTBOX_BATCH_SIZE", 100)
+    attempted = sent = 0
+    while True:
+        emails = claim_due(batch_size, batch_id, ids)
+        if not emails:
+            return attempted, sent
+        attempted += len(emails)
+        sent += send_batch(emails)
+
+
+def drain(batch_id=None, ids=None):
+    """Send until nothing queued is left (waiting out backoff between rounds)."""
+    while True:
+        send_due(batch_id, ids=ids)
+        pending = OutboxEmail.objects.filter(status="queued")
+        if batch_id:
+            pending = pending.filter(batch_id=batch_id)
+        if ids is not None:
+            pending = pending.filter(id__in=ids)
+        next_due = pending.order_by("next_attempt_at").values_list("next_attempt_at", flat=True).first()
+        if next_due is None:
+            return
+        time.sleep(max(0.0, (next_due - timezone.now()).total_seconds()))
+
+
+def _send_in_thread(batch_id, ids):
+    # a single pass: an SMTP outage must not keep one thread per request alive
+    try:
+        send_due(batch_id, ids=ids)
+    except Exception as e:
+        print("Outbox error:", e)
+    finally:
+        db_connection.close()
+
+
+def dispatch(batch_id=None, ids=None):
+    """Kick off delivery of the given batch / emails without blocking the request."""
+    mode = _setting("EMAIL_OUTBOX_DISPATCH", "thread")
+    if mode == "sync":
+        drain(batch_id, ids)
+    elif mode == "thread":
+        threading.Thread(target=_send_in_thread, args=(batch_id, ids), daemon=True).start()
+
+
+def batch_status(batch_id):
+    emails = OutboxEmail.objects.filter(batch_id=batch_id).order_by("id")
+    counts = {"queued": 0, "sent": 0, "failed": 0}
+    failures = []
+    for email in emails.only("to", "status", "attempts", "last_error"):
+        counts[email.status] = counts.get(email.status, 0) + 1
+        if email.status == "failed":
+            failures.append({"to": email.to, "attempts": email.attempts, "error": email.last_error})
+    return {"batch_id": batch_id, "total": sum(counts.values()), **counts, "failures": failures}
@@ -0,0 +1,33 @@
+# student360/pagination.py
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination over a fixed, stable ordering such as
+    ("name", "id") or ("-created_at", "id"). Page size is ?page_size=.
+    """
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def __init__(self, ordering):
+        self.ordering = ordering
+
+
+def wants_page(request):
+    params = request.query_params
+    return "cursor" in params or "page_size" in params
+
+
+def paginate(request, queryset, ordering, serialize, view=None):
+    """
+    When the client asks for pages (?cursor= or ?page_size=) return a
+    {next, previous, results} response for one keyset page, else None so the
+    caller falls back to the plain list.
+    """
+    if not wants_page(request):
+        return None
+    paginator = KeysetPagination(ordering)
+    page = paginator.paginate_queryset(queryset, request, view=view)
+    return paginator.get_paginated_response(serialize(page))
@@ -0,0 +1,94 @@
+# student360/placement_stats.py
+# Keeps the PlacementStat table (one row per batch_year + branch) in step with
+# Students_data / Offer.
+#
+# refresh_placement_stats(keys) recomputes only the groups it is given, with a
+# few aggregate queries, and upserts them in one statement (delete + insert on
+# MySQL, which has no ON CONFLICT target). The offer paths
+# (offers.apply_offers, add_offer_logic) and the roster imports call it for
+# the groups they touched; `manage.py refresh_placement_stats` rebuilds all.
+from statistics import median
+
+from django.db import connection, transaction
+from django.db.models import Count, Max, Q
+
+from .models import Offer, PlacementStat, Students_data
+
+STAT_FIELDS = [
+    "students", "placed", "placement_rate", "median_ctc", "max_ctc",
+    "product_offers", "service_offers", "dream_offers",
+]
+
+
+def stat_keys(records):
+    """(batch_year, branch) groups of some Students_data rows."""
+    return {(r.batch_year, r.branch) for r in records}
+
+
+def _delete_groups(keys):
+    for year, branch in keys:
+        PlacementStat.objects.filter(batch_year=year, branch=branch).delete()
+
+
+def refresh_placement_stats(keys=None):
+    """Recompute the given (batch_year, branch) groups, or every group when keys is None."""
+    students = Students_data.objects.all()
+    offers = Offer.objects.all()
+    if keys is not None:
+        keys = {(str(year), branch) for year, branch in keys if year}
+        if not keys:
+            return 0
+        years = {year for year, _ in keys}
+        branches = {branch for _, branch in keys}
+        students = students.filter(batch_year__in=years, branch__in=branches)
+        offers = offers.filter(student__batch_year__in=years, student__branch__in=branches)
+
+    stats = {}
+    for row in (students.values("batch_year", "branch")
+                .annotate(total=Count("id"), placed=Count("id", filter=Q(offer_count__gt=0)))):
+        stats[(row["batch_year"], row["branch"])] = PlacementStat(
+            batch_year=row["batch_year"],
+            branch=row["branch"],
+            students=row["total"],
+            placed=row["placed"],
+            placement_rate=round(row["placed"] * 100 / row["total"], 2) if row["total"] else 0,
+        )
+
+    group = ("student__batch_year", "student__branch")
+    for row in offers.values(*group, "category").annotate(n=Count("id"), top=Max("ctc")):
+        stat = stats.get((row["student__batch_year"], row["student__branch"]))
+        if stat is None:
+            continue
+        setattr(stat, f"{row['category']}_offers", row["n"])
+        stat.max_ctc = max(stat.max_ctc or 0, row["top"])
+
+    best = {}
+    for row in offers.values("student", *group).annotate(best=Max("ctc")):
+        best.setdefault((row["student__batch_year"], row["student__branch"]), []).append(row["best"])
+    for key, ctcs in best.items():
+        if key in stats:
+            stats[key].median_ctc = median(ctcs)
+
+    if keys is not None:
+        stats = {key: stat for key, stat in stats.items() if key in keys}
+        gone = keys - set(stats)
+    else:
+        gone = set(PlacementStat.objects.values_list("batch_year", "branch")) - set(stats)
+
+    if connection.features.supports_update_conflicts_with_target:
+        PlacementStat.objects.bulk_create(
+            list(stats.values()),
+            update_conflicts=True,
+            unique_fields=["batch_year", "branch"],
+            update_fields=STAT_FIELDS + ["updated_at"],
+            batch_size=500,
+        )
+    else:
+        # MySQL cannot name the conflict target: replace the groups' rows instead
+        with transaction.atomic():
+            _delete_groups(stats)
+            PlacementStat.objects.bulk_create(list(stats.values()), batch_size=500)
+    # groups whose last student disappeared
+    _delete_groups(gone)
+
+    return len(stats)
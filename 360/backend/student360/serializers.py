@@ -90,20 +90,43 @@ class AdmissionStudentSerializer(serializers.ModelSerializer):
 from rest_framework import serializers
 from .models import Student
 
-class Student_dataSerializer(serializers.ModelSerializer):
+class DynamicFieldsMixin:
+    """Pass `fields=[...]` to serialize only a subset of the declared fields."""
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class Student_dataSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = SimpleUserSerializer(read_only=True)
     assigned_mentor_name = serializers.SerializerMethodField()
     class Meta:
         model = Students_data
         fields = "__all__"
     def get_assigned_mentor_name(self, obj):
-        if obj.assigned_mentor_id:
-            try:
-                mentor = Mentors_data.objects.get(id=obj.assigned_mentor_id)
-                return mentor.name
-            except Mentors_data.DoesNotExist:
-                return None
-        return None
+        # assigned_mentor is joined in by placement_student_queryset()
+        return obj.assigned_mentor.name if obj.assigned_mentor_id else None
+
+
+def placement_student_queryset(fields=None):
+    """
+    Students_data for the placement dashboards: mentors joined once, and with
+    `fields` only the columns those fields need are selected.
+    """
+    qs = Students_data.objects.order_by("name", "id")
+    if not fields:
+        return qs.select_related("assigned_mentor")
+
+    columns = {f.name for f in Students_data._meta.concrete_fields}
+    # name is the sort / cursor key, so it is always loaded
+    only = [f for f in fields if f in columns] + ["name"]
+    if "assigned_mentor_name" in fields:
+        qs = qs.select_related("assigned_mentor")
+        only += ["assigned_mentor", "assigned_mentor__name"]
+    return qs.only(*only)
 
 class Mentor_dataSerializer(serializers.ModelSerializer):
     class Meta:
@@ -128,27 +151,24 @@ class StudentSerializer(serializers.ModelSerializer):
             'assigned_mentor', 'assigned_mentor_id', 'created_at',"phone",
             "cgpa",
         ]
+    # Read from select_related() data - see student_list_queryset()
     def get_phone(self, obj):
-        try:
-            student = Student.objects.get(id=obj.student_id)
-            return student.phone
-        except Student.DoesNotExist:
-            return None
+        return obj.student.phone if obj.student_id else None
 
     def get_cgpa(self, obj):
-        try:
-            student = Student.objects.get(id=obj.student_id)
-            return student.cgpa
-        except Student.DoesNotExist:
-            return None
+        return obj.student.cgpa if obj.student_id else None
+
     def get_assigned_mentor(self, obj):
-        if obj.assigned_mentor_id:
-            try:
-                mentor = Mentors_data.objects.get(id=obj.assigned_mentor_id)
-                return mentor.name  # <-- only name
-            except Mentors_data.DoesNotExist:
-                return None
-        return None
+        return obj.assigned_mentor.name if obj.assigned_mentor_id else None  # <-- only name
+
+
+def student_list_queryset(qs=None):
+    """
+    Students_data rows with the Student and mentor joined in, so serializing
+    them with StudentSerializer costs one query regardless of row count.
+    """
+    qs = Students_data.objects.all() if qs is None else qs
+    return qs.select_related("student", "assigned_mentor")
 
 #mentor
 
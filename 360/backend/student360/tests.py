@@ -1,3 +1,1187 @@
-from django.test import TestCase
+import io
+import os
+import tempfile
+import threading
+import zipfile
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import pandas as pd
+from openpyxl import load_workbook
+from django.core import mail
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from student360.eligibility import company_criteria, matches
+from student360.filters import filter_students
+from student360.models import (
+    AdmissionStudent, CompanyApplication, CompanyData, DocumentSearchToken, Mentors_data, OcrJob, Offer, OutboxEmail, PlacementStat, Student, StudentDocument,
+    Students_data, User,
+)
+from student360 import caching, outbox
+from student360 import offers
+from student360.mentor_assignment import apply_plan, plan_assignments, reconcile_mentor_counts
+from student360.offers import apply_offers
+from student360.views import add_offer_logic
+from student360.ocr import ReaderPool
+
+
+def make_student(i, branch="CSE", cgpa="8.00", metadata=None):
+    user = User.objects.create_user(
+        username=f"student{i}",
+        email=f"student{i}@college.edu",
+        first_name=f"First{i}",
+        last_name=f"Last{i}",
+        password="x",
+        role="student",
+    )
+    student = Student.objects.create(user=user, phone=f"90000{i:05d}", cgpa=cgpa, dob=date(2003, 1, 1))
+    Students_data.objects.create(
+        student=student,
+        name=f"First{i} Last{i}",
+        branch=branch,
+        dob=date(2003, 1, 1 + i % 28),
+        batch_year="2025",
+        percentage10=90.0,
+        percentage12=85.0,
+    )
+    if metadata is not None:
+        StudentDocument.objects.create(
+            student=student, document_type="skill_certificate", document="x.pdf", metadata=metadata
+        )
+    return student
+
+
+class FilteredStudentsViewTests(TestCase):
+    url = "/api/student360/placement/filtered-students/"
+
+    def setUp(self):
+        self.client = APIClient()
+        self.officer = User.objects.create_user(
+            username="officer", email="officer@college.edu", password="x", role="placement"
+        )
+        self.client.force_authenticate(self.officer)
+
+    def test_filters_branch_cgpa_and_keyword(self):
+        make_student(1, branch=" cse ", cgpa="9.10", metadata={"skill_name": "Python"})
+        make_student(2, branch="ECE", cgpa="9.50", metadata={"skill_name": "Python"})
+        make_student(3, branch="CSE", cgpa="6.00", metadata={"skill_name": "Python"})
+        make_student(4, branch="CSE", cgpa="8.50", metadata={"skill_name": "Java"})
+
+        res = self.client.get(self.url, {"branch": "CSE", "min_cgpa": "7", "keyword": "python"})
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([r["name"] for r in res.data], ["First1 Last1"])
+        self.assertEqual(res.data[0]["branch"], " cse ")
+
+    def test_query_count_is_constant(self):
+        for i in range(3):
+            make_student(i, metadata={"skill_name": "Django"})
+        with self.assertNumQueries(1):
+            small = self.client.get(self.url, {"keyword": "django"})
+
+        for i in range(3, 40):
+            make_student(i, metadata={"skill_name": "Django"})
+        with self.assertNumQueries(1):
+            large = self.client.get(self.url, {"keyword": "django"})
+
+        self.assertEqual(len(small.data), 3)
+        self.assertEqual(len(large.data), 40)
+
+
+class DocumentSearchTokenTests(TestCase):
+    def test_tokens_follow_metadata(self):
+        student = make_student(1, metadata={"domain": "Machine Learning", "weeks": 8})
+        doc = student.documents.get()
+        tokens = set(doc.search_tokens.values_list("token", flat=True))
+        # every suffix of every key / value word
+        self.assertTrue({"machine", "achine", "learning", "earning", "8", "domain", "weeks"} <= tokens)
+
+        doc.metadata = {"skill_name": "C++"}
+        doc.save()
+        self.assertEqual(set(doc.search_tokens.values_list("token", flat=True)),
+                         {"skill", "kill", "ill", "ll", "l", "name", "ame", "me", "e", "c++", "++", "+"})
+
+    def test_keyword_matches_word_prefixes_within_one_document(self):
+        make_student(1, metadata={"domain": "Machine Learning"})
+        make_student(2, metadata={"domain": "Machine Design"})
+
+        matched = filter_students(keyword="machine learn")
+        self.assertEqual([s.name for s in matched], ["First1 Last1"])
+
+    def test_keyword_still_matches_substrings(self):
+        make_student(1, metadata={"skill_name": "JavaScript"})
+        make_student(2, metadata={"domain": "Python"})
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual([s.name for s in filter_students(keyword="script")], ["First1 Last1"])
+        # answered from the token index, not a LIKE over the metadata
+        self.assertNotIn('"metadata"', queries.captured_queries[0]["sql"])
+        # key names, as the old str(metadata) scan did
+        self.assertEqual([s.name for s in filter_students(keyword="domain")], ["First2 Last2"])
+
+    def test_backfill_command(self):
+        student = make_student(1, metadata={"course_title": "Cloud Computing"})
+        DocumentSearchToken.objects.all().delete()
+
+        call_command("reindex_document_search", stdout=StringIO())
+
+        self.assertEqual(filter_students(keyword="cloud").get().student_id, student.id)
+
+
+class BenchmarkStartupTests(TestCase):
+    def fake_run(self, status):
+        def run(self_, args):
+            out = "manage.py check ok" if args[0] == "manage.py" else f"0.05 {status} False -1.0"
+            return mock.Mock(stdout=out)
+        return run
+
+    def test_error_responses_are_not_timed(self):
+        from student360.management.commands.benchmark_startup import Command
+        with mock.patch.object(Command, "run", self.fake_run(400)), self.assertRaises(CommandError):
+            call_command("benchmark_startup", runs=1, stdout=StringIO())
+
+        out = StringIO()
+        with mock.patch.object(Command, "run", self.fake_run(401)):
+            call_command("benchmark_startup", runs=1, stdout=out)
+        self.assertIn("eager easyocr", out.getvalue())
+        self.assertIn("import easyocr:                          not installed", out.getvalue())
+
+
+class ReaderPoolTests(TestCase):
+    def test_readers_are_created_once_and_reused(self):
+        pool = ReaderPool(size=2)
+        with mock.patch.object(ReaderPool, "_new_reader", side_effect=lambda: object()) as new_reader:
+            held = [pool.acquire(), pool.acquire()]
+            waiter = threading.Thread(target=lambda: pool.release(pool.acquire()))
+            waiter.start()
+            pool.release(held[0])
+            waiter.join(timeout=5)
+            pool.release(held[1])
+            with pool.reader() as reader:
+                self.assertIn(reader, held)
+
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual(new_reader.call_count, 2)
+
+
+@override_settings(OCR_JOB_BACKEND="sync", MEDIA_ROOT=tempfile.mkdtemp())
+class AddStudentOcrJobTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username="admin", email="admin@college.edu", password="x", role="admin")
+        self.client.force_authenticate(self.admin)
+
+    def test_add_student_queues_job_and_reports_marks(self):
+        upload = SimpleUploadedFile("tenth.jpg", b"image-bytes", content_type="image/jpeg")
+        with mock.patch("student360.ocr.read_text", return_value=["Total", "452 / 500"]):
+            with self.captureOnCommitCallbacks(execute=True):
+                res = self.client.post(
+                    "/api/student360/students/addstudent/",
+                    {"name": "Asha", "dob": "2004-05-01", "batch_year": "2026", "marks10_file": upload},
+                )
+
+        self.assertEqual(res.status_code, 202)
+        status_res = self.client.get(f"/api/student360/students/addstudent/jobs/{res.data['job_id']}/")
+        self.assertEqual(status_res.data["status"], "done")
+        self.assertEqual(status_res.data["progress"], {"processed": 1, "total": 1})
+        self.assertEqual(status_res.data["marks10"], {"obtained": 452, "total": 500})
+        self.assertIsNone(status_res.data["marks12"])
+
+
+    def test_malformed_dob_is_rejected(self):
+        res = self.client.post("/api/student360/students/addstudent/",
+                               {"name": "Asha", "dob": "not-a-date", "batch_year": "2026"})
+        self.assertEqual(res.status_code, 400)
+        self.assertFalse(OcrJob.objects.exists())
+
+    def test_ocr_errors_fail_the_job(self):
+        upload = SimpleUploadedFile("tenth.jpg", b"image-bytes", content_type="image/jpeg")
+        with mock.patch("student360.ocr.read_text", side_effect=RuntimeError("reader crashed")):
+            with self.captureOnCommitCallbacks(execute=True):
+                res = self.client.post(
+                    "/api/student360/students/addstudent/",
+                    {"name": "Asha", "dob": "2004-05-01", "batch_year": "2026", "marks10_file": upload},
+                )
+
+        status_res = self.client.get(f"/api/student360/students/addstudent/jobs/{res.data['job_id']}/")
+        self.assertEqual((status_res.data["status"], status_res.data["error"]), ("failed", "reader crashed"))
+
+    def test_only_owner_or_staff_see_a_job(self):
+        job = OcrJob.objects.create(name="Asha", dob=date(2004, 5, 1), batch_year="2026", created_by=self.admin)
+        url = f"/api/student360/students/addstudent/jobs/{job.id}/"
+        other = APIClient()
+        other.force_authenticate(make_student(1).user)
+        self.assertEqual(other.get(url).status_code, 403)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+
+class OcrBatchUploadTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username="admin", email="admin@college.edu", password="x", role="admin")
+        self.client.force_authenticate(self.admin)
+
+    def make_zip(self, manifest, images):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zf:
+            zf.writestr("admissions/manifest.csv", manifest)
+            for name in images:
+                zf.writestr(f"admissions/{name}", b"image-" + name.encode())
+        return SimpleUploadedFile("admissions.zip", buffer.getvalue(), content_type="application/zip")
+
+    def test_batch_writes_students_in_bulk(self):
+        Students_data.objects.create(name="Old Student", dob=date(2004, 1, 1), batch_year="2025")
+        manifest = (
+            "name,dob,branch,marks10_file,marks12_file\n"
+            "Asha Rao,2004-05-01,CSE,asha_10.jpg,asha_12.jpg\n"
+            "Old Student,2004-01-01,ECE,old_10.jpg,\n"
+            "Bad Date,01/02/2004,CSE,,\n"
+        )
+        upload = self.make_zip(manifest, ["asha_10.jpg", "asha_12.jpg", "old_10.jpg"])
+
+        with mock.patch("student360.ocr.read_text", return_value=["450 / 500"]):
+            res = self.client.post("/api/student360/students/ocr-batch/2026/", {"file": upload, "workers": 1})
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual((res.data["records_saved"], res.data["records_skipped"]), (1, 1))
+        self.assertEqual([e["row"] for e in res.data["errors"]], [4])
+        self.assertEqual(len(res.data["files"]), 3)
+
+        asha = Students_data.objects.get(name="Asha Rao")
+        self.assertEqual((asha.branch, asha.batch_year, asha.percentage10, asha.percentage12), ("CSE", "2026", 90.0, 90.0))
+        self.assertEqual(AdmissionStudent.objects.get(name="Asha Rao").marks12, Decimal("90.00"))
+        self.assertEqual(Students_data.objects.get(name="Old Student").batch_year, "2025")
+
+    def test_duplicate_manifest_rows_and_workers(self):
+        manifest = (
+            "name,dob,branch,marks10_file,marks12_file\n"
+            "Asha Rao,2004-05-01,CSE,,\n"
+            "Asha Rao,2004-05-01,ECE,,\n"
+        )
+        for workers in ["abc", 0, -2]:
+            res = self.client.post("/api/student360/students/ocr-batch/2026/",
+                                   {"file": self.make_zip(manifest, []), "workers": workers})
+            self.assertEqual(res.status_code, 400)
+
+        with mock.patch("student360.ocr_batch.os.cpu_count", return_value=64):
+            res = self.client.post("/api/student360/students/ocr-batch/2026/",
+                                   {"file": self.make_zip(manifest, []), "workers": 1000})
+        self.assertEqual(res.data["workers"], 4)
+        self.assertEqual((res.data["records_saved"], res.data["records_skipped"]), (1, 1))
+        self.assertEqual(Students_data.objects.get(name="Asha Rao").branch, "CSE")
+
+    def test_placement_roles_only(self):
+        client = APIClient()
+        client.force_authenticate(make_student(1).user)
+        res = client.post("/api/student360/students/ocr-batch/2026/",
+                          {"file": self.make_zip("name,dob\nAsha Rao,2004-05-01\n", [])})
+        self.assertEqual(res.status_code, 403)
+        self.assertFalse(Students_data.objects.filter(name="Asha Rao").exists())
+
+    def test_extra_cells_are_ignored(self):
+        manifest = "name,dob\nAsha Rao,2004-05-01,extra,cells\n"
+        res = self.client.post("/api/student360/students/ocr-batch/2026/", {"file": self.make_zip(manifest, [])})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["records_saved"], 1)
+
+    def test_manifest_is_required(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zf:
+            zf.writestr("a.jpg", b"x")
+        upload = SimpleUploadedFile("a.zip", buffer.getvalue())
+
+        res = self.client.post("/api/student360/students/ocr-batch/2026/", {"file": upload})
+        self.assertEqual(res.status_code, 400)
+
+
+class ReferenceListCacheTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        caches["fallback"].clear()
+        self.client = APIClient()
+
+    def test_lists_are_cached_until_students_change(self):
+        Students_data.objects.create(name="A", dob=date(2004, 1, 1), batch_year="2025", branch="CSE")
+        self.assertEqual(self.client.get("/api/student360/placement/batches/").data, ["2025"])
+        self.assertEqual(self.client.get("/api/student360/placement/branches/").data, ["CSE"])
+        with self.assertNumQueries(0):
+            self.client.get("/api/student360/placement/batches/")
+            self.client.get("/api/student360/placement/branches/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Students_data.objects.create(name="B", dob=date(2004, 1, 1), batch_year="2026", branch="ECE")
+        self.assertEqual(self.client.get("/api/student360/placement/batches/").data, ["2025", "2026"])
+        self.assertEqual(self.client.get("/api/student360/placement/branches/").data, ["CSE", "ECE"])
+
+    def test_bulk_upload_invalidates(self):
+        self.assertEqual(self.client.get("/api/student360/placement/batches/").data, [])
+        buffer = io.BytesIO()
+        pd.DataFrame({"name": ["Asha"], "dob": ["2004-05-01"]}).to_excel(buffer, index=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/api/student360/students/bulk-upload/2026/",
+                             {"file": SimpleUploadedFile("s.xlsx", buffer.getvalue())})
+        self.assertEqual(self.client.get("/api/student360/placement/batches/").data, ["2026"])
+
+    def test_falls_back_to_local_memory_when_redis_is_down(self):
+        Students_data.objects.create(name="A", dob=date(2004, 1, 1), batch_year="2025")
+        with mock.patch.object(caches["default"], "get", side_effect=ConnectionError("down")), \
+                mock.patch.object(caching, "_redis_down_until", 0.0):
+            self.assertEqual(caching.batch_years(), ["2025"])
+            with self.assertNumQueries(0):
+                self.assertEqual(caching.batch_years(), ["2025"])
+        self.assertEqual(caches["fallback"].get(caching.BATCHES_KEY), ["2025"])
+
+
+class RedisRecoveryTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        caches["fallback"].clear()
+
+    def test_writes_during_outage_are_replayed(self):
+        Students_data.objects.create(name="A", dob=date(2004, 1, 1), batch_year="2025")
+        self.assertEqual(caching.batch_years(), ["2025"])
+        version = caching.data_version("companies")
+
+        redis = caches["default"]
+        down = ConnectionError("down")
+        with mock.patch.object(redis, "get", side_effect=down), mock.patch.object(redis, "set", side_effect=down), \
+                mock.patch.object(redis, "delete_many", side_effect=down), \
+                mock.patch.object(caching, "_redis_down_until", 0.0):
+            with self.captureOnCommitCallbacks(execute=True):
+                Students_data.objects.create(name="B", dob=date(2004, 1, 2), batch_year="2026")
+                caching.bump_data_version("companies")
+            self.assertTrue(caching._redis_down())
+
+        # Redis is back: the stale list and version it still holds are not served
+        self.assertEqual(redis.get(caching.BATCHES_KEY), ["2025"])
+        self.assertEqual(sorted(caching.batch_years()), ["2025", "2026"])
+        self.assertNotEqual(caching.data_version("companies"), version)
+        self.assertFalse(caching._missed_deletes or caching._missed_versions)
+
+
+class StudentProfileCacheTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        caches["fallback"].clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username="a", email="a@college.edu", password="x", role="admin")
+        self.client.force_authenticate(self.admin)
+        self.mentor = Mentors_data.objects.create(name="Dr Rao", email="mentor@college.edu")
+        self.student = make_student(1)
+        Students_data.objects.filter(student=self.student).update(assigned_mentor=self.mentor, offer_count=2)
+
+    def test_profile_is_cached_and_counted(self):
+        url = f"/api/student360/students/{self.student.id}/"
+        first = self.client.get(url).data
+        with self.assertNumQueries(0):
+            second = self.client.get(url).data
+        self.assertEqual(first, second)
+        self.assertEqual(first["assigned_mentor_name"], "Dr Rao")
+
+        by_user = self.client.get(f"/api/student360/students/user/{self.student.user_id}/").data
+        self.assertEqual(by_user["offer_count"], 2)
+        self.assertEqual(caching.profile_cache_stats(), {"hits": 2, "misses": 1, "hit_rate": 0.667})
+        self.assertEqual(self.client.get("/api/student360/cache/stats/").data["student_profiles"]["hits"], 2)
+
+    def test_writes_invalidate(self):
+        url = f"/api/student360/students/{self.student.id}/"
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.user.first_name = "Renamed"
+            self.student.user.save()
+        self.assertEqual(self.client.get(url).data["first_name"], "Renamed")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.cgpa = Decimal("9.50")
+            self.student.save()
+        self.assertEqual(self.client.get(url).data["cgpa"], Decimal("9.50"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mentor.name = "Dr Iyer"
+            self.mentor.save()
+        self.assertEqual(self.client.get(url).data["assigned_mentor_name"], "Dr Iyer")
+
+        record = Students_data.objects.get(student=self.student)
+        with self.captureOnCommitCallbacks(execute=True):
+            record.assigned_mentor = None
+            record.save()
+        self.assertIsNone(self.client.get(url).data["assigned_mentor_name"])
+
+
+class BulkUploadStudentsTests(TestCase):
+    url = "/api/student360/students/bulk-upload/2026/"
+
+    def excel(self, rows):
+        buffer = io.BytesIO()
+        pd.DataFrame(rows).to_excel(buffer, index=False)
+        return SimpleUploadedFile("students.xlsx", buffer.getvalue())
+
+    def test_saved_and_skipped_counts(self):
+        Students_data.objects.create(name="Existing", dob=date(2004, 1, 1), batch_year="2025")
+        upload = self.excel({
+            "Full Name": ["Asha Rao", "Existing", "Asha Rao", "", "Ravi"],
+            "DOB": ["2004-05-01", "2004-01-01", "2004-05-01", "2004-01-02", "not a date"],
+            "Department": ["CSE", "ECE", "CSE", "CSE", "CSE"],
+            "Tenth Percentage": [91.5, 80, 91.5, 70, None],
+        })
+
+        res = self.client.post(self.url, {"file": upload})
+
+        self.assertEqual(res.json()["records_saved"], 1)
+        self.assertEqual(res.json()["records_skipped"], 4)
+        asha = Students_data.objects.get(name="Asha Rao")
+        self.assertEqual((asha.branch, asha.batch_year, asha.percentage10, asha.percentage12), ("CSE", "2026", 91.5, None))
+
+    def test_dob_text_must_be_iso(self):
+        csv_file = SimpleUploadedFile("students.csv", (
+            "name,dob\n"
+            "Day First,13/05/2004\n"
+            "Ambiguous,01/05/2004\n"
+            "Iso,2004-03-02\n"
+            "Iso Time,2004-03-03 00:00:00\n"
+        ).encode())
+        res = self.client.post(self.url, {"file": csv_file})
+        self.assertEqual((res.json()["records_saved"], res.json()["records_skipped"]), (2, 2))
+        self.assertEqual(dict(Students_data.objects.values_list("name", "dob")),
+                         {"Iso": date(2004, 3, 2), "Iso Time": date(2004, 3, 3)})
+
+        # real date cells in a workbook are kept as they are
+        res = self.client.post(self.url, {"file": self.excel({"name": ["Cell"], "dob": [pd.Timestamp(2004, 5, 1)]})})
+        self.assertEqual(Students_data.objects.get(name="Cell").dob, date(2004, 5, 1))
+
+    def test_chunk_size_must_be_a_positive_integer(self):
+        for url in [self.url, "/api/student360/students/bulk-upload-mentor/"]:
+            for chunk_size in ["abc", "0", "-5"]:
+                res = self.client.post(f"{url}?chunk_size={chunk_size}", {"file": self.excel({"name": ["A"]})})
+                self.assertEqual(res.status_code, 400)
+                self.assertEqual(res.json()["error"], "chunk_size must be a positive integer")
+
+    def test_sheet_types(self):
+        for url in [self.url, "/api/student360/students/bulk-upload-mentor/"]:
+            res = self.client.post(url, {"file": SimpleUploadedFile("students.pdf", b"%PDF")})
+            self.assertEqual(res.status_code, 400)
+            self.assertIn("Unsupported file type", res.json()["error"])
+
+        # legacy .xls goes through pandas (xlrd)
+        sheet = pd.DataFrame({"Name": ["Asha Rao"], "DOB": ["2004-05-01"], "Branch": ["CSE"]})
+        with mock.patch("student360.bulk_upload.pd.read_excel", return_value=sheet):
+            res = self.client.post(self.url, {"file": SimpleUploadedFile("students.xls", b"xls")})
+        self.assertEqual(res.json()["records_saved"], 1)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        for n, offset in [(5, 0), (60, 100)]:
+            upload = self.excel({
+                "name": [f"Student {offset + i}" for i in range(n)],
+                "dob": ["2004-05-01"] * n,
+            })
+            # savepoint + existing-key lookup + insert + release,
+            # then one placement stats refresh (3 aggregates + upsert)
+            with self.assertNumQueries(8):
+                res = self.client.post(self.url, {"file": upload})
+            self.assertEqual(res.json()["records_saved"], n)
+
+    def test_csv_is_ingested_in_chunks(self):
+        lines = ["name,dob,branch"] + [f"Student {i},2004-05-01,CSE" for i in range(7)] + ["Student 0,2004-05-01,CSE"]
+        upload = SimpleUploadedFile("students.csv", "\n".join(lines).encode())
+
+        res = self.client.post(self.url + "?chunk_size=3", {"file": upload}).json()
+
+        self.assertEqual((res["chunks"], res["rows_processed"]), (3, 8))
+        self.assertEqual((res["records_saved"], res["records_skipped"]), (7, 1))
+        self.assertEqual(Students_data.objects.filter(branch="CSE").count(), 7)
+
+
+@override_settings(EMAIL_OUTBOX_DISPATCH="sync", EMAIL_OUTBOX_RETRY_DELAY=0, EMAIL_OUTBOX_MAX_ATTEMPTS=3)
+class BulkUploadMentorsTests(TestCase):
+    url = "/api/student360/students/bulk-upload-mentor/"
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username="admin", email="admin@college.edu", password="x", role="admin")
+        self.client.force_authenticate(self.admin)
+
+    def upload(self, lines):
+        return self.client.post(self.url, {"file": SimpleUploadedFile("mentors.csv", "\n".join(lines).encode())}).json()
+
+    def test_mentors_created_in_bulk_and_emails_sent(self):
+        Mentors_data.objects.create(name="Old", email="old@college.edu")
+        res = self.upload([
+            "name,email,department",
+            "Meera Iyer,meera@college.edu,CSE",
+            "Old,old@college.edu,CSE",
+            "Meera Again,meera@college.edu,CSE",
+            "Admin Clash,admin@other.edu,ECE",
+        ])
+
+        self.assertEqual((res["records_saved"], res["records_skipped"]), (2, 2))
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), ["admin@other.edu", "meera@college.edu"])
+        meera = User.objects.get(email="meera@college.edu")
+        self.assertEqual((meera.role, meera.first_name, meera.has_usable_password()), ("mentor", "Meera", False))
+        # "admin" is taken, so the full email becomes the username
+        self.assertEqual(User.objects.get(email="admin@other.edu").username, "admin@other.edu")
+
+        status_res = self.client.get(f"{self.url}{res['email_batch_id']}/emails/")
+        self.assertEqual((status_res.data["sent"], status_res.data["failed"]), (2, 0))
+
+    def test_failed_delivery_is_retried_then_reported(self):
+        with mock.patch("django.core.mail.backends.locmem.EmailBackend.send_messages", side_effect=OSError("relay down")):
+            res = self.upload(["email", "x@college.edu"])
+
+        status_res = self.client.get(f"{self.url}{res['email_batch_id']}/emails/").data
+        self.assertEqual(status_res["failed"], 1)
+        self.assertEqual(status_res["failures"][0]["attempts"], 3)
+        self.assertEqual(status_res["failures"][0]["error"], "relay down")
+
+
+@override_settings(EMAIL_OUTBOX_DISPATCH="worker", EMAIL_OUTBOX_RETRY_DELAY=60, EMAIL_OUTBOX_MAX_ATTEMPTS=3)
+class OutboxDispatcherTests(TestCase):
+    def test_contact_mail_is_queued_until_the_dispatcher_runs(self):
+        res = APIClient().post(
+            "/api/student360/contact/", {"first_name": "Ana", "email": "ana@x.com", "message": "Hi"}, format="json"
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)
+        call_command("send_queued_mail", stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(OutboxEmail.objects.get().status, "sent")
+
+    def test_failures_back_off_exponentially(self):
+        email = outbox.queue_email("s", "b", ["a@x.com"])
+        with mock.patch("django.core.mail.backends.locmem.EmailBackend.send_messages", side_effect=OSError("down")):
+            self.assertEqual(outbox.send_due(), (1, 0))
+            email.refresh_from_db()
+            self.assertEqual((email.status, email.attempts), ("queued", 1))
+            self.assertAlmostEqual((email.next_attempt_at - timezone.now()).total_seconds(), 60, delta=5)
+
+            # Not due yet - nothing to send
+            self.assertEqual(outbox.send_due(), (0, 0))
+
+            OutboxEmail.objects.update(next_attempt_at=timezone.now())
+            outbox.send_due()
+            email.refresh_from_db()
+            self.assertAlmostEqual((email.next_attempt_at - timezone.now()).total_seconds(), 120, delta=5)
+
+            OutboxEmail.objects.update(next_attempt_at=timezone.now())
+            outbox.send_due()
+            email.refresh_from_db()
+            self.assertEqual((email.status, email.attempts, email.last_error), ("failed", 3, "down"))
+
+    @override_settings(EMAIL_OUTBOX_DISPATCH="thread")
+    def test_thread_dispatch_tries_only_the_new_mail_once(self):
+        old = outbox.queue_email("old", "b", ["old@x.com"])
+
+        class InlineThread:
+            def __init__(self, target, args, daemon):
+                self.run = lambda: target(*args)
+
+            def start(self):
+                self.run()
+
+        with mock.patch("student360.outbox.threading.Thread", InlineThread), \
+                mock.patch("student360.outbox.db_connection"), \
+                mock.patch("student360.outbox.time.sleep") as sleep, \
+                mock.patch("django.core.mail.backends.locmem.EmailBackend.send_messages", side_effect=OSError("down")), \
+                self.captureOnCommitCallbacks(execute=True):
+            new = outbox.send_email("new", "b", ["new@x.com"])
+
+        new.refresh_from_db()
+        old.refresh_from_db()
+        self.assertEqual((new.status, new.attempts), ("queued", 1))
+        self.assertEqual(old.attempts, 0)
+        sleep.assert_not_called()
+
+    def test_rate_limit_paces_a_batch(self):
+        for i in range(3):
+            outbox.queue_email("s", "b", [f"{i}@x.com"])
+        with override_settings(EMAIL_OUTBOX_RATE_LIMIT=20), mock.patch("student360.outbox.time.sleep") as sleep:
+            self.assertEqual(outbox.send_due(), (3, 3))
+        self.assertEqual(sleep.call_count, 2)
+
+
+def bulk_students(n, mentor=None, start=0):
+    users = User.objects.bulk_create([
+        User(username=f"bulk{i}", email=f"bulk{i}@college.edu", first_name=f"B{i}", role="student")
+        for i in range(start, start + n)
+    ])
+    students = Student.objects.bulk_create([Student(user=u, phone=f"9{i}", cgpa="7.50") for i, u in enumerate(users)])
+    Students_data.objects.bulk_create([
+        Students_data(student=s, name=f"Bulk {start + i}", dob=date(2004, 1, 1), batch_year="2026",
+                      branch="CSE", assigned_mentor=mentor)
+        for i, s in enumerate(students)
+    ])
+    if mentor:
+        # bulk_create bypasses Students_data.save, which keeps the counter in step
+        Mentors_data.objects.filter(id=mentor.id).update(current_student_count=F("current_student_count") + n)
+
+
+class AutoAssignMentorsTests(TestCase):
+    url = "/api/student360/student/assign-mentors/"
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username="a", email="a@college.edu", password="x", role="admin")
+        self.client.force_authenticate(self.admin)
+
+    def test_even_distribution_respects_capacity(self):
+        capped = Mentors_data.objects.create(name="Capped", email="c@college.edu", department="CSE", max_students=3)
+        open_ = Mentors_data.objects.create(name="Open", email="o@college.edu", department="CSE")
+        ece = Mentors_data.objects.create(name="Ece", email="e@college.edu", department="ECE")
+        bulk_students(1, capped)
+        bulk_students(7, start=1)
+        Students_data.objects.bulk_create([
+            Students_data(name=f"Ece {i}", dob=date(2004, 1, 1), batch_year="2026", branch="ECE") for i in range(2)
+        ])
+
+        res = self.client.post(self.url)
+
+        self.assertEqual(res.data["assigned"], 8)
+        counts = {m.name: (m.current_student_count, m.assigned_students.count()) for m in Mentors_data.objects.all()}
+        self.assertEqual(counts, {"Capped": (3, 3), "Open": (4, 4), "Ece": (2, 2)})
+        self.assertEqual(Students_data.objects.filter(assigned_mentor__isnull=True).count(), 1)
+
+    def test_query_count_does_not_grow_with_batch(self):
+        Mentors_data.objects.create(name="A", email="a1@college.edu", department="CSE")
+        Mentors_data.objects.create(name="B", email="b1@college.edu", department="CSE")
+        counts = []
+        for n, start in [(10, 0), (80, 10)]:
+            bulk_students(n, start=start)
+            with CaptureQueriesContext(connection) as ctx:
+                res = self.client.post(self.url)
+            self.assertEqual(res.data["assigned"], n)
+            counts.append(len(ctx))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_dry_run_returns_plan_without_saving(self):
+        busy = Mentors_data.objects.create(name="Busy", email="b@college.edu", department="CSE")
+        Mentors_data.objects.create(name="Free", email="f@college.edu", department="CSE")
+        bulk_students(3, busy)
+        bulk_students(5, start=3)
+
+        res = self.client.post(self.url, {"strategy": "least_loaded", "dry_run": True}, format="json")
+
+        self.assertEqual(res.data["status"], "dry_run")
+        self.assertEqual(res.data["assigned"], 5)
+        self.assertEqual({m["name"]: m["proposed"] for m in res.data["mentors"]}, {"Busy": 4, "Free": 4})
+        self.assertEqual(Students_data.objects.filter(assigned_mentor__isnull=True).count(), 5)
+
+    def test_balanced_overflows_to_other_departments(self):
+        Mentors_data.objects.create(name="Cse", email="c@college.edu", department="CSE", max_students=2)
+        ece = Mentors_data.objects.create(name="Ece", email="e@college.edu", department="ECE")
+        bulk_students(4)
+
+        res = self.client.post(self.url, {"strategy": "balanced"}, format="json")
+
+        self.assertEqual(res.data["assigned"], 4)
+        self.assertEqual(ece.assigned_students.count(), 2)
+
+    def test_unknown_strategy(self):
+        res = self.client.post(self.url, {"strategy": "random"}, format="json")
+        self.assertEqual(res.status_code, 400)
+
+
+class MentorLoadCounterTests(TestCase):
+    def setUp(self):
+        self.a = Mentors_data.objects.create(name="A", email="a@college.edu", department="CSE")
+        self.b = Mentors_data.objects.create(name="B", email="b@college.edu", department="CSE")
+
+    def counts(self):
+        return list(Mentors_data.objects.order_by("id").values_list("current_student_count", flat=True))
+
+    def test_counter_follows_assignment_changes(self):
+        record = Students_data.objects.create(name="S", dob=date(2004, 1, 1), batch_year="2026", assigned_mentor=self.a)
+        self.assertEqual(self.counts(), [1, 0])
+
+        record = Students_data.objects.get(id=record.id)
+        record.assigned_mentor = self.b
+        record.save()
+        self.assertEqual(self.counts(), [0, 1])
+
+        record.name = "Renamed"
+        record.save(update_fields=["name"])
+        self.assertEqual(self.counts(), [0, 1])
+
+        record.delete()
+        self.assertEqual(self.counts(), [0, 0])
+
+    def test_stale_plan_does_not_drift_counters(self):
+        bulk_students(2)
+        plan = plan_assignments("least_loaded")
+
+        # a manual assignment lands between planning and applying
+        first = Students_data.objects.order_by("id").first()
+        first.assigned_mentor = self.b
+        first.save()
+
+        self.assertEqual(apply_plan(*plan), 1)
+        self.assertEqual(apply_plan(*plan), 0)
+        self.assertEqual(reconcile_mentor_counts(fix=False), [])
+        self.assertEqual(sum(self.counts()), 2)
+
+    def test_mentors_list_reads_counter(self):
+        bulk_students(3, self.a)
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username="x", email="x@college.edu", password="x"))
+        with self.assertNumQueries(1):
+            res = client.get("/api/student360/students/mentors/")
+        self.assertEqual([m["current_student_count"] for m in res.data], [3, 0])
+
+    def test_reconcile_command(self):
+        bulk_students(2, self.b)
+        Mentors_data.objects.filter(id=self.a.id).update(current_student_count=5)
+
+        out = StringIO()
+        call_command("reconcile_mentor_counts", stdout=out)
+
+        self.assertIn("stored 5, actual 0", out.getvalue())
+        self.assertEqual(self.counts(), [0, 2])
+
+
+class OfferEngineTests(TestCase):
+    def setUp(self):
+        self.students = [make_student(i) for i in range(1, 4)]
+        user = User.objects.create_user(username="new", email="new@college.edu", first_name="New", last_name="Kid",
+                                        password="x", role="student")
+        self.students.append(Student.objects.create(user=user, branch="ECE", dob=date(2004, 2, 2)))
+
+    def state(self):
+        return {
+            r.student_id: (r.product, r.service, r.dream, r.offer_count, r.batch_year,
+                           sorted(r.offers.values_list("category", "company", "ctc")))
+            for r in Students_data.objects.filter(student__in=self.students)
+        }
+
+    def test_batch_matches_row_by_row(self):
+        s1, s2, s3, new = self.students
+        entries = [
+            (s1, "Acme", "5", "service"), (s1, "Beta", 7, "service"), (s1, "Prod", 12, "product"),
+            (s1, "Gamma", 9, "service"), (s1, "Delta", 4, "service"),
+            (s2, "Prod", 10, "product"), (s2, "Quux", 15, "product"), (s2, "Odd", 3, "other"),
+            (s3, "Dream", 20, "dream"), (s3, "Eps", 4.5, "service"),
+            (new, "Fox", 6, "service"), (new, "Fox2", 8, "dream"),
+        ]
+
+        with transaction.atomic():
+            for student, company, ctc, company_type in entries:
+                record, _ = Students_data.objects.get_or_create(student=student, defaults={
+                    "name": f"{student.user.first_name} {student.user.last_name}".strip(),
+                    "dob": student.dob, "branch": student.branch, "batch_year": "2026",
+                })
+                add_offer_logic(record, company, ctc, company_type)
+            expected = self.state()
+            transaction.set_rollback(True)
+
+        apply_offers(entries, "2026")
+
+        self.assertEqual(self.state(), expected)
+        self.assertEqual(expected[s1.id][:2], ([{"company": "Prod", "ctc": 12.0}], [{"company": "Gamma", "ctc": 9.0}]))
+        self.assertEqual(expected[s1.id][5], [("product", "Prod", 12.0), ("service", "Gamma", 9.0)])
+
+    def test_offer_rows_and_analytics(self):
+        s1, s2, s3, new = self.students
+        apply_offers([(s1, "Acme", 6, "service"), (s1, "Beta", 7, "service"), (s2, "Acme", 12, "product")], "2026")
+        first = Offer.objects.get(company="Acme", category="service")
+
+        apply_offers([(s1, "Prod", 20, "product"), (s1, "Gamma", 5, "service")], "2026")
+
+        # Beta is the highest service once a product exists; Acme's service row goes away
+        self.assertFalse(Offer.objects.filter(id=first.id).exists())
+        self.assertEqual(Offer.objects.count(), 3)
+        self.assertEqual(offers.highest_ctc(), 20.0)
+        self.assertEqual(offers.offers_per_company()[0], {"company": "Acme", "offers": 1, "highest_ctc": 12.0})
+        self.assertEqual(offers.placement_rate_by_branch("2025"),
+                         [{"branch": "CSE", "students": 3, "placed": 2, "rate": 66.67}])
+
+    def test_bulk_upload_query_count_does_not_grow(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username="p", email="p@college.edu", password="x",
+                                                           role="placement"))
+        for i in range(4, 40):
+            make_student(i)
+
+        counts = []
+        for rows in [range(1, 4), range(1, 40)]:
+            buffer = io.BytesIO()
+            pd.DataFrame({
+                "name": [f"First{i} Last{i}" for i in rows],
+                "usn": [self.students[0].id] + [""] * (len(rows) - 1),
+                "ctc": [6] * len(rows),
+            }).to_excel(buffer, index=False)
+            with CaptureQueriesContext(connection) as ctx:
+                res = client.post("/api/student360/placement/bulk-upload/", {
+                    "file": SimpleUploadedFile("offers.xlsx", buffer.getvalue()),
+                    "year": "2026", "company_name": "Acme", "company_type": "service",
+                })
+            self.assertEqual(len(res.data["updated"]), len(rows))
+            counts.append(len(ctx))
+
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual(Students_data.objects.get(student=self.students[0]).offer_count, 2)
+
+
+class PlacementStatsTests(TestCase):
+    def setUp(self):
+        self.students = [make_student(i) for i in range(1, 4)]
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="p", email="p@college.edu", password="x",
+                                                                role="placement"))
+
+    def test_offers_refresh_their_group(self):
+        s1, s2, s3 = self.students
+        apply_offers([(s1, "Acme", 6, "service"), (s1, "Prod", 20, "product"), (s2, "Dream", 10, "dream")], "2025")
+
+        with self.assertNumQueries(1):
+            res = self.client.get("/api/student360/placement/stats/", {"batch_year": "2025"})
+        stat = res.data[0]
+        self.assertEqual(
+            {k: stat[k] for k in ["branch", "students", "placed", "placement_rate", "median_ctc", "max_ctc"]},
+            {"branch": "CSE", "students": 3, "placed": 2, "placement_rate": 66.67, "median_ctc": 15.0, "max_ctc": 20.0},
+        )
+        self.assertEqual((stat["product_offers"], stat["service_offers"], stat["dream_offers"]), (1, 1, 1))
+
+        add_offer_logic(Students_data.objects.get(student=s3), "Acme", 30, "dream")
+        self.assertEqual(PlacementStat.objects.get(batch_year="2025", branch="CSE").placed, 3)
+
+    def test_without_conflict_target_support(self):
+        # MySQL: bulk_create(update_conflicts=True) cannot take unique_fields
+        s1, s2, _ = self.students
+        with mock.patch.object(connection.features, "supports_update_conflicts_with_target", False):
+            apply_offers([(s1, "Acme", 6, "service")], "2025")
+            apply_offers([(s2, "Prod", 20, "product")], "2025")
+        stat = PlacementStat.objects.get(batch_year="2025", branch="CSE")
+        self.assertEqual((stat.placed, stat.max_ctc), (2, 20.0))
+        self.assertEqual(PlacementStat.objects.count(), 1)
+
+    def test_roster_upload_and_full_rebuild(self):
+        buffer = io.BytesIO()
+        pd.DataFrame({"name": ["Asha"], "dob": ["2004-05-01"], "branch": ["ECE"]}).to_excel(buffer, index=False)
+        self.client.post("/api/student360/students/bulk-upload/2025/",
+                         {"file": SimpleUploadedFile("s.xlsx", buffer.getvalue())})
+        self.assertEqual(PlacementStat.objects.get(batch_year="2025", branch="ECE").students, 1)
+
+        PlacementStat.objects.all().delete()
+        call_command("refresh_placement_stats", stdout=StringIO())
+        self.assertEqual(
+            list(PlacementStat.objects.order_by("branch").values_list("branch", "students")), [("CSE", 3), ("ECE", 1)]
+        )
+
+
+@override_settings(EXPORT_CACHE_DIR=tempfile.mkdtemp())
+class StreamingExportTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="p", email="p@college.edu", password="x",
+                                                                role="placement"))
+        s1, s2 = make_student(1), make_student(2, branch="ECE")
+        apply_offers([(s1, "Acme", 6, "service"), (s2, "Prod", 12, "product"), (s2, "Dream", 20, "dream")], "2025")
+
+    def sheet(self, res):
+        self.assertTrue(res.streaming)
+        wb = load_workbook(io.BytesIO(b"".join(res.streaming_content)), read_only=True)
+        return [list(r) for r in wb.active.iter_rows(values_only=True)]
+
+    def test_placed_students_xlsx_and_csv(self):
+        rows = self.sheet(self.client.get("/api/student360/placement/export-placed-students/"))
+        self.assertEqual(rows, [
+            ["Name", "Batch", "Branch", "Offers", "Total Offers"],
+            ["First1 Last1", "2025", "CSE", "Acme (6.0 LPA)", 1],
+            ["First2 Last2", "2025", "ECE", "Prod (12.0 LPA), Dream (20.0 LPA)", 2],
+        ])
+
+        res = self.client.get("/api/student360/placement/export-placed-students/", {"export_format": "csv"})
+        self.assertEqual(res["Content-Type"], "text/csv")
+        lines = b"".join(res.streaming_content).decode("utf-8-sig").splitlines()
+        self.assertEqual(lines[0], "Name,Batch,Branch,Offers,Total Offers")
+        self.assertEqual(len(lines), 3)
+
+    def test_exports_are_cached_per_data_version(self):
+        url = "/api/student360/placement/export-placed-students/"
+        first = self.client.get(url)
+        self.sheet(first)
+        etag = first["ETag"]
+        self.assertTrue(first["Last-Modified"])
+
+        with self.assertNumQueries(0):
+            again = self.client.get(url)
+        self.assertEqual(again["ETag"], etag)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_offers([(Student.objects.get(user__username="student1"), "Prod", 15, "product")], "2025")
+        fresh = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh["ETag"], etag)
+        self.assertEqual(self.sheet(fresh)[1][3], "Prod (15.0 LPA), Acme (6.0 LPA)")
+
+    def test_file_removed_by_a_newer_version_is_regenerated(self):
+        url = "/api/student360/placement/export-placed-students/"
+        self.client.get(url)
+        real_open = open
+        calls = []
+
+        def racing_open(path, *args):
+            # another request built a newer version and removed this file in between
+            if not calls:
+                os.remove(path)
+            calls.append(path)
+            return real_open(path, *args)
+
+        with mock.patch("student360.exports.open", racing_open, create=True):
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(self.sheet(res)), 3)
+        self.assertEqual(len(calls), 2)
+
+    def test_filtered_students_download(self):
+        res = self.client.get("/api/student360/placement/filtered-students/",
+                              {"branch": "ECE", "download_excel": "true"})
+        rows = self.sheet(res)
+        self.assertEqual(rows[0], ["id", "name", "percentage10", "percentage12", "phone", "branch", "cgpa"])
+        self.assertEqual(rows[1][1:2], ["First2 Last2"])
+
+    def test_company_registrations(self):
+        CompanyData.objects.create(company_name="Acme", eligible_batches=[2025], eligible_branches=["CSE"],
+                                   jd_text="x" * 600)
+        rows = self.sheet(self.client.get("/api/student360/placement/export-companies/"))
+        self.assertEqual(rows[1][:3], ["Acme", "2025", "CSE"])
+        self.assertEqual(len(rows[1][8]), 503)
+
+
+class JobBoardTests(TestCase):
+    url = "/api/student360/student/companies/"
+
+    def setUp(self):
+        caches["default"].clear()
+        self.student = make_student(1)
+        self.client = APIClient()
+        self.client.force_authenticate(self.student.user)
+        now = timezone.now()
+        CompanyData.objects.bulk_create([
+            CompanyData(company_name=f"Company {i}", eligible_batches=[2025], eligible_branches=["CSE"],
+                        registration_deadline=now + timedelta(days=1 if i % 2 else -1) if i % 3 else None)
+            for i in range(500)
+        ])
+        self.applied = list(CompanyData.objects.order_by("id").values_list("id", flat=True)[:3])
+        CompanyApplication.objects.bulk_create([
+            CompanyApplication(student=self.student, company_id=i, applied=True) for i in self.applied
+        ])
+
+    def test_query_count_for_500_companies(self):
+        # companies + the student's cached profile (2, for the eligibility check) + applied ids
+        # (student_profile is already cached on the test user)
+        with self.assertNumQueries(4):
+            res = self.client.get(self.url)
+        self.assertEqual(len(res.data), 500)
+        self.assertEqual({r["id"] for r in res.data if r["applied"]}, set(self.applied))
+
+        by_name = {r["company_name"]: r for r in res.data}
+        self.assertEqual([by_name[f"Company {i}"]["deadline_crossed"] for i in (1, 2, 3)], [False, True, False])
+
+        # cached rows: only the per-student overlay hits the DB
+        with self.assertNumQueries(1):
+            again = self.client.get(self.url)
+        self.assertEqual(again.data, res.data)
+
+    def test_company_writes_refresh_the_board(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            CompanyData.objects.create(company_name="Newcomer", eligible_batches=[], eligible_branches=[])
+        self.assertEqual(self.client.get(self.url).data[0]["company_name"], "Newcomer")
+
+    def test_paged(self):
+        # board criteria + profile (2) + the page + applied ids
+        with self.assertNumQueries(5):
+            res = self.client.get(self.url, {"page_size": 50})
+        self.assertEqual(len(res.data["results"]), 50)
+
+
+@override_settings(EXPORT_CACHE_DIR=tempfile.mkdtemp())
+class EligibilityTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.eligible = make_student(1)
+        make_student(2, branch="ECE")
+        self.low_cgpa = make_student(3, cgpa="6.50")
+        make_student(4, cgpa=None)
+        Students_data.objects.filter(student=make_student(5)).update(batch_year="2026")
+        Students_data.objects.filter(student=make_student(6)).update(percentage10=None)
+        self.company = CompanyData.objects.create(
+            company_name="Acme", eligible_batches=[2025], eligible_branches=["CSE"],
+            min_cgpa=Decimal("7.00"), min_10th=Decimal("80"),
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(
+            username="tpo", email="tpo@college.edu", password="x", role="placement"))
+        self.url = f"/api/student360/placement/companies/{self.company.id}/eligible/"
+
+    def test_eligible_list_is_one_query_and_cached(self):
+        # company + eligible students
+        with self.assertNumQueries(2):
+            res = self.client.get(self.url)
+        self.assertEqual(res.data["count"], 1)
+        self.assertEqual(res.data["students"][0]["student_id"], self.eligible.id)
+
+        # in-memory rules agree with the SQL filter
+        criteria = company_criteria(self.company)
+        matching = {sid for sid in Student.objects.values_list("id", flat=True)
+                    if matches(criteria, caching.build_student_profile(sid)["eligibility"])}
+        self.assertEqual(matching, {self.eligible.id})
+
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    def test_marks_change_refreshes_the_list(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.low_cgpa.cgpa = Decimal("7.50")
+            self.low_cgpa.save()
+        self.assertEqual(self.client.get(self.url).data["count"], 2)
+
+    def test_export(self):
+        res = self.client.get(self.url + "export/", {"export_format": "csv"})
+        content = b"".join(res.streaming_content).decode("utf-8-sig")
+        self.assertIn("First1 Last1", content)
+        self.assertNotIn("First3 Last3", content)
+
+    def test_placement_roles_only(self):
+        for path in [self.url, self.url + "export/"]:
+            self.assertEqual(APIClient().get(path).status_code, 401)
+            client = APIClient()
+            client.force_authenticate(self.eligible.user)
+            self.assertEqual(client.get(path).status_code, 403)
+
+    def test_job_board_shows_eligible_drives_only(self):
+        open_drive = CompanyData.objects.create(company_name="Open", eligible_batches=[], eligible_branches=[])
+        client = APIClient()
+        client.force_authenticate(self.low_cgpa.user)
+
+        res = client.get("/api/student360/student/companies/")
+        self.assertEqual([r["id"] for r in res.data], [open_drive.id])
+        res = client.get("/api/student360/student/companies/", {"page_size": 10})
+        self.assertEqual([r["id"] for r in res.data["results"]], [open_drive.id])
+
+        res = client.post("/api/student360/student/apply/", {"company": self.company.id})
+        self.assertEqual(res.status_code, 403)
+        self.assertFalse(CompanyApplication.objects.exists())
+
+    def test_benchmark_command(self):
+        out, err = StringIO(), StringIO()
+        companies = CompanyData.objects.count()
+        call_command("benchmark_eligibility", companies=5, students=200, stdout=out, stderr=err)
+        self.assertEqual(err.getvalue(), "")
+        self.assertIn("one SQL query per company", out.getvalue())
+        self.assertEqual(CompanyData.objects.count(), companies)
+
+
+class StudentSerializerQueryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.mentor_user = User.objects.create_user(username="m", email="mentor@college.edu", password="x", role="mentor")
+        self.mentor = Mentors_data.objects.create(name="Dr Rao", email="mentor@college.edu", department="CSE")
+        self.client.force_authenticate(self.mentor_user)
+
+    def test_students_list_is_one_query_for_1_or_1000_rows(self):
+        bulk_students(1, self.mentor)
+        with self.assertNumQueries(1):
+            res = self.client.get("/api/student360/students/list/")
+        self.assertEqual(res.data[0]["assigned_mentor"], "Dr Rao")
+        self.assertEqual(res.data[0]["phone"], "90")
+        self.assertEqual(res.data[0]["cgpa"], Decimal("7.50"))
+
+        bulk_students(999, self.mentor, start=1)
+        with self.assertNumQueries(1):
+            res = self.client.get("/api/student360/students/list/")
+        self.assertEqual(len(res.data), 1000)
+
+    def test_mentor_views_do_not_grow_with_students(self):
+        bulk_students(3, self.mentor)
+        with self.assertNumQueries(2):
+            self.client.get("/api/student360/mentor/me/students/")
+        with self.assertNumQueries(3):
+            self.client.get("/api/student360/mentor/me/students-documents/")
+
+        bulk_students(50, self.mentor, start=3)
+        with self.assertNumQueries(2):
+            res = self.client.get("/api/student360/mentor/me/students/")
+        with self.assertNumQueries(3):
+            self.client.get("/api/student360/mentor/me/students-documents/")
+        self.assertEqual(len(res.data["students"]), 53)
+
+
+class PlacementStudentsViewTests(TestCase):
+    url = "/api/student360/placement/students/"
+
+    def setUp(self):
+        self.client = APIClient()
+        self.officer = User.objects.create_user(username="p", email="p@college.edu", password="x", role="placement")
+        self.client.force_authenticate(self.officer)
+        self.mentor = Mentors_data.objects.create(name="Dr Rao", email="mentor@college.edu", department="CSE")
+
+    def test_mentors_are_joined_once(self):
+        bulk_students(2, self.mentor)
+        with self.assertNumQueries(1):
+            small = self.client.get(self.url)
+        bulk_students(40, self.mentor, start=2)
+        with self.assertNumQueries(1):
+            large = self.client.get(self.url)
+
+        self.assertEqual(len(small.data), 2)
+        self.assertEqual(len(large.data), 42)
+        self.assertEqual(large.data[0]["assigned_mentor_name"], "Dr Rao")
+
+    def test_fields_projection_and_cursor_pages(self):
+        bulk_students(5, self.mentor)
+        res = self.client.get(self.url, {"fields": "name,assigned_mentor_name", "page_size": 2})
+
+        self.assertEqual(res.data["results"], [
+            {"name": "Bulk 0", "assigned_mentor_name": "Dr Rao"},
+            {"name": "Bulk 1", "assigned_mentor_name": "Dr Rao"},
+        ])
+        self.assertIsNone(res.data["previous"])
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual([s["name"] for s in res.data["results"]], ["Bulk 2", "Bulk 3"])
+
+        res = self.client.get("/api/student360/placement/get_students/", {"fields": "name,branch"})
+        self.assertEqual(res.data[4], {"name": "Bulk 4", "branch": "CSE"})
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username="a", email="a@college.edu", password="x", role="admin")
+        self.client.force_authenticate(self.admin)
+
+    def collect(self, url, page_size):
+        names = []
+        res = self.client.get(url, {"page_size": page_size})
+        while True:
+            names += [row["name"] for row in res.data["results"]]
+            if not res.data["next"]:
+                return names
+            res = self.client.get(res.data["next"])
+
+    def test_pages_cover_every_row_once(self):
+        # duplicate names exercise the id tie-breaker
+        for i in range(7):
+            Mentors_data.objects.create(name=f"Mentor {i % 3}", email=f"m{i}@college.edu")
+
+        names = self.collect("/api/student360/students/mentors/", 2)
+        self.assertEqual(names, sorted(f"Mentor {i % 3}" for i in range(7)))
+
+    def test_unpaged_request_returns_plain_list(self):
+        Mentors_data.objects.create(name="Dr Rao", email="mentor@college.edu")
+        res = self.client.get("/api/student360/students/mentors/")
+        self.assertEqual([m["name"] for m in res.data], ["Dr Rao"])
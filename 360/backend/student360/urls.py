@@ -24,13 +24,17 @@ urlpatterns = [
     path("students/user/<int:user_id>/", views.get_student_by_user_id, name="get_student_by_user_id"),  # added by google (Python)
     path("students/update/<int:student_id>/", views.update_student_profile, name="update_student"),
     path("students/", views.get_student_by_email, name="get_student_by_email"),
+    path("cache/stats/", views.cache_stats, name="cache_stats"),
 
     path('api/', include(router.urls)),
     # path("ocr/",views.ocr_marksheet, name="ocr_marks"),
 path("students/bulk-upload/<str:year>/", views.bulk_upload_students),
 path("students/addstudent/", views.add_student, name="add-student"),
+path("students/addstudent/jobs/<uuid:job_id>/", views.ocr_job_status, name="ocr-job-status"),
+path("students/ocr-batch/<str:year>/", views.ocr_batch_upload, name="ocr-batch-upload"),
 
 path("students/bulk-upload-mentor/", views.bulk_upload_mentors),
+path("students/bulk-upload-mentor/<str:batch_id>/emails/", views.mentor_email_status, name="mentor-email-status"),
 path("students/addmentor/", views.addmentor),
 path("students/list/", views.students_list, name="students-list"),
     path("students/mentors/", views.mentors_list, name="mentors-list"),
@@ -69,6 +73,9 @@ path("students/list/", views.students_list, name="students-list"),
     path("placement/register-company/", views.register_company, name="register_company"),
     path("placement/export-companies/", views.export_company_registrations, name="export_company_registrations"),
     path("placement/export-placed-students/", views.export_placed_students, name="export_placed_students"),
+    path("placement/stats/", views.get_placement_stats, name="placement_stats"),
+    path("placement/companies/<int:company_id>/eligible/", views.get_eligible_students, name="eligible_students"),
+    path("placement/companies/<int:company_id>/eligible/export/", views.export_eligible_students, name="export_eligible_students"),
 
     # added by google (Python) - Job Portal
     path("student/companies/", views.get_all_companies, name="get_all_companies"),
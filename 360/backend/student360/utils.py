@@ -1,6 +1,7 @@
 from itsdangerous import URLSafeTimedSerializer
 from django.conf import settings
-from django.core.mail import send_mail
+
+from .outbox import send_email
 
 # Generate a temporary password link
 def generate_password_set_link(email):
@@ -17,14 +18,13 @@ def verify_password_token(token, expiration=86400):  # 86400 sec = 1 day
     except Exception:
         return None
 
-# Send email to mentor
-def send_mentor_email(email, name, link):
+# Subject / body of the mentor set-password mail
+def mentor_email_message(name, link):
     subject = "Set your Mentor Password"
     message = f"Hi {name},\n\nClick the link below to set your password. Link expires in 1 day:\n{link}\n\nThanks!"
-    send_mail(
-        subject,
-        message,
-        settings.DEFAULT_FROM_EMAIL,
-        [email],
-        fail_silently=False,
-    )
+    return subject, message
+
+# Send email to mentor (queued in the outbox, delivered in the background)
+def send_mentor_email(email, name, link):
+    subject, message = mentor_email_message(name, link)
+    send_email(subject, message, [email], from_email=settings.DEFAULT_FROM_EMAIL)
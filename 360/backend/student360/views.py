@@ -1,10 +1,11 @@
 from datetime import timezone
 from math import ceil
+import os
 import tempfile
 import uuid
 from django.conf import settings
-from django.http import JsonResponse
-from  django.core.mail import send_mail
+from django.http import Http404, JsonResponse
+from django.utils.dateparse import parse_date
 from rest_framework.decorators import api_view, permission_classes, parser_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
@@ -13,8 +14,18 @@ from rest_framework import status
 from django.contrib.auth import authenticate
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.shortcuts import get_object_or_404
-from .serializers import  BulkPlacementUploadSerializer, Student_dataSerializer, StudentSerializer, StudentSignupSerializer, SimpleUserSerializer, StudentDocumentSerializer
-from .models import Mentors_data, StudentDocument, Student, Students_data, User
+from .serializers import  BulkPlacementUploadSerializer, Student_dataSerializer, StudentSerializer, StudentSignupSerializer, SimpleUserSerializer, StudentDocumentSerializer, student_list_queryset
+from .models import Mentors_data, PlacementStat, StudentDocument, Student, Students_data, User
+from .bulk_upload import MENTOR_COLUMN_MAP, chunk_size_param, ingest_students, map_columns, open_sheet, save_mentor_rows
+from . import caching, outbox
+from .job_board import cached_job_board, company_row, eligible_drives, job_board_queryset, overlay_viewer
+from .exports import EXPORT_CHUNK_SIZE, cached_export, export_format, stream_export
+from .placement_stats import STAT_FIELDS
+from .eligibility import ELIGIBLE_COLUMNS, company_criteria, eligible_students, export_row, matches
+from .offers import apply_offers, offers_changed, resolve_students_by_id, resolve_students_by_name
+from .mentor_assignment import (
+    DEFAULT_STRATEGY, STRATEGIES, apply_plan, describe_plan, load_planning_data, plan_assignments,
+)
 import pandas as pd
 from django.views.decorators.csrf import csrf_exempt
 
@@ -160,6 +171,11 @@ def list_documents(request, student_id=None):
         return Response({"error": "Student ID required"}, status=400)
 
     docs = StudentDocument.objects.filter(student_id=student_id)
+    page = paginate(request, docs, ("-uploaded_at", "id"),
+                    lambda items: StudentDocumentSerializer(items, many=True, context={'request': request}).data)
+    if page is not None:
+        return page
+
     serializer = StudentDocumentSerializer(docs, many=True, context={'request': request})
     print(serializer.data)
     return Response(serializer.data)
@@ -195,6 +211,14 @@ def current_user(request):
 
 
 # ---------------- Get student by ID ----------------
+PROFILE_FIELDS = ["id", "email", "first_name", "last_name", "phone", "branch", "semester", "cgpa", "assigned_mentor_name"]
+PLACEMENT_FIELDS = ["product", "service", "dream", "offer_count"]
+
+
+def profile_data(profile, fields=PROFILE_FIELDS):
+    return {f: profile[f] for f in fields}
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def get_student(request, student_id):
@@ -202,34 +226,15 @@ def get_student(request, student_id):
     Fetch student profile by ID.
     Only allow students to access their own profile; others can access any.
     """
-    student = get_object_or_404(Student, id=student_id)
+    profile = caching.student_profile(student_id)
+    if profile is None:
+        raise Http404
 
     # If user is a student, restrict access
-    if request.user.role == "student" and student.user != request.user:
+    if request.user.role == "student" and profile["user_id"] != request.user.id:
         return Response({"error": "Unauthorized"}, status=status.HTTP_403_FORBIDDEN)
-    
-    student_record = Students_data.objects.filter(student=student).first()
-    mentor_name = None
-    if student_record and student_record.assigned_mentor:
-        mentor = student_record.assigned_mentor
-        mentor_name = f"{mentor.name} ".strip()
-    
-    student_data = {
-        "id": student.id,
-        # "user_id": student.user.id,
-        "email": student.user.email,
-        "first_name": student.user.first_name,
-        "last_name": student.user.last_name,
-        "phone": student.phone,
-        "branch": student.branch,
-        "semester": student.semester,
-        "cgpa": student.cgpa,
-        "assigned_mentor_name": mentor_name,
-        # "assigned_mentor_id": mentor.id if mentor else None,      # mentor ID
-        # "assigned_mentor_name" : mentor.user.first_name if mentor else None,
-        }
-    
-    return Response(student_data)
+
+    return Response(profile_data(profile))
 
 
 # ---------------- Get student by email ----------------
@@ -242,26 +247,15 @@ def get_student_by_email(request):
     email = request.query_params.get("email")
     if not email:
         return Response({"error": "Email parameter required"}, status=status.HTTP_400_BAD_REQUEST)
-    try:
-        user = User.objects.get(email=email)
-        student = getattr(user, "student_profile", None)
-        if not student:
-            return Response({"error": "Student not found"}, status=status.HTTP_404_NOT_FOUND)
-        
-        student_data = {
-            "id": student.id,
-            "email": student.user.email,
-            "first_name": student.user.first_name,
-            "last_name": student.user.last_name,
-            "phone": student.phone,
-            "branch": student.branch,
-            "semester": student.semester,
-            "cgpa": student.cgpa,
-            "assigned_mentor_name": getattr(student.user.mentor_profile.user, "first_name", None) if hasattr(student.user, "mentor_profile") else None,
-        }
-        return Response(student_data)
-    except User.DoesNotExist:
+
+    user = User.objects.filter(email=email).values("student_profile__id").first()
+    if user is None:
         return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+    profile = caching.student_profile(user["student_profile__id"]) if user["student_profile__id"] else None
+    if not profile:
+        return Response({"error": "Student not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    return Response(profile_data(profile))
 
 # added by google (Python) - Get student by user ID
 @api_view(["GET"])
@@ -271,34 +265,24 @@ def get_student_by_user_id(request, user_id):
     Get student data by user ID (from localStorage)
     Example: /students/user/<user_id>/
     """
-    try:
-        user = User.objects.get(id=user_id)
-        student = getattr(user, "student_profile", None)
-        if not student:
-            return Response({"error": "Student not found"}, status=status.HTTP_404_NOT_FOUND)
-        
-        # Get placement data from Students_data
-        student_record = Students_data.objects.filter(student=student).first()
-        
-        student_data = {
-            "id": student.id,
-            "email": student.user.email,
-            "first_name": student.user.first_name,
-            "last_name": student.user.last_name,
-            "phone": student.phone,
-            "branch": student.branch,
-            "semester": student.semester,
-            "cgpa": student.cgpa,
-            "assigned_mentor_name": getattr(student.user.mentor_profile.user, "first_name", None) if hasattr(student.user, "mentor_profile") else None,
-            # Placement data from Students_data model
-            "product": student_record.product if student_record else [],
-            "service": student_record.service if student_record else [],
-            "dream": student_record.dream if student_record else [],
-            "offer_count": student_record.offer_count if student_record else 0,
-        }
-        return Response(student_data)
-    except User.DoesNotExist:
+    user = User.objects.filter(id=user_id).values("student_profile__id").first()
+    if user is None:
         return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+    profile = caching.student_profile(user["student_profile__id"]) if user["student_profile__id"] else None
+    if not profile:
+        return Response({"error": "Student not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    # Placement data from Students_data model
+    return Response(profile_data(profile, PROFILE_FIELDS + PLACEMENT_FIELDS))
+
+
+# ---------------- Cache monitoring ----------------
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def cache_stats(request):
+    if request.user.role not in ["admin", "placement"]:
+        return Response({"error": "Unauthorized"}, status=status.HTTP_403_FORBIDDEN)
+    return Response({"student_profiles": caching.profile_cache_stats()})
 
 
 # ---------------- Update student profile ----------------
@@ -371,84 +355,41 @@ def bulk_upload_students(request, year):
     file = request.FILES["file"]
 
     try:
-        import pandas as pd
-
-        # Read Excel
-        df = pd.read_excel(file)
-
-        # Normalize column names
-        df.columns = [c.strip().lower().replace(" ", "_") for c in df.columns]
-        print("RECEIVED COLUMNS =>", df.columns)
-        # Accept multiple naming styles
-        column_map = {
-            "name": ["name", "full_name", "student_name"],
-            "usn": ["usn", "rollnumber", "roll_no"],
-            "dob": ["dob", "date_of_birth"],
-            "marks10": ["marks10", "tenth_marks"],
-            "maxMarks10": ["maxmarks10", "tenth_max"],
-            "percentage10": ["percentage10", "tenth_percentage"],
-            "marks12": ["marks12", "twelth_marks"],
-            "maxMarks12": ["maxmarks12", "twelth_max"],
-            "percentage12": ["percentage12", "twelth_percentage"],
-            "branch": ["branch", "department"],
-        }
-
-        final_cols = {}
+        chunk_size = chunk_size_param(request.GET.get("chunk_size"))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
-        # Map flexible column names
-        for key, options in column_map.items():
-            for opt in options:
-                if opt.lower() in df.columns:
-                    final_cols[key] = opt.lower()
-                    break
-
-        # Mandatory fields
-        for req in ["name", "dob"]:
-            if req not in final_cols:
-                return JsonResponse({"error": f"Missing required column: {req}"}, status=400)
-
-        saved = 0
-        
-        skipped = 0
+    try:
+        # Stream the sheet (.xlsx or .csv) chunk by chunk, committing per chunk
+        def log_progress(report):
+            print(f"[bulk upload {year}] chunk {report['chunks']}: "
+                  f"{report['rows_processed']} rows, {report['records_saved']} saved")
 
-        # Insert rows
-        for _, row in df.iterrows():
-            try:
-                obj, created = Students_data.objects.get_or_create(
-                    name=row[final_cols["name"]],
-                    dob=row[final_cols["dob"]],
-                    defaults={
-                        "branch": row.get(final_cols.get("branch"), "Unknown"),
-                        "batch_year": year,
-                        "percentage10": row.get(final_cols.get("percentage10"), None),
-                        "percentage12": row.get(final_cols.get("percentage12"), None),
-                    }
-                )
-                if created:
-                    saved += 1
-                else:
-                    skipped += 1
-            except Exception as e:
-                skipped += 1
-                continue
+        try:
+            report = ingest_students(file, year, chunk_size=chunk_size, progress=log_progress)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
 
         return JsonResponse({
             "message": "Bulk upload completed",
             "batch_year": year,
-            "records_saved": saved,
-            "records_skipped": skipped
+            **report,
         })
 
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
 
-import easyocr
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 
 from .utils import generate_password_set_link, send_mentor_email
+from . import ocr
+from .models import OcrJob, OutboxEmail
+from .ocr_jobs import submit_ocr_job
+from .ocr_batch import import_marksheet_batch
+import zipfile
 
 @csrf_exempt
 def bulk_upload_mentors(request):
@@ -461,24 +402,16 @@ def bulk_upload_mentors(request):
     file = request.FILES["file"]
 
     try:
-        import pandas as pd
+        chunk_size = chunk_size_param(request.GET.get("chunk_size"))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
-        df = pd.read_excel(file)
-        df.columns = [c.strip().lower().replace(" ", "_") for c in df.columns]
-
-        column_map = {
-            "name": ["name", "full_name", "student_name"],
-            "email": ["email", "EmailID"],
-            "phone": ["phone", "phone_no", "mobile_no"],
-            "department": ["department"],
-        }
-
-        final_cols = {}
-        for key, options in column_map.items():
-            for opt in options:
-                if opt.lower() in df.columns:
-                    final_cols[key] = opt.lower()
-                    break
+    try:
+        try:
+            columns, chunks = open_sheet(file, chunk_size)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        final_cols = map_columns(columns, MENTOR_COLUMN_MAP)
 
         # Check mandatory
         for req in ["email"]:
@@ -487,42 +420,43 @@ def bulk_upload_mentors(request):
 
         saved = 0
         skipped = 0
-
-        for _, row in df.iterrows():
-            try:
-                obj, created = Mentors_data.objects.get_or_create(
-                    email=row[final_cols["email"]],
-                    defaults={
-                        "name": row.get(final_cols.get("name"), ""),
-                        "phone": row.get(final_cols.get("phone"), ""),
-                        "department": row.get(final_cols.get("department"), None),
-                    }
-                )
-                if created:
-                    saved += 1
-
-                    email = row[final_cols["email"]]
-                    name = row.get(final_cols.get("name"), "Mentor")
-
-                    create_mentor_user(email, name)
-                    
-                    link = generate_password_set_link(email)
-                    send_mentor_email(email, name, link)
-                else:
-                    skipped += 1
-            except Exception as e:
-                skipped += 1
-                continue
+        processed = 0
+        batch_id = uuid.uuid4().hex
+
+        # Mentors, their logins and the activation emails go in per chunk;
+        # emails are delivered in the background (see outbox.py)
+        for chunk_no, chunk in enumerate(chunks, start=1):
+            with transaction.atomic():
+                chunk_saved, chunk_skipped = save_mentor_rows(chunk, final_cols, batch_id)
+            saved += chunk_saved
+            skipped += chunk_skipped
+            processed += len(chunk)
+            print(f"[mentor upload] chunk {chunk_no}: {processed} rows, {saved} saved")
+
+        if saved:
+            outbox.dispatch(batch_id)
 
         return JsonResponse({
             "message": "Bulk upload completed",
+            "rows_processed": processed,
             "records_saved": saved,
-            "records_skipped": skipped
+            "records_skipped": skipped,
+            "email_batch_id": batch_id,
         })
 
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
 
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def mentor_email_status(request, batch_id):
+    """
+    GET /students/bulk-upload-mentor/<batch_id>/emails/
+    Delivery results of the activation emails queued by one mentor upload.
+    """
+    return Response(outbox.batch_status(batch_id))
+
 def extract_marks_from_image(uploaded_file):
     try:
         # Save image temporarily
@@ -530,41 +464,17 @@ def extract_marks_from_image(uploaded_file):
             for chunk in uploaded_file.chunks():
                 temp_file.write(chunk)
             temp_name = temp_file.name
+    except Exception as e:
+        print("OCR Error:", e)
+        return None, None
 
-        # Run EasyOCR
-        reader = easyocr.Reader(["en"], gpu=False)
-        result = reader.readtext(temp_name, detail=0)
-
-        text = " ".join(result).lower()
-
-        obtained = None
-        total = None
-
-        # Common patterns
-        patterns = [
-            ("obtained marks", "total marks"),
-            ("marks obtained", "out of"),
-            ("scored", "out of"),
-            ("got", "out of"),
-        ]
-
-        import re
-
-        for line in text.split():
-            # numbers in text
-            pass
-
-        # Extract using regex
-        m1 = re.search(r"(\d{2,3})\s*/\s*(\d{2,3})", text)
-        if m1:
-            obtained = int(m1.group(1))
-            total = int(m1.group(2))
-
-        return obtained, total
-
+    try:
+        return ocr.extract_marks(temp_name)
     except Exception as e:
         print("OCR Error:", e)
         return None, None
+    finally:
+        os.remove(temp_name)
 
 
 
@@ -590,21 +500,28 @@ def add_student(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-    #     # ----------------------------
-    #     # OCR on Marks 10 file
-    #     # ----------------------------
-        marks10_obt, marks10_total = (None, None)
-        if marks10_file:
-            marks10_obt, marks10_total = extract_marks_from_image(marks10_file)
+        try:
+            valid_dob = parse_date(dob)
+        except ValueError:
+            valid_dob = None
+        if valid_dob is None:
+            return Response({"error": "DOB must be a date (YYYY-MM-DD)"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # ----------------------------
+        # Store files, OCR runs in the background (see ocr_jobs.py)
+        # ----------------------------
+        with transaction.atomic():
+            job = OcrJob.objects.create(
+                name=name,
+                dob=valid_dob,
+                batch_year=batch_year,
+                marks10_file=marks10_file,
+                marks12_file=marks12_file,
+                created_by=request.user,
+            )
+            submit_ocr_job(job)
 
     #     # ----------------------------
-    #     # OCR on Marks 12 file
-    #     # ----------------------------
-        marks12_obt, marks12_total = (None, None)
-        if marks12_file:
-            marks12_obt, marks12_total = extract_marks_from_image(marks12_file)
-        print(marks12_obt, marks12_total )
-    #     # ----------------------------
     #     # Save to DB
     #     # ----------------------------
     #     student = Students_data(
@@ -639,7 +556,60 @@ def add_student(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
-    return Response({"message": "Files received successfully"}, status=status.HTTP_200_OK)
+    return Response(
+        {"message": "Files received successfully", "job_id": str(job.id), "status": job.status},
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def ocr_job_status(request, job_id):
+    job = get_object_or_404(OcrJob, id=job_id)
+    if job.created_by_id != request.user.id and request.user.role not in ["admin", "placement"]:
+        return Response({"error": "Unauthorized"}, status=status.HTTP_403_FORBIDDEN)
+    return Response({
+        "job_id": str(job.id),
+        "name": job.name,
+        "status": job.status,
+        "progress": {"processed": job.processed_files, "total": job.total_files},
+        "marks10": job.results.get("marks10"),
+        "marks12": job.results.get("marks12"),
+        "error": job.error,
+    })
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+@parser_classes([MultiPartParser, FormParser])
+def ocr_batch_upload(request, year):
+    """
+    POST /students/ocr-batch/<year>/
+    ZIP of marksheet images + manifest.csv -> AdmissionStudent / Students_data rows.
+    """
+    if request.user.role not in ["admin", "placement"]:
+        return Response({"error": "Unauthorized"}, status=status.HTTP_403_FORBIDDEN)
+
+    archive = request.FILES.get("file")
+    if not archive:
+        return Response({"error": "No file uploaded"}, status=status.HTTP_400_BAD_REQUEST)
+
+    workers = request.data.get("workers")
+    if workers not in (None, ""):
+        try:
+            workers = int(workers)
+        except (TypeError, ValueError):
+            workers = 0
+        if workers <= 0:
+            return Response({"error": "workers must be a positive integer"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        report = import_marksheet_batch(archive, year, workers=workers or None)
+    except (ValueError, zipfile.BadZipFile) as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        print("Error in ocr_batch_upload:", e)
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    return Response(report)
 
 from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse
@@ -717,7 +687,7 @@ def students_list(request):
     GET /students/list/
     Returns all students. Optionally you can filter by query params (branch, batch_year).
     """
-    qs = Students_data.objects.all().select_related('assigned_mentor').order_by('name')
+    qs = student_list_queryset().order_by('name')
     branch = request.query_params.get('branch')
     batch = request.query_params.get('batch_year')
     if branch:
@@ -725,6 +695,10 @@ def students_list(request):
     if batch:
         qs = qs.filter(batch_year=batch)
 
+    page = paginate(request, qs, ("name", "id"), lambda items: StudentSerializer(items, many=True).data)
+    if page is not None:
+        return page
+
     serializer = StudentSerializer(qs, many=True)
     return Response(serializer.data)
 
@@ -735,31 +709,29 @@ from django.db import models
 def mentors_list(request):
     """
     GET /students/mentors/
-    Return mentors with computed current_student_count (calculated from Students_data)
+    Return mentors with their current_student_count (kept up to date on every
+    assignment change, see Students_data.save / reconcile_mentor_counts)
     """
-    mentors = Mentors_data.objects.all().order_by('name')
-
-    # compute accurate current counts from Students_data (avoid trusting DB field)
-    # get counts grouped by mentor id
-    counts_qs = Students_data.objects.filter(assigned_mentor__isnull=False).values('assigned_mentor').annotate(count=models.Count('id'))
-    counts_map = {c['assigned_mentor']: c['count'] for c in counts_qs}
-
-    mentors_serialized = []
-    for m in mentors:
-        computed_count = counts_map.get(m.id, 0)
-        # If you want to persist this to the DB field, you could set m.current_student_count = computed_count and save.
-        mentors_serialized.append({
-            'id': m.id,
-            'phone':m.phone,
-            'name': m.name,
-            'email': m.email,
-            'department': m.department,
-            'max_students': m.max_students,
-            'current_student_count': computed_count,
-            'created_at': m.created_at,
-        })
+    mentors = Mentors_data.objects.all().order_by('name', 'id')
+
+    page = paginate(request, mentors, ("name", "id"), serialize_mentors)
+    if page is not None:
+        return page
+
+    return Response(serialize_mentors(mentors))
+
 
-    return Response(mentors_serialized)
+def serialize_mentors(mentors):
+    return [{
+        'id': m.id,
+        'phone': m.phone,
+        'name': m.name,
+        'email': m.email,
+        'department': m.department,
+        'max_students': m.max_students,
+        'current_student_count': m.current_student_count,
+        'created_at': m.created_at,
+    } for m in mentors]
 
 from django.db import transaction
 @api_view(['POST'])
@@ -773,58 +745,25 @@ def auto_assign_mentors(request):
       - evenly distribute the unassigned students across mentors
       - update Students_data.assigned_mentor and update mentors' current_student_count
     Response: {"status":"success","assigned": <num_assigned>}
+    The distribution is planned in memory and written with bulk_update
+    (see mentor_assignment.py).
+
+    Body (optional):
+      - strategy: even (default) / round_robin / least_loaded / weighted / balanced
+      - dry_run: true to get the proposed plan back without saving it
     """
-    total_assigned = 0
-
-    # We'll operate department-by-department
-    # Gather departments that have mentors
-    departments = Mentors_data.objects.values_list('department', flat=True).distinct()
-
-    with transaction.atomic():
-        for dept in departments:
-            mentors = list(Mentors_data.objects.filter(department=dept).order_by('id'))
-            if not mentors:
-                continue
-
-            # Unassigned students whose branch matches mentor.department
-            students = list(Students_data.objects.filter(branch=dept, assigned_mentor__isnull=True).order_by('id'))
-            if not students:
-                continue
-
-            num_students = len(students)
-            num_mentors = len(mentors)
-
-            # target number per mentor (ceil so all students assigned)
-            per_mentor = ceil(num_students / num_mentors)
-
-            student_index = 0
-            for mentor in mentors:
-                # compute how many we can still assign respecting mentor.max_students
-                # compute current assigned count for this mentor from DB
-                current_count = Students_data.objects.filter(assigned_mentor=mentor).count()
-                capacity_left = None
-                if mentor.max_students and mentor.max_students > 0:
-                    capacity_left = max(0, mentor.max_students - current_count)
-                else:
-                    # if max_students==0 treat as unlimited for distribution, but we'd still assign per_mentor
-                    capacity_left = per_mentor
-
-                assign_count = min(per_mentor, capacity_left)
-                if assign_count <= 0:
-                    continue
-
-                chunk = students[student_index: student_index + assign_count]
-                for s in chunk:
-                    s.assigned_mentor = mentor
-                    s.save()
-                # update DB field for mentor.current_student_count (optional)
-                mentor.current_student_count = Students_data.objects.filter(assigned_mentor=mentor).count()
-                mentor.save(update_fields=['current_student_count'])
-
-                total_assigned += len(chunk)
-                student_index += len(chunk)
-                if student_index >= num_students:
-                    break
+    strategy = request.data.get("strategy") or DEFAULT_STRATEGY
+    if strategy not in STRATEGIES:
+        return Response({"error": f"Unknown strategy. Choose one of: {', '.join(STRATEGIES)}"},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    data = load_planning_data(include_unmatched=strategy == "balanced")
+    assignments, loads = plan_assignments(strategy, data)
+
+    if str(request.data.get("dry_run", "")).lower() in ["1", "true", "yes"]:
+        return Response({"status": "dry_run", **describe_plan(assignments, loads, data, strategy)})
+
+    total_assigned = apply_plan(assignments, loads)
 
     return Response({"status": "success", "assigned": total_assigned}, status=status.HTTP_200_OK)
 
@@ -843,19 +782,14 @@ from .models import CompanyData,CompanyApplication
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_batches(request):
-    # distinct batch_year from Students_data
-    batches = Students_data.objects.values_list('batch_year', flat=True).distinct().order_by('batch_year')
-    # filter out None/Empty if any
-    batches = [b for b in batches if b]
-    return Response(batches)
+    # distinct batch_year from Students_data (cached, see caching.py)
+    return Response(caching.batch_years())
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_branches(request):
-    # distinct branch from Students_data
-    branches = Students_data.objects.values_list('branch', flat=True).distinct().order_by('branch')
-    branches = [b for b in branches if b]
-    return Response(branches)
+    # distinct branch from Students_data (cached, see caching.py)
+    return Response(caching.branches())
 
 @api_view(['POST'])
 @permission_classes([AllowAny]) # Or IsAuthenticated depending on requirements, user didn't specify auth for this page, assuming public or student/admin
@@ -903,58 +837,101 @@ def register_company(request):
 from django.http import HttpResponse
 import pandas as pd
 
+COMPANY_EXPORT_COLUMNS = [
+    "Company Name", "Eligible Batches", "Eligible Branches", "Min CGPA", "Min 10th %", "Min 12th %",
+    "Deadline", "Additional Info", "JD Text",
+]
+PLACED_EXPORT_COLUMNS = ["Name", "Batch", "Branch", "Offers", "Total Offers"]
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def export_company_registrations(request):
-    companies = CompanyData.objects.all().order_by('-created_at')
-    
-    data = []
-    for c in companies:
-        data.append({
-            "Company Name": c.company_name,
-            "Eligible Batches": ", ".join(map(str, c.eligible_batches)),
-            "Eligible Branches": ", ".join(c.eligible_branches),
-            "Min CGPA": c.min_cgpa,
-            "Min 10th %": c.min_10th,
-            "Min 12th %": c.min_12th,
-            "Deadline": c.registration_deadline.strftime('%Y-%m-%d %H:%M') if c.registration_deadline else "N/A",
-            "Additional Info": c.additional_info,
-            "JD Text": c.jd_text[:500] + "..." if c.jd_text and len(c.jd_text) > 500 else c.jd_text
-        })
-        
-    df = pd.DataFrame(data)
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename="company_registrations.xlsx"'
-    df.to_excel(response, index=False)
-    return response
+    companies = CompanyData.objects.all().order_by('-created_at').only(
+        'company_name', 'eligible_batches', 'eligible_branches', 'min_cgpa', 'min_10th', 'min_12th',
+        'registration_deadline', 'additional_info', 'jd_text', 'created_at',
+    )
+
+    def rows():
+        for c in companies.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield {
+                "Company Name": c.company_name,
+                "Eligible Batches": ", ".join(map(str, c.eligible_batches)),
+                "Eligible Branches": ", ".join(c.eligible_branches),
+                "Min CGPA": c.min_cgpa,
+                "Min 10th %": c.min_10th,
+                "Min 12th %": c.min_12th,
+                "Deadline": c.registration_deadline.strftime('%Y-%m-%d %H:%M') if c.registration_deadline else "N/A",
+                "Additional Info": c.additional_info,
+                "JD Text": c.jd_text[:500] + "..." if c.jd_text and len(c.jd_text) > 500 else c.jd_text
+            }
+
+    return cached_export(request, "company_registrations", "companies", COMPANY_EXPORT_COLUMNS, rows,
+                         export_format(request))
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def export_placed_students(request):
     # Filter students with at least one offer
-    placed_students = Students_data.objects.filter(offer_count__gt=0).order_by('batch_year', 'branch', 'name')
-    
-    data = []
-    for s in placed_students:
-        offers = []
-        for cat in [s.product, s.service, s.dream]:
-            if cat:
-                for o in cat:
-                    offers.append(f"{o.get('company')} ({o.get('ctc')} LPA)")
-        
-        data.append({
-            "Name": s.name,
-            "Batch": s.batch_year,
-            "Branch": s.branch,
-            "Offers": ", ".join(offers),
-            "Total Offers": s.offer_count
-        })
-        
-    df = pd.DataFrame(data)
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename="placed_students.xlsx"'
-    df.to_excel(response, index=False)
-    return response
+    placed_students = (Students_data.objects.filter(offer_count__gt=0).order_by('batch_year', 'branch', 'name')
+                       .only('name', 'batch_year', 'branch', 'product', 'service', 'dream', 'offer_count'))
+
+    def rows():
+        for s in placed_students.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            offers = []
+            for cat in [s.product, s.service, s.dream]:
+                if cat:
+                    for o in cat:
+                        offers.append(f"{o.get('company')} ({o.get('ctc')} LPA)")
+
+            yield {
+                "Name": s.name,
+                "Batch": s.batch_year,
+                "Branch": s.branch,
+                "Offers": ", ".join(offers),
+                "Total Offers": s.offer_count
+            }
+
+    return cached_export(request, "placed_students", "placed_students", PLACED_EXPORT_COLUMNS, rows,
+                         export_format(request))
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_placement_stats(request):
+    """
+    GET /placement/stats/?batch_year=2026&branch=CSE
+    Precomputed per batch / branch numbers (see placement_stats.py).
+    """
+    stats = PlacementStat.objects.order_by('batch_year', 'branch')
+    batch_year = request.query_params.get('batch_year')
+    branch = request.query_params.get('branch')
+    if batch_year:
+        stats = stats.filter(batch_year=batch_year)
+    if branch:
+        stats = stats.filter(branch=branch)
+    return Response(list(stats.values('batch_year', 'branch', *STAT_FIELDS, 'updated_at')))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_eligible_students(request, company_id):
+    """
+    GET /placement/companies/<id>/eligible/
+    Students meeting the company's criteria (see eligibility.py).
+    """
+    if request.user.role not in ["admin", "placement"]:
+        return Response({"error": "Unauthorized"}, status=status.HTTP_403_FORBIDDEN)
+    company = get_object_or_404(CompanyData, id=company_id)
+    students = eligible_students(company)
+    return Response({"company": company.company_name, "count": len(students), "students": students})
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_eligible_students(request, company_id):
+    if request.user.role not in ["admin", "placement"]:
+        return Response({"error": "Unauthorized"}, status=status.HTTP_403_FORBIDDEN)
+    company = get_object_or_404(CompanyData, id=company_id)
+    return cached_export(request, f"eligible_students_{company.id}", ("companies", "students"), ELIGIBLE_COLUMNS,
+                         lambda: map(export_row, eligible_students(company)), export_format(request))
 
 @csrf_exempt
 def set_mentor_password(request):
@@ -996,26 +973,28 @@ def resend_activation_email(request):
     if not mentors.exists():
         return Response({"error": "No mentors found"}, status=404)
 
+    # Queue every activation mail in one insert; delivery happens in the background
+    batch_id = uuid.uuid4().hex
+    emails = []
     for mentor in mentors:
-        try:
-            # Generate a new token every time OR store in mentor table (your choice)
-            activation_token = uuid.uuid4().hex
-
-            activation_link = f"http://localhost:3000/mentor/activate/{activation_token}"
+        # Generate a new token every time OR store in mentor table (your choice)
+        activation_token = uuid.uuid4().hex
 
-            # Using mentor.email because the email exists HERE
-            send_mail(
-                subject="Mentor Account Activation",
-                message=f"Hello, activate your account here: {activation_link}",
-                from_email="admin@student360.com",
-                recipient_list=[mentor.email],   # FIXED
-            )
+        activation_link = f"http://localhost:3000/mentor/activate/{activation_token}"
 
-        except Exception as e:
-            print("Email error:", e)
-            return Response({"error": "Mail sending failed"}, status=500)
+        # Using mentor.email because the email exists HERE
+        emails.append(outbox.queue_email(
+            subject="Mentor Account Activation",
+            body=f"Hello, activate your account here: {activation_link}",
+            from_email="admin@student360.com",
+            to=[mentor.email],
+            batch_id=batch_id,
+            save=False,
+        ))
+    OutboxEmail.objects.bulk_create(emails)
+    outbox.dispatch(batch_id)
 
-    return Response({"success": True, "message": "Emails sent successfully"})
+    return Response({"success": True, "message": "Emails queued successfully", "email_batch_id": batch_id})
 
 @api_view(["POST"])
 @permission_classes([AllowAny])
@@ -1034,12 +1013,11 @@ def send_contact_email(request):
     full_message = f"From: {first_name} {last_name}\nEmail: {email}\n\nMessage:\n{message}"
 
     try:
-        send_mail(
+        outbox.send_email(
             subject,
             full_message,
-            None,  # From email, None uses DEFAULT_FROM_EMAIL
             ["krithikahs14@gmail.com"],  # Replace with your actual receiving email
-            fail_silently=False,
+            from_email=None,  # None uses DEFAULT_FROM_EMAIL
         )
         return Response({"message": "Email sent successfully"})
     except Exception as e:
@@ -1058,7 +1036,7 @@ def get_current_mentor_and_students(request):
         return Response({"detail": "Mentor profile not found"}, status=404)
 
     # Find all students assigned to this mentor (FK stored as assigned_mentor_id)
-    students = Students_data.objects.filter(assigned_mentor_id=mentor.id)
+    students = student_list_queryset(Students_data.objects.filter(assigned_mentor_id=mentor.id))
 
     return Response({
         "mentor": MentorSimpleSerializer(mentor).data,
@@ -1089,13 +1067,16 @@ def get_mentor_students_documents(request):
         return Response({"detail": "Mentor profile not found"}, status=404)
 
     # 2️⃣ Get all students assigned to this mentor
-    students = Students_data.objects.filter(assigned_mentor_id=mentor.id)
+    students = list(student_list_queryset(Students_data.objects.filter(assigned_mentor_id=mentor.id)))
 
     # 3️⃣ Extract the actual student IDs from student_data.student_id
     student_ids = [s.student_id for s in students]  # <--- important
 
-    # 4️⃣ Fetch pending documents for these student_ids
-    pending_docs = StudentDocument.objects.filter(student_id__in=student_ids, status="pending")
+    # 4️⃣ Fetch pending documents for these student_ids (one query, grouped here)
+    pending_docs = StudentDocument.objects.filter(student_id__in=student_ids, status="pending").select_related("student")
+    docs_by_student = {}
+    for doc in pending_docs:
+        docs_by_student.setdefault(doc.student_id, []).append(doc)
 
     # 5️⃣ Build response
     student_list = []
@@ -1103,9 +1084,8 @@ def get_mentor_students_documents(request):
         student_data = StudentSerializer(student).data
 
         # Attach pending docs for this student
-        student_docs = pending_docs.filter(student_id=student.student_id)
         student_data["documents"] = StudentDocumentSerializer(
-            student_docs, many=True, context={"request": request}
+            docs_by_student.get(student.student_id, []), many=True, context={"request": request}
         ).data
 
         student_list.append(student_data)
@@ -1162,16 +1142,30 @@ from rest_framework.views import APIView
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from .serializers import placement_student_queryset
+from .pagination import paginate
+
+def placement_students_response(request, view=None):
+    """
+    Student_dataSerializer listing shared by the placement endpoints.
+    ?fields=name,branch,... projects columns, ?cursor= / ?page_size= paginates.
+    """
+    fields = [f.strip() for f in request.query_params.get("fields", "").split(",") if f.strip()] or None
+    students = placement_student_queryset(fields)
+
+    page = paginate(request, students, ("name", "id"),
+                    lambda items: Student_dataSerializer(items, many=True, fields=fields).data, view=view)
+    if page is not None:
+        return page
+
+    return Response(Student_dataSerializer(students, many=True, fields=fields).data)
+
 
 class PlacementStudentsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        students = Students_data.objects.all()
-
-        serializer = Student_dataSerializer(students, many=True)
-        print(serializer.data)
-        return Response(serializer.data)
+        return placement_students_response(request, view=self)
 
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
@@ -1179,6 +1173,7 @@ from rest_framework.response import Response
 from django.http import HttpResponse
 import pandas as pd
 import io
+from .filters import FILTERED_EXPORT_COLUMNS, filter_students, filtered_student_rows, iter_filtered_student_rows
 
 class FilteredStudentsView(APIView):
     permission_classes = [IsAuthenticated]
@@ -1194,77 +1189,21 @@ class FilteredStudentsView(APIView):
         min_cgpa = float(min_cgpa) if min_cgpa else 0
         max_cgpa = float(max_cgpa) if max_cgpa else 10
 
-        # clean branches
-        branches = [b.strip() for b in branches if b.strip()]
-        if not branches:
-            branches = ["all"]
-        branches_lower = [b.lower() for b in branches]
-
-        students_list = []
-
-        for student in Student.objects.all():
-            print(f"Checking student: {student.id} - {student.user.first_name}")
-            try:
-                student_data = Students_data.objects.get(student_id=student.id)
-            except Students_data.DoesNotExist:
-                continue
-
-            # branch filter
-            student_branch = (student_data.branch or "").strip().lower()
-            if "all" not in branches_lower and student_branch not in branches_lower:
-                print(f"Skipping {student.id} due to branch filter")
-                continue
-
-            # cgpa filter
-            if student.cgpa is None or student.cgpa < min_cgpa or student.cgpa > max_cgpa:
-                print(f"Skipping {student.id} due to CGPA {student.cgpa}")
-                continue
-
-            # keyword filter
-            if keyword:
-                student_docs = StudentDocument.objects.filter(student_id=student.id)
-                keyword_lower = keyword.lower()
-                found = False
-                for doc in student_docs:
-                    # Convert metadata to string
-                    meta_str = str(doc.metadata or "")
-                    if keyword_lower in meta_str.lower():
-                        found = True
-                        break
-                if not found:
-                    print(f"Skipping {student.id} due to keyword {keyword}")
-                    continue
-
-            students_list.append({
-                "id": student.id,
-                "name": f"{student.user.first_name} {student.user.last_name}",
-                "percentage10": student_data.percentage10,
-                "percentage12": student_data.percentage12,
-                "phone": student.phone,
-                "branch": student_data.branch,
-                "cgpa": student.cgpa,
-            })
+        students = filter_students(branches, min_cgpa, max_cgpa, keyword)
 
         if download_excel == "true":
-            df = pd.DataFrame(students_list)
-            buffer = io.BytesIO()
-            df.to_excel(buffer, index=False)
-            buffer.seek(0)
-            response = HttpResponse(
-                buffer,
-                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-            )
-            response['Content-Disposition'] = 'attachment; filename=filtered_students.xlsx'
-            return response
+            rows = iter_filtered_student_rows(students, chunk_size=EXPORT_CHUNK_SIZE)
+            return stream_export("filtered_students", FILTERED_EXPORT_COLUMNS, rows, export_format(request))
 
-        print(students_list)
-        return Response(students_list)
+        return Response(filtered_student_rows(students))
 
         
         # placemnet
 
 
 def add_offer_logic(student_data, company_name, ctc, company_type):
+    # Single-offer version kept for one-off callers; the upload endpoints go
+    # through offers.apply_offers, which applies the same rules in bulk.
     ctc = float(ctc)
 
     offer = {"company": company_name, "ctc": ctc}
@@ -1289,6 +1228,7 @@ def add_offer_logic(student_data, company_name, ctc, company_type):
             len(student_data.dream)
         )
         student_data.save()
+        offers_changed([student_data])
         return
 
     # 2️⃣ PRODUCT RULE
@@ -1302,6 +1242,7 @@ def add_offer_logic(student_data, company_name, ctc, company_type):
             len(student_data.dream)
         )
         student_data.save()
+        offers_changed([student_data])
         return
 
     # 3️⃣ DREAM RULE (company is dream by type)
@@ -1314,6 +1255,7 @@ def add_offer_logic(student_data, company_name, ctc, company_type):
             len(student_data.dream)
         )
         student_data.save()
+        offers_changed([student_data])
         print("saved")
         return
 
@@ -1334,81 +1276,54 @@ def placement_bulk_upload(request):
     if "name" not in df.columns:
         return Response({"error": "Excel must contain 'name' column"}, status=400)
 
-    updated = []
-
-    with transaction.atomic():
-        for _, row in df.iterrows():
-            print("Processing row:", row.to_dict())
+    # Validate every row before anything is written
+    rows = []
+    for row in df.to_dict("records"):
+        name = str(row.get("name")).strip()
+        usn = str(row.get("usn") or row.get("USN") or "").strip()
 
-            name = str(row.get("name")).strip()
-            usn = str(row.get("usn") or row.get("USN") or "").strip()
-
-
-            if not name:
-                return Response({"error": "Name missing in excel row"}, status=400)
-
-            excel_ctc = row.get("ctc")
-            final_ctc = excel_ctc if excel_ctc not in [None, '', 0] else default_ctc
-
-            if not final_ctc:
-                return Response({"error": f"CTC missing for {name}"}, status=400)
-
-            # find student
-            student = None
-            if usn:
-                try:
-                    print(usn)
-                    student_id = int(usn)
-                    student = Student.objects.filter(id=student_id).first()
-                    print("valid")
-                    print(student)
-                except ValueError:
-                    print(f"Invalid USN (not integer): {usn}")
-            if not student:
-                
-                first, *rest = name.split()
-                last = " ".join(rest)
+        if not name:
+            return Response({"error": "Name missing in excel row"}, status=400)
 
-                student = Student.objects.filter(
-                    user__first_name__iexact=first,
-                    user__last_name__iexact=last
-                ).first()
+        excel_ctc = row.get("ctc")
+        final_ctc = excel_ctc if excel_ctc not in [None, '', 0] else default_ctc
 
+        if not final_ctc:
+            return Response({"error": f"CTC missing for {name}"}, status=400)
 
-            if not student:
-                print("gone")
+        student_id = None
+        if usn:
+            try:
+                student_id = int(usn)
+            except ValueError:
+                print(f"Invalid USN (not integer): {usn}")
 
-                continue
+        first, *rest = name.split()
+        rows.append((name, student_id, (first.lower(), " ".join(rest).lower()), final_ctc))
 
-            # get Student Data
-            student_data, _ = Students_data.objects.get_or_create(
-                student=student,
-                defaults={
-                    "name": f"{student.user.first_name} {student.user.last_name}".strip(),
+    # find students: by id (usn) first, then by first / last name
+    by_id = resolve_students_by_id([student_id for _, student_id, _, _ in rows if student_id is not None])
+    by_name = resolve_students_by_name([key for _, student_id, key, _ in rows if student_id not in by_id])
 
-                    "dob": student.dob,
-                    "branch": student.branch,
-                    "batch_year": serializer.validated_data["year"]
-                }
-            )
+    entries = []
+    updated = []
+    for name, student_id, key, final_ctc in rows:
+        student = by_id.get(student_id) or by_name.get(key)
+        if not student:
+            print("Student not found:", name)
+            continue
+
+        entries.append((student, company_name, final_ctc, company_type))
+        updated.append({
+            "name": name,
+            "company": company_name,
+            "ctc": final_ctc,
+            "type": company_type,
+        })
 
-            add_offer_logic(student_data, company_name, final_ctc, company_type)
-            print(
-    f"[UPDATED] {student.user.first_name} {student.user.last_name} | "
-    f"Company: {company_name} | CTC: {final_ctc} | Type: {company_type}\n"
-    f" -> Product: {student_data.product}\n"
-    f" -> Service: {student_data.service}\n"
-    f" -> Dream: {student_data.dream}\n"
-    f" -> Offer Count: {student_data.offer_count}\n"
-)
+    apply_offers(entries, serializer.validated_data["year"])
+    print(f"[placement upload] {company_name} ({company_type}): {len(entries)} offers from {len(rows)} rows")
 
-            updated.append({
-                "name": name,
-                "company": company_name,
-                "ctc": final_ctc,
-                "type": company_type,
-            })
-            
     return Response({"status": "ok", "updated": updated})
 
 # student360/views.py
@@ -1469,52 +1384,40 @@ def manual_assign(request):
     if len(students_list) == 0:
         return Response({"error": "No students selected"}, status=400)
 
+    for item in students_list:
+        if not (item.get("ctc") or default_ctc):
+            return Response({"error": f"CTC missing for student {item.get('id')}"}, status=400)
+
+    # the frontend sends user ids
+    students = resolve_students_by_id([item.get("id") for item in students_list], field="user_id")
+
+    entries = []
     updated = []
-    print("Here")
-    with transaction.atomic():
-        print("inside")
-        for item in students_list:
-            student_id = item.get("id")
-            individual_ctc = item.get("ctc") or default_ctc
-
-            if not individual_ctc:
-                return Response({"error": f"CTC missing for student {student_id}"}, status=400)
-            print(student_id)
-            student = Student.objects.filter(user_id=student_id).first()
-            if not student:
-                print("not students")
-                continue
-
-            student_data, _ = Students_data.objects.get_or_create(
-                student=student,
-                defaults={
-                    "name": f"{student.user.first_name} {student.user.last_name}".strip(),
-                    "dob": student.dob,
-                    "branch": student.branch,
-                    "batch_year": year
-                }
-            )
-            print("done")
-            # offer assign logic
-            add_offer_logic(student_data, company, individual_ctc, company_type)
-            
-            updated.append({
-                "name": f"{student.user.first_name} {student.user.last_name}".strip(),
-                "student_id": student.id,
-                "company": company,
-                "type": company_type,
-                "ctc": individual_ctc,
-            })
-    print("done2")
+    for item in students_list:
+        student = students.get(item.get("id"))
+        if not student:
+            print("Student not found:", item.get("id"))
+            continue
+
+        individual_ctc = item.get("ctc") or default_ctc
+        entries.append((student, company, individual_ctc, company_type))
+        updated.append({
+            "name": f"{student.user.first_name} {student.user.last_name}".strip(),
+            "student_id": student.id,
+            "company": company,
+            "type": company_type,
+            "ctc": individual_ctc,
+        })
+
+    # offer assign logic
+    apply_offers(entries, year)
 
     return Response({"status": "ok", "updated": updated})
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def get_students(request):
-    students = Students_data.objects.all()
-    serializer = Student_dataSerializer(students, many=True)
-    return Response(serializer.data)
+    return placement_students_response(request)
     
 
 # added by google (Python) - Job Portal Views
@@ -1526,49 +1429,24 @@ from django.utils import timezone
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def get_all_companies(request):
-    companies = CompanyData.objects.all().order_by('-created_at')
-    
-    # Get student from user
-    user = request.user
-    student = getattr(user, "student_profile", None)
-    
-    # Get current time
-    now = timezone.now()
-
-    result = []
-
-    for company in companies:
-        # Check if student has applied
-        applied = False
-        if student:
-            application = CompanyApplication.objects.filter(
-                student=student, company=company, applied=True
-            ).first()
-            applied = application is not None
-        
-        # Check if deadline has passed
-        deadline_crossed = False
-        if company.registration_deadline:
-            deadline_crossed = now > company.registration_deadline
-        
-        result.append({
-            "id": company.id,
-            "company_name": company.company_name,
-            "eligible_batches": ", ".join(map(str, company.eligible_batches)),
-            "eligible_branches": ", ".join(company.eligible_branches),
-            "min_cgpa": company.min_cgpa,
-            "min_10th": company.min_10th,
-            "min_12th": company.min_12th,
-            "jd_file": request.build_absolute_uri(company.jd_file.url) if company.jd_file else None,
-            "jd_text": company.jd_text,
-            "additional_info": company.additional_info,
-            "deadline": company.registration_deadline.strftime('%Y-%m-%d %H:%M') if company.registration_deadline else None,
-            "created_at": company.created_at.strftime('%Y-%m-%d %H:%M'),
-            "applied": applied,
-            "deadline_crossed": deadline_crossed,
-        })
+    """
+    Job board: shared rows (cached, see job_board.py) narrowed to the drives a
+    student is eligible for, plus the viewer's applied flags.
+    """
+    student = getattr(request.user, "student_profile", None)
+    board = cached_job_board()
+    eligible = eligible_drives(student, board)
+
+    companies = job_board_queryset()
+    if eligible is not None:
+        companies = companies.filter(id__in=eligible)
+    page = paginate(request, companies, ("-created_at", "id"),
+                    lambda items: overlay_viewer(request, [company_row(c) for c in items], student))
+    if page is not None:
+        return page
 
-    return Response(result)
+    rows = board["rows"] if eligible is None else [r for r in board["rows"] if r["id"] in eligible]
+    return Response(overlay_viewer(request, rows, student))
 
 
 
@@ -1586,6 +1464,10 @@ def apply_for_job(request):
         
         company_id = request.data.get('company')
         company = CompanyData.objects.get(id=company_id)
+
+        profile = caching.student_profile(student.id)
+        if profile and profile.get("eligibility") and not matches(company_criteria(company), profile["eligibility"]):
+            return Response({"error": "You are not eligible for this drive"}, status=403)
         
         # Create or update application
         application, created = CompanyApplication.objects.get_or_create(